@@ -3,10 +3,12 @@ from google import genai
 from google.genai import types
 from typing import Dict, Any, Optional
 from engine.clients.base_client import BaseClient
+from engine.clients.llm_batch import LLMBatchMixin
 
-class GeminiClient(BaseClient):
+class GeminiClient(LLMBatchMixin, BaseClient):
     """
     Client for interacting with Google Gemini API using the official Google GenAI SDK (V1).
+    generate_content / generate_stream / generate_batch are cached and concurrency-bounded (see LLMBatchMixin).
     """
     def __init__(self, config: Dict[str, Any] = None, model: str = None):
         # Allow overriding model via init
@@ -27,16 +29,14 @@ class GeminiClient(BaseClient):
         # The new SDK uses a client instance directly
         self.client = genai.Client(api_key=self.api_key)
 
-    def generate_content(self, prompt: str) -> str:
+    def _generate(self, prompt: str) -> str:
         """
-        Wrapper to generate content from text prompt.
+        One uncached API call for a text prompt.
         """
         try:
             # Configurable Generation Config
             # The V1 SDK uses types.GenerateContentConfig
-            gen_config_dict = self.config.get('generation_config', {
-                "temperature": 0.7,
-            })
+            gen_config_dict = self.generation_config
             
             # Map dict to config object if needed, or pass as kwargs if supported.
             # The client.models.generate_content supports config dict in some versions, 
@@ -56,6 +56,19 @@ class GeminiClient(BaseClient):
             print(f"[Error] Gemini SDK Call Failed: {e}")
             return ""
 
+    def _generate_stream(self, prompt: str):
+        """
+        Streams an uncached response as text chunks (errors propagate to generate_stream).
+        """
+        stream = self.client.models.generate_content_stream(
+            model=self.model_name,
+            contents=prompt,
+            config=types.GenerateContentConfig(**self.generation_config)
+        )
+        for chunk in stream:
+            if chunk.text:
+                yield chunk.text
+
     def generate_image(self, prompt: str, output_path: str, model: str = "gemini-3-pro-image-preview") -> Optional[str]:
         """
         Generate an image using the Gemini model and save it to the output path.
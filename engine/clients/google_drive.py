@@ -1,5 +1,11 @@
 import os
 import io
+import gzip
+import shutil
+import time
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional, List, Dict
 from googleapiclient.discovery import build
 from googleapiclient.http import MediaFileUpload
@@ -8,6 +14,18 @@ from google.oauth2 import service_account
 from google.auth.transport.requests import Request
 from engine.clients.base_client import BaseClient
 
+# Upload tuning (config 'google_drive'): upload_chunk_mb, resumable_threshold_mb, upload_workers
+DEFAULT_CHUNK_MB = 8
+DEFAULT_RESUMABLE_THRESHOLD_MB = 5
+DEFAULT_UPLOAD_WORKERS = 4
+# Seconds a cached folder lookup is trusted (files may be deleted or edited on Drive meanwhile)
+LISTING_TTL = 600
+
+# Parquet is not offered: it needs pyarrow, which the engine does not depend on
+COMPRESSED_MIME_TYPES = {
+    'gzip': 'application/gzip',
+}
+
 class GoogleDriveClient(BaseClient):
     """
     Client for interacting with Google Drive using the Official Google Python API.
@@ -16,6 +34,10 @@ class GoogleDriveClient(BaseClient):
     
     SCOPES = ['https://www.googleapis.com/auth/drive']
     
+    # (folder_id, name) -> (fetched_at, [{id, name, md5Checksum, webViewLink}]), shared by all clients in the process
+    _listing_cache: Dict[tuple, tuple] = {}
+    _listing_lock = threading.Lock()
+    
     def _validate_config(self):
         # Path to secrets
         # Assuming engine structure: engine/clients/../../secrets
@@ -52,12 +74,34 @@ class GoogleDriveClient(BaseClient):
             self.service = build('drive', 'v3', credentials=self.creds)
         except Exception as e:
             raise RuntimeError(f"Failed to initialize Google Drive Client: {e}")
+        
+        # httplib2 connections are not thread-safe: upload workers get their own service
+        self._local = threading.local()
+        self._local.service = self.service
+        
+        drive_cfg = self.config.get('google_drive', {})
+        self.chunk_size = int(float(drive_cfg.get('upload_chunk_mb', DEFAULT_CHUNK_MB)) * 1024 * 1024)
+        # Resumable chunks must be a multiple of 256 KB
+        self.chunk_size = max(256 * 1024, self.chunk_size - self.chunk_size % (256 * 1024))
+        self.resumable_threshold = int(float(drive_cfg.get('resumable_threshold_mb', DEFAULT_RESUMABLE_THRESHOLD_MB)) * 1024 * 1024)
+        self.upload_workers = int(drive_cfg.get('upload_workers', DEFAULT_UPLOAD_WORKERS))
+
+    def _service(self):
+        """Drive service for the calling thread."""
+        service = getattr(self._local, 'service', None)
+        if service is None:
+            service = build('drive', 'v3', credentials=self.creds, cache_discovery=False)
+            self._local.service = service
+        return service
 
     def upload_file(self, 
                     local_path: str, 
                     folder_id: Optional[str] = None, 
                     mime_type: Optional[str] = None,
-                    new_name: Optional[str] = None) -> Dict:
+                    new_name: Optional[str] = None,
+                    compress: Optional[str] = None,
+                    dedup: bool = True,
+                    replace: bool = False) -> Dict:
         """
         Uploads a file to Google Drive.
         Args:
@@ -65,33 +109,148 @@ class GoogleDriveClient(BaseClient):
             folder_id: (Optional) ID of the folder to upload to. None = Root.
             mime_type: (Optional) Specific MIME type. If None, auto-detected.
             new_name: (Optional) Rename file on Drive.
+            compress: (Optional) 'gzip'; the compressed copy is written next to the
+                      local file and uploaded instead.
+            dedup: Skip the upload if a file with the same name and content (md5)
+                   already exists in the folder.
+            replace: Overwrite the content of an existing same-name file instead of
+                     creating another one (keeps its id and link).
         Returns:
-            Dict containing 'id', 'name', 'webViewLink'.
+            Dict containing 'id', 'name', 'webViewLink' ('deduplicated': True if skipped).
         """
+        if compress and compress not in COMPRESSED_MIME_TYPES:
+            raise ValueError(f"Unknown compression '{compress}' (supported: {', '.join(COMPRESSED_MIME_TYPES)})")
         if not os.path.exists(local_path):
             raise FileNotFoundError(f"Local file not found: {local_path}")
+        
+        if compress:
+            local_path = self._compress(local_path, compress)
+            mime_type = mime_type or COMPRESSED_MIME_TYPES[compress]
+            if new_name:
+                new_name += os.path.splitext(local_path)[1]
             
         file_name = new_name or os.path.basename(local_path)
         
-        file_metadata = {'name': file_name}
-        if folder_id:
-            file_metadata['parents'] = [folder_id]
-            
-        # Use simple upload or resumable depending on size? 
-        # MediaFileUpload defaults to resumable=True for larger files usually, 
-        # but we can force it.
-        media = MediaFileUpload(local_path, mimetype=mime_type, resumable=True)
+        existing = self._list_named(file_name, folder_id) if (dedup or replace) else []
+        if dedup and existing:
+            checksum = self._md5(local_path)
+            for f in existing:
+                if f.get('md5Checksum') == checksum:
+                    print(f"[GoogleDriveClient] Skipped upload of {file_name}: identical file already in folder.")
+                    return {'id': f['id'], 'name': f['name'], 'webViewLink': f.get('webViewLink'), 'deduplicated': True}
+        
+        # Small files go in one request; larger ones in resumable chunks of upload_chunk_mb
+        resumable = os.path.getsize(local_path) >= self.resumable_threshold
+        if resumable:
+            media = MediaFileUpload(local_path, mimetype=mime_type, resumable=True, chunksize=self.chunk_size)
+        else:
+            media = MediaFileUpload(local_path, mimetype=mime_type, resumable=False)
         
+        fields = 'id, name, md5Checksum, webViewLink'
         try:
-            file = self.service.files().create(
-                body=file_metadata,
-                media_body=media,
-                fields='id, name, webViewLink'
-            ).execute()
-            
-            return file
+            if replace and existing:
+                file = self._service().files().update(
+                    fileId=existing[0]['id'],
+                    media_body=media,
+                    fields=fields
+                ).execute()
+            else:
+                file_metadata = {'name': file_name}
+                if folder_id:
+                    file_metadata['parents'] = [folder_id]
+                file = self._service().files().create(
+                    body=file_metadata,
+                    media_body=media,
+                    fields=fields
+                ).execute()
         except Exception as e:
             raise RuntimeError(f"Failed to upload file {local_path}: {e}")
+        
+        self._remember(file_name, folder_id, file)
+        return file
+
+    def upload_files(self, local_paths: List[str], folder_id: Optional[str] = None, max_workers: int = None,
+                     new_names: Optional[List[str]] = None, **kwargs) -> List[Dict]:
+        """
+        Uploads several files concurrently (upload_file options apply to each;
+        `new_names`, if given, renames them one-to-one).
+        Returns results in input order; raises the first upload error after all finished.
+        """
+        if not local_paths:
+            return []
+        new_names = new_names or [None] * len(local_paths)
+        if len(new_names) != len(local_paths):
+            raise ValueError("new_names must match local_paths one-to-one")
+        workers = min(max_workers or self.upload_workers, len(local_paths))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = [
+                pool.submit(self.upload_file, path, folder_id=folder_id, new_name=name, **kwargs)
+                for path, name in zip(local_paths, new_names)
+            ]
+            errors = [f.exception() for f in futures]
+        for e in errors:
+            if e is not None:
+                raise e
+        return [f.result() for f in futures]
+
+    def _list_named(self, name: str, folder_id: Optional[str]) -> List[Dict]:
+        """Files named `name` in the folder, from the process-wide listing cache when known."""
+        key = (folder_id, name)
+        with self._listing_lock:
+            cached = self._listing_cache.get(key)
+            if cached and time.time() - cached[0] < LISTING_TTL:
+                return list(cached[1])
+        
+        q = f"name = '{self._escape(name)}' and trashed = false"
+        if folder_id:
+            q += f" and '{folder_id}' in parents"
+        try:
+            response = self._service().files().list(
+                q=q,
+                spaces='drive',
+                fields='files(id, name, md5Checksum, webViewLink)',
+                orderBy='modifiedTime desc',
+                pageSize=10
+            ).execute()
+        except Exception as e:
+            raise RuntimeError(f"Failed to search for file '{name}': {e}")
+        
+        files = response.get('files', [])
+        with self._listing_lock:
+            self._listing_cache[key] = (time.time(), files)
+        return list(files)
+
+    def _remember(self, name: str, folder_id: Optional[str], file: Dict):
+        """Records an uploaded file in the listing cache (newest first)."""
+        key = (folder_id, name)
+        with self._listing_lock:
+            fetched_at, files = self._listing_cache.get(key, (time.time(), []))
+            files = [f for f in files if f['id'] != file.get('id')]
+            self._listing_cache[key] = (fetched_at, [file] + files)
+
+    @staticmethod
+    def _escape(name: str) -> str:
+        return name.replace("\\", "\\\\").replace("'", "\\'")
+
+    @staticmethod
+    def _md5(path: str) -> str:
+        h = hashlib.md5()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1024 * 1024), b''):
+                h.update(block)
+        return h.hexdigest()
+
+    @staticmethod
+    def _compress(local_path: str, compress: str) -> str:
+        """Writes a compressed copy next to local_path and returns its path. Output is byte-stable for dedup."""
+        if compress == 'gzip':
+            out_path = local_path + '.gz'
+            # mtime=0 and no embedded filename: identical input -> identical bytes -> same md5
+            with open(local_path, 'rb') as src, open(out_path, 'wb') as raw, \
+                    gzip.GzipFile(filename='', mode='wb', fileobj=raw, mtime=0) as dst:
+                shutil.copyfileobj(src, dst)
+            return out_path
+        raise ValueError(f"Unknown compression '{compress}' (supported: {', '.join(COMPRESSED_MIME_TYPES)})")
 
     def create_folder(self, name: str, parent_id: Optional[str] = None) -> str:
         """
@@ -110,7 +269,7 @@ class GoogleDriveClient(BaseClient):
             file_metadata['parents'] = [parent_id]
             
         try:
-            file = self.service.files().create(
+            file = self._service().files().create(
                 body=file_metadata,
                 fields='id'
             ).execute()
@@ -128,7 +287,7 @@ class GoogleDriveClient(BaseClient):
             q += f" and '{parent_id}' in parents"
             
         try:
-            response = self.service.files().list(
+            response = self._service().files().list(
                 q=q,
                 spaces='drive',
                 fields='nextPageToken, files(id, name, webViewLink)',
@@ -164,7 +323,7 @@ class GoogleDriveClient(BaseClient):
         }
         
         try:
-            self.service.permissions().create(
+            self._service().permissions().create(
                 fileId=file_id,
                 body=user_permission,
                 fields='id',
@@ -1,26 +1,74 @@
 import os
+import json
+import time
+import datetime
+import threading
 import gspread
-from typing import List, Dict, Any, Union
+from gspread.utils import absolute_range_name, extract_id_from_url, rowcol_to_a1
+from typing import List, Dict, Any, Union, Optional, Tuple
 import pandas as pd
 from engine.clients.base_client import BaseClient
+from engine.scripts.utils.paths import get_store_root
+
+# Local copies of previously-read sheet rows (incremental reads)
+SHEET_CACHE_ROOT = get_store_root() / "system" / "cache" / "gsheets"
+# Spreadsheet metadata (title, worksheet ids/names/grid sizes), shared across processes
+SHEET_META_ROOT = get_store_root() / "system" / "cache" / "gsheet_meta"
+
+# Per-process registry: auth file -> authenticated gspread.Client (one OAuth token, refreshed in place)
+_CLIENTS: Dict[str, gspread.Client] = {}
+# Spreadsheet id -> (fetched_at, metadata); spreadsheet title -> id
+_METADATA: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+_TITLE_IDS: Dict[str, str] = {}
+_REGISTRY_LOCK = threading.Lock()
+
+
+class _SpreadsheetRef:
+    """
+    Read-side stand-in for gspread.Spreadsheet built from cached metadata.
+    Constructing a gspread.Spreadsheet always fetches metadata; this costs no API call.
+    """
+
+    def __init__(self, http_client, spreadsheet_id: str, metadata: Dict[str, Any]):
+        self.client = http_client
+        self.id = spreadsheet_id
+        self.title = metadata.get('properties', {}).get('title')
+
+    def fetch_sheet_metadata(self, params=None):
+        return self.client.fetch_sheet_metadata(self.id, params=params)
+
+    def values_batch_get(self, ranges, params=None):
+        return self.client.values_batch_get(self.id, ranges, params=params)
+
 
 class GoogleSheetClient(BaseClient):
     """
     Client for interacting with Google Sheets using gspread.
     Automatically authenticates using GOOGLE_APPLICATION_CREDENTIALS env var.
+    Instances share one authenticated gspread client per credentials file, and
+    read paths resolve spreadsheets/worksheets from a metadata cache.
     """
     
+    # Seconds cached spreadsheet metadata is trusted (memory and disk)
+    metadata_ttl = 300
+    
     def _validate_config(self):
         # Check if auth file is set in env
         self.auth_file = os.environ.get('GOOGLE_APPLICATION_CREDENTIALS')
         if not self.auth_file:
             raise ValueError("GOOGLE_APPLICATION_CREDENTIALS environment variable is not set. Please set it in .env pointing to your service account json.")
         
-        # Initialize gspread
-        try:
-            self.client = gspread.service_account(filename=self.auth_file)
-        except Exception as e:
-            raise RuntimeError(f"Failed to authenticate with Google Sheets: {e}")
+        # Initialize gspread once per process and credentials file
+        # BackOffHTTPClient retries 429/5xx with exponential backoff (Sheets per-minute read quota)
+        with _REGISTRY_LOCK:
+            client = _CLIENTS.get(self.auth_file)
+            if client is None:
+                try:
+                    client = gspread.service_account(filename=self.auth_file, http_client=gspread.BackOffHTTPClient)
+                except Exception as e:
+                    raise RuntimeError(f"Failed to authenticate with Google Sheets: {e}")
+                _CLIENTS[self.auth_file] = client
+        self.client = client
 
     def open_sheet(self, key_url_or_title: str):
         """
@@ -48,28 +96,350 @@ class GoogleSheetClient(BaseClient):
         Read a worksheet into a Pandas DataFrame.
         Priority: worksheet_name > worksheet_gid > First Sheet.
         """
-        sh = self.open_sheet(sheet_key_or_url)
+        sh = self._open_for_read(sheet_key_or_url)
+        ws = self._resolve_worksheet(sh, worksheet_name, worksheet_gid)
+            
+        data = ws.get_all_values()
+        return self._rows_to_dataframe(data)
+
+    def read_window(self,
+                    sheet_key_or_url: str,
+                    worksheet_name: str = None,
+                    worksheet_gid: int = None,
+                    header_rows: int = 1,
+                    tail_rows: int = None,
+                    since: datetime.date = None,
+                    date_col: int = 1,
+                    date_format: str = None) -> pd.DataFrame:
+        """
+        Read the header plus a trailing window of rows instead of the whole worksheet.
+        Args:
+            header_rows: Leading rows always returned (row 1 becomes the columns, the rest stay as data rows).
+            tail_rows: Keep only the last N data rows.
+            since: Keep rows from the first one whose `date_col` value is >= since.
+                   Rows before that point are all older, so the result is a superset of
+                   every row dated >= since whatever the sheet's sort order.
+            date_col: 1-based column holding the row date (used to find the last row / `since`).
+            date_format: Explicit strptime format for `date_col` (faster, unambiguous).
+        Costs one column fetch + one range fetch. Falls back to a full read if neither
+        tail_rows nor since is given, or if no row date can be parsed.
+        """
+        sh = self._open_for_read(sheet_key_or_url)
+        ws = self._resolve_worksheet(sh, worksheet_name, worksheet_gid)
         
-        ws = None
-        if worksheet_name:
-            ws = sh.worksheet(worksheet_name)
-        elif worksheet_gid is not None:
-            # GSpread doesn't have direct get_by_id usually, iterate
-            for w in sh.worksheets():
-                if w.id == worksheet_gid:
-                    ws = w
-                    break
-            if not ws:
-                raise ValueError(f"Worksheet with GID {worksheet_gid} not found.")
+        if tail_rows is None and since is None:
+            return self._rows_to_dataframe(ws.get_all_values())
+            
+        # 1. Locate the window using only the date column
+        window = self._locate_window(ws.col_values(date_col), header_rows, tail_rows, since, date_col, date_format)
+        if window is None:
+            return self._rows_to_dataframe(ws.get_all_values())
+        start_row, last_row = window
+        if start_row > last_row:
+            # Nothing new enough: header only
+            return self._rows_to_dataframe(ws.get(f"1:{max(header_rows, 1)}"))
+            
+        # 2. Fetch header + window in one request
+        ranges = [f"1:{header_rows}", f"{start_row}:{last_row}"]
+        header, window = [list(vr) for vr in ws.batch_get(ranges)]
+        return self._rows_to_dataframe(header + window)
+
+    def read_many(self, specs: Dict[str, Dict[str, Any]], raise_errors: bool = True) -> Dict[str, pd.DataFrame]:
+        """
+        Read several worksheets with one `values:batchGet` request per spreadsheet.
+        Args:
+            specs: {key: spec}. Each spec holds `sheet` (key or URL) plus the optional
+                   `worksheet_name` / `worksheet_gid` and `read_window` arguments
+                   (header_rows, tail_rows, since, date_col, date_format).
+            raise_errors: If False, a spreadsheet that fails is logged and its keys are
+                          left out of the result instead of aborting the whole batch.
+        Returns:
+            {key: DataFrame} for every spec that was read.
+        Worksheet titles are resolved from cached spreadsheet metadata. Windowed specs
+        cost one extra batchGet (date columns only) for their spreadsheet.
+        """
+        by_sheet: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        for key, spec in specs.items():
+            by_sheet.setdefault(spec['sheet'], {})[key] = spec
+            
+        results = {}
+        for sheet_key_or_url, group in by_sheet.items():
+            try:
+                results.update(self._read_group(self._open_for_read(sheet_key_or_url), group))
+            except Exception as e:
+                if raise_errors:
+                    raise
+                print(f"[GoogleSheetClient] Batch read failed for {sheet_key_or_url}: {e}")
+        return results
+
+    def _read_group(self, sh, group: Dict[str, Dict[str, Any]]) -> Dict[str, pd.DataFrame]:
+        """read_many for specs that all live in spreadsheet `sh`."""
+        titles = {key: self._worksheet_properties(sh, spec.get('worksheet_name'), spec.get('worksheet_gid'))['title']
+                  for key, spec in group.items()}
+        windowed = [key for key, spec in group.items()
+                    if spec.get('tail_rows') is not None or spec.get('since') is not None]
+        
+        # 1. Date columns of every windowed spec in one request
+        windows = {}
+        if windowed:
+            col_ranges = [absolute_range_name(titles[key], self._column_letter(group[key].get('date_col', 1)))
+                          for key in windowed]
+            res = sh.values_batch_get(col_ranges, params={'majorDimension': 'COLUMNS'})
+            for key, vr in zip(windowed, res.get('valueRanges', [])):
+                spec = group[key]
+                col = (vr.get('values') or [[]])[0]
+                windows[key] = self._locate_window(col, spec.get('header_rows', 1), spec.get('tail_rows'),
+                                                   spec.get('since'), spec.get('date_col', 1), spec.get('date_format'))
+                
+        # 2. Header + window (or whole tab) of every spec in one request
+        plan = []
+        for key in group:
+            header_rows = group[key].get('header_rows', 1)
+            window = windows.get(key)
+            if window is None:
+                plan.append((key, [absolute_range_name(titles[key])]))
+            elif window[0] > window[1]:
+                plan.append((key, [absolute_range_name(titles[key], f"1:{max(header_rows, 1)}")]))
+            else:
+                plan.append((key, [absolute_range_name(titles[key], f"1:{header_rows}"),
+                                   absolute_range_name(titles[key], f"{window[0]}:{window[1]}")]))
+                
+        res = sh.values_batch_get([r for _, ranges in plan for r in ranges])
+        value_ranges = iter(res.get('valueRanges', []))
+        out = {}
+        for key, ranges in plan:
+            rows = []
+            for _ in ranges:
+                rows.extend(next(value_ranges, {}).get('values', []))
+            out[key] = self._rows_to_dataframe(rows)
+        return out
+
+    def read_incremental(self,
+                         sheet_key_or_url: str,
+                         worksheet_name: str = None,
+                         worksheet_gid: int = None,
+                         mutable_rows: int = 60,
+                         key_col: int = 1) -> pd.DataFrame:
+        """
+        Read a whole, append-only worksheet while transferring only new rows.
+        
+        Rows older than the last `mutable_rows` of the previous read are treated as
+        immutable and served from a local cache keyed by spreadsheet id / gid with a
+        row-count watermark. Each call re-fetches from the first mutable row onward,
+        plus column `key_col` (1-based, e.g. the date column) of the cached rows in the
+        same request. A full reload happens when the last immutable row or any
+        `key_col` cell above it differs from the cache (rows inserted/deleted/re-dated).
+        Edits to other columns above the window are NOT detected; keep `mutable_rows`
+        wide enough to cover how far back the sheet is corrected.
+        """
+        sh = self._open_for_read(sheet_key_or_url)
+        # Fresh metadata: the re-read range below is bounded by the worksheet's current row count
+        ws = self._resolve_worksheet(sh, worksheet_name, worksheet_gid, max_age=0)
+        cache_path = SHEET_CACHE_ROOT / f"{sh.id}_{ws.id}.json"
+        
+        cached = self._load_row_cache(cache_path)
+        stable = max(0, cached['watermark'] - mutable_rows) if cached else 0
+        
+        if stable > 0:
+            # One request: key column of the immutable rows + last immutable row (anchor) to the end of the grid
+            key = rowcol_to_a1(1, key_col).rstrip('0123456789')
+            ranges = [f"{key}1:{key}{stable}", f"{stable}:{max(ws.row_count, stable)}"]
+            key_cells, fetched = [list(vr) for vr in ws.batch_get(ranges)]
+            anchor = fetched[0] if fetched else None
+            if (anchor is not None
+                    and self._strip_row(anchor) == self._strip_row(cached['rows'][stable - 1])
+                    and self._column(key_cells, 0, stable) == self._column(cached['rows'][:stable], key_col - 1, stable)):
+                rows = cached['rows'][:stable] + fetched[1:]
+            else:
+                print(f"[GoogleSheetClient] Cached rows of {ws.title} changed upstream; full reload.")
+                rows = ws.get_all_values()
         else:
-            ws = sh.sheet1
+            rows = ws.get_all_values()
             
-        data = ws.get_all_values()
-        if not data:
+        self._save_row_cache(cache_path, rows)
+        return self._rows_to_dataframe(rows)
+
+    def _open_for_read(self, key_url_or_title: str) -> _SpreadsheetRef:
+        """
+        Like open_sheet, but served from the metadata cache when possible.
+        Keys and URLs cost at most one metadata fetch; titles fall back to open_sheet
+        (a Drive search) once per process.
+        """
+        if key_url_or_title.startswith("http"):
+            sheet_id = extract_id_from_url(key_url_or_title)
+        else:
+            sheet_id = _TITLE_IDS.get(key_url_or_title, key_url_or_title)
+            
+        try:
+            meta = self._cached_metadata(sheet_id, self.metadata_ttl)
+            if meta is None:
+                meta = self._fetch_metadata(sheet_id)
+        except (gspread.exceptions.APIError, gspread.exceptions.SpreadsheetNotFound):
+            if key_url_or_title.startswith("http"):
+                raise
+            # Not a key: resolve the title the slow way and remember it
+            sheet_id = self.open_sheet(key_url_or_title).id
+            _TITLE_IDS[key_url_or_title] = sheet_id
+            meta = self._cached_metadata(sheet_id, self.metadata_ttl) or self._fetch_metadata(sheet_id)
+        return _SpreadsheetRef(self.client.http_client, sheet_id, meta)
+
+    def _resolve_worksheet(self, sh, worksheet_name: str = None, worksheet_gid: int = None, max_age: float = None):
+        """Priority: worksheet_name > worksheet_gid > First Sheet. Resolved from cached metadata."""
+        props = self._worksheet_properties(sh, worksheet_name, worksheet_gid, max_age)
+        return gspread.Worksheet(sh, props, sh.id, sh.client)
+
+    def _worksheet_properties(self, sh, worksheet_name: str = None, worksheet_gid: int = None,
+                              max_age: float = None) -> Dict[str, Any]:
+        """
+        Worksheet `properties` block (title, sheetId, gridProperties) from cached metadata.
+        A miss re-fetches the metadata once (tab added or renamed since it was cached).
+        """
+        for attempt_max_age in (max_age, 0):
+            sheets = [s['properties'] for s in self._sheet_metadata(sh, attempt_max_age).get('sheets', [])]
+            if worksheet_name:
+                match = [p for p in sheets if p['title'] == worksheet_name]
+            elif worksheet_gid is not None:
+                match = [p for p in sheets if p['sheetId'] == worksheet_gid]
+            else:
+                match = sheets[:1]
+            if match:
+                return match[0]
+            if attempt_max_age == 0:
+                break
+                
+        if worksheet_name:
+            raise gspread.exceptions.WorksheetNotFound(worksheet_name)
+        if worksheet_gid is not None:
+            raise ValueError(f"Worksheet with GID {worksheet_gid} not found.")
+        raise ValueError(f"Spreadsheet {sh.id} has no worksheets.")
+
+    def _sheet_metadata(self, sh, max_age: float = None) -> Dict[str, Any]:
+        """Spreadsheet metadata no older than `max_age` seconds (default: metadata_ttl)."""
+        max_age = self.metadata_ttl if max_age is None else max_age
+        return self._cached_metadata(sh.id, max_age) or self._fetch_metadata(sh.id)
+
+    @staticmethod
+    def _cached_metadata(sheet_id: str, max_age: float) -> Optional[Dict[str, Any]]:
+        """Memory first, then disk (age from file mtime). None if missing or too old."""
+        if max_age <= 0:
+            return None
+        now = time.time()
+        hit = _METADATA.get(sheet_id)
+        if hit and now - hit[0] <= max_age:
+            return hit[1]
+            
+        path = SHEET_META_ROOT / f"{sheet_id}.json"
+        try:
+            fetched_at = path.stat().st_mtime
+            if now - fetched_at > max_age:
+                return None
+            with open(path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+        _METADATA[sheet_id] = (fetched_at, meta)
+        return meta
+
+    def _fetch_metadata(self, sheet_id: str) -> Dict[str, Any]:
+        meta = self.client.http_client.fetch_sheet_metadata(sheet_id)
+        _METADATA[sheet_id] = (time.time(), meta)
+        try:
+            os.makedirs(SHEET_META_ROOT, exist_ok=True)
+            path = SHEET_META_ROOT / f"{sheet_id}.json"
+            tmp = path.with_suffix(f'.{threading.get_ident()}.tmp')
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump(meta, f, ensure_ascii=False)
+            tmp.replace(path)
+        except OSError as e:
+            print(f"[GoogleSheetClient] Could not persist metadata for {sheet_id}: {e}")
+        return meta
+
+    @staticmethod
+    def _invalidate_metadata(sheet_id: str):
+        _METADATA.pop(sheet_id, None)
+        (SHEET_META_ROOT / f"{sheet_id}.json").unlink(missing_ok=True)
+
+    @staticmethod
+    def _locate_window(col: List[Any], header_rows: int, tail_rows: int = None, since: datetime.date = None,
+                       date_col: int = 1, date_format: str = None):
+        """
+        Turns a fetched date column into the (start_row, last_row) window to read.
+        Returns None when the whole sheet must be read (no parsable dates); start_row > last_row
+        means no data row qualifies (header only).
+        """
+        last_row = len(col)
+        if last_row <= header_rows:
+            return (header_rows + 1, header_rows)
+            
+        start_row = header_rows + 1
+        if since is not None:
+            dates = pd.to_datetime(pd.Series(col[header_rows:]), format=date_format, errors='coerce')
+            if not dates.notna().any():
+                print(f"[GoogleSheetClient] No parsable dates in column {date_col}; reading full sheet.")
+                return None
+            hits = (dates >= pd.Timestamp(since)).to_numpy().nonzero()[0]
+            if len(hits) == 0:
+                return (last_row + 1, last_row)
+            start_row = header_rows + 1 + int(hits[0])
+        if tail_rows is not None:
+            start_row = max(start_row, last_row - tail_rows + 1)
+        return (start_row, last_row)
+
+    @staticmethod
+    def _column_letter(col: int) -> str:
+        """1-based column index -> A1 column range, e.g. 1 -> 'A:A'."""
+        letter = rowcol_to_a1(1, col).rstrip('0123456789')
+        return f"{letter}:{letter}"
+
+    @staticmethod
+    def _rows_to_dataframe(rows: List[List[Any]]) -> pd.DataFrame:
+        """First row -> headers; ragged rows (API trims trailing blanks) are padded."""
+        rows = [list(r) for r in rows]
+        if not rows:
             return pd.DataFrame()
             
-        headers = data.pop(0)
-        return pd.DataFrame(data, columns=headers)
+        headers = rows.pop(0)
+        width = max([len(headers)] + [len(r) for r in rows])
+        headers = headers + [''] * (width - len(headers))
+        rows = [r + [''] * (width - len(r)) for r in rows]
+        return pd.DataFrame(rows, columns=headers)
+
+    @staticmethod
+    def _strip_row(row: List[Any]) -> List[Any]:
+        """Drops trailing blanks (get_all_values pads rows, ranged gets don't)."""
+        row = list(row)
+        while row and row[-1] in ('', None):
+            row.pop()
+        return row
+
+    @staticmethod
+    def _column(rows: List[List[Any]], idx: int, length: int) -> List[str]:
+        """Cell `idx` of each row as a string, padded to `length` (ranged gets omit trailing blanks)."""
+        cells = [str(r[idx]) if len(r) > idx and r[idx] is not None else '' for r in rows[:length]]
+        return cells + [''] * (length - len(cells))
+
+    @staticmethod
+    def _load_row_cache(path) -> Optional[Dict[str, Any]]:
+        # Plain JSON (cell values are strings): nothing under the cache dir is ever executed on load
+        if not path.exists():
+            return None
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                cached = json.load(f)
+            return cached if isinstance(cached.get('rows'), list) else None
+        except Exception:
+            return None
+
+    @staticmethod
+    def _save_row_cache(path, rows: List[List[Any]]):
+        os.makedirs(path.parent, exist_ok=True)
+        # Unique per writer: concurrent runs (matrix processes, daemon threads) must not share a temp file
+        tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump({'rows': rows, 'watermark': len(rows)}, f, ensure_ascii=False)
+        os.replace(tmp, path)
+        # Caches written by older versions were pickles; they are never read, only removed
+        path.with_suffix('.pkl').unlink(missing_ok=True)
 
     def write_dataframe(self, df: pd.DataFrame, sheet_key_or_url: str, worksheet_name: str, clear_existing: bool = True):
         """
@@ -82,6 +452,7 @@ class GoogleSheetClient(BaseClient):
         except gspread.exceptions.WorksheetNotFound:
             # Create if not exists
             ws = sh.add_worksheet(title=worksheet_name, rows=100, cols=20)
+            self._invalidate_metadata(sh.id)
             
         if clear_existing:
             ws.clear()
@@ -0,0 +1,174 @@
+import re
+import time
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterator, List, Optional
+
+from engine.clients.response_cache import ResponseCache
+
+DEFAULT_GENERATION_CONFIG = {"temperature": 0.7}
+DEFAULT_MAX_CONCURRENCY = 4
+
+
+class LLMBatchMixin:
+    """
+    Cached, concurrency-bounded text generation shared by the LLM clients.
+
+    Subclasses implement _generate(prompt) -> str (one blocking API call, "" on failure),
+    optionally _generate_stream(prompt) -> iterator of text chunks (raises on failure),
+    and set self.model_name. Settings come from the `llm` config section:
+        max_concurrency: in-flight API calls per client class, process-wide (default 4),
+                         so matrix cells running in threads share one budget.
+        cache: false disables the response cache.
+        cache_ttl_hours / cache_max_size_mb: response cache bounds.
+    """
+
+    _limiters: Dict[str, threading.BoundedSemaphore] = {}
+    _limiters_lock = threading.Lock()
+
+    @property
+    def llm_settings(self) -> Dict:
+        return self.config.get('llm', {})
+
+    @property
+    def generation_config(self) -> Dict:
+        return self.config.get('generation_config', DEFAULT_GENERATION_CONFIG)
+
+    @property
+    def max_concurrency(self) -> int:
+        return int(self.llm_settings.get('max_concurrency', DEFAULT_MAX_CONCURRENCY))
+
+    def _limiter(self) -> threading.BoundedSemaphore:
+        # First client of a class sizes the shared limiter
+        name = type(self).__name__
+        with LLMBatchMixin._limiters_lock:
+            if name not in LLMBatchMixin._limiters:
+                LLMBatchMixin._limiters[name] = threading.BoundedSemaphore(self.max_concurrency)
+            return LLMBatchMixin._limiters[name]
+
+    def _response_cache(self) -> Optional[ResponseCache]:
+        if not self.llm_settings.get('cache', True):
+            return None
+        if getattr(self, '_cache', None) is None:
+            ttl_hours = self.llm_settings.get('cache_ttl_hours', 168)
+            max_mb = self.llm_settings.get('cache_max_size_mb', 64)
+            self._cache = ResponseCache(ttl=float(ttl_hours) * 3600 if ttl_hours else None,
+                                        max_bytes=int(max_mb) * 1024 * 1024)
+        return self._cache
+
+    def _generate(self, prompt: str) -> str:
+        raise NotImplementedError
+
+    def _generate_stream(self, prompt: str) -> Iterator[str]:
+        # Clients without a streaming API deliver the whole response as one chunk
+        text = self._generate(prompt)
+        if text:
+            yield text
+
+    def _cache_lookup(self, prompt: str, use_cache: bool):
+        """(cache, key, cached text or None); cache is None when caching is off."""
+        cache = self._response_cache() if use_cache else None
+        if cache is None:
+            return None, None, None
+        key = ResponseCache.make_key(self.model_name, self.generation_config, prompt)
+        text = cache.get(key)
+        if text is not None:
+            print(f"[{type(self).__name__}] Cache hit ({self.model_name}, {len(text)} chars).")
+        return cache, key, text
+
+    def generate_content(self, prompt: str, use_cache: bool = True) -> str:
+        """
+        Generates text for one prompt ("" on failure).
+        Identical (model, generation config, prompt) requests are answered from the local cache.
+        """
+        cache, key, text = self._cache_lookup(prompt, use_cache)
+        if text is not None:
+            return text
+
+        with self._limiter():
+            text = self._generate(prompt)
+
+        if cache and text:
+            cache.put(key, self.model_name, text)
+        return text
+
+    def generate_stream(self, prompt: str, on_chunk: Callable[[str, str], None] = None, use_cache: bool = True) -> str:
+        """
+        Generates text for one prompt, calling on_chunk(chunk, text_so_far) as the response streams in.
+        Returns the full text ("" on failure, even if some chunks were already delivered).
+        A cached response is returned at once without callbacks. Callback errors are logged, not raised.
+        """
+        cache, key, text = self._cache_lookup(prompt, use_cache)
+        if text is not None:
+            return text
+
+        name = type(self).__name__
+        parts: List[str] = []
+        with self._limiter():
+            started = time.perf_counter()
+            try:
+                for chunk in self._generate_stream(prompt):
+                    if not chunk:
+                        continue
+                    if not parts:
+                        print(f"[{name}] First chunk after {time.perf_counter() - started:.1f}s")
+                    parts.append(chunk)
+                    if on_chunk:
+                        try:
+                            on_chunk(chunk, "".join(parts))
+                        except Exception as e:
+                            print(f"[{name}] Stream callback failed: {e}")
+            except Exception as e:
+                print(f"[Error] {name} stream failed: {e}")
+                return ""
+
+        text = "".join(parts)
+        if cache and text:
+            cache.put(key, self.model_name, text)
+        return text
+
+    def generate_batch(self, prompts: List[str], max_concurrency: int = None, use_cache: bool = True) -> List[str]:
+        """
+        Generates text for many prompts concurrently; results are in prompt order ("" per failure).
+        Duplicate prompts are sent once. At most `max_concurrency` (default: llm.max_concurrency)
+        run at a time for this batch, and never more than the process-wide limit.
+        """
+        unique = list(dict.fromkeys(prompts))
+        if not unique:
+            return []
+        workers = min(max_concurrency or self.max_concurrency, len(unique))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            texts = list(pool.map(lambda p: self.generate_content(p, use_cache=use_cache), unique))
+        results = dict(zip(unique, texts))
+        return [results[p] for p in prompts]
+
+    async def agenerate_batch(self, prompts: List[str], max_concurrency: int = None, use_cache: bool = True) -> List[str]:
+        """generate_batch() for asyncio callers (e.g. the scheduler daemon); does not block the loop."""
+        return await asyncio.to_thread(self.generate_batch, prompts, max_concurrency, use_cache)
+
+
+class FirstSection:
+    """
+    on_chunk adapter for generate_stream(): calls on_section(text) once with the first
+    markdown section of the response (plus any preamble), as soon as the second section
+    header (a '#' heading or a line starting with bold '**') begins to stream.
+    Responses with fewer than two headers never fire.
+    """
+
+    HEADER = re.compile(r'^[ \t]*(?:#{1,6}[ \t]|\*\*)', re.M)
+
+    def __init__(self, on_section: Callable[[str], None]):
+        self.on_section = on_section
+        self.fired = False
+
+    def __call__(self, chunk: str, text: str):
+        if self.fired:
+            return
+        headers = self.HEADER.finditer(text)
+        if next(headers, None) is None:
+            return
+        second = next(headers, None)
+        if second is not None:
+            self.fired = True
+            self.on_section(text[:second.start()].strip())
@@ -2,10 +2,12 @@ import os
 from typing import Dict, Any, Optional
 from openai import OpenAI
 from engine.clients.base_client import BaseClient
+from engine.clients.llm_batch import LLMBatchMixin
 
-class OpenAIClient(BaseClient):
+class OpenAIClient(LLMBatchMixin, BaseClient):
     """
     Client for interacting with OpenAI API.
+    generate_content / generate_stream / generate_batch are cached and concurrency-bounded (see LLMBatchMixin).
     """
     def __init__(self, config: Dict[str, Any] = None, model: str = None):
         # Allow overriding model via init
@@ -32,9 +34,9 @@ class OpenAIClient(BaseClient):
             base_url=self.base_url
         )
 
-    def generate_content(self, prompt: str) -> str:
+    def _generate(self, prompt: str) -> str:
         """
-        Simple wrapper to generate text content from a prompt.
+        One uncached API call for a text prompt.
         Uses chat.completions with a system/user message structure.
         """
         try:
@@ -46,9 +48,7 @@ class OpenAIClient(BaseClient):
             ]
             
             # 2. Configurable Generation Config
-            gen_config_dict = self.config.get('generation_config', {
-                "temperature": 0.7,
-            })
+            gen_config_dict = self.generation_config
             
             # 3. Call API
             response = self.client.chat.completions.create(
@@ -65,6 +65,20 @@ class OpenAIClient(BaseClient):
             print(f"[Error] OpenAI API Call Failed: {e}")
             return ""
 
+    def _generate_stream(self, prompt: str):
+        """
+        Streams an uncached response as text chunks (errors propagate to generate_stream).
+        """
+        stream = self.client.chat.completions.create(
+            model=self.model_name,
+            messages=[{"role": "user", "content": prompt}],
+            stream=True,
+            **self.generation_config
+        )
+        for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+
     def chat_completion(self, messages: list, **kwargs) -> Any:
         """
         Direct access to chat completion for more complex message structures (system, user, assistant).
@@ -0,0 +1,94 @@
+import os
+import json
+import time
+import hashlib
+import threading
+from pathlib import Path
+from typing import Any, Optional
+
+from engine.scripts.utils.paths import get_store_root
+
+CACHE_ROOT = get_store_root() / "system" / "cache" / "llm"
+
+
+class ResponseCache:
+    """
+    Content-addressed cache of LLM text responses (one JSON file per entry).
+
+    - Key: sha256(model, generation config, prompt), so any change to either busts it.
+    - Entry age comes from the file mtime; reads bump the atime and eviction drops
+      least-recently-read entries once the cache exceeds `max_bytes`.
+    - Only non-empty responses are stored: failures are always retried.
+    """
+
+    def __init__(self, root: Path = None, ttl: float = None, max_bytes: int = 64 * 1024 * 1024):
+        self.root = Path(root) if root else CACHE_ROOT
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(model: str, generation_config: Any, prompt: str) -> str:
+        payload = json.dumps([model, generation_config, prompt], sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """Returns the cached text if present (and younger than ttl seconds, if set), else None."""
+        path = self.root / f"{key}.json"
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            return None
+
+        now = time.time()
+        if self.ttl and now - stat.st_mtime > self.ttl:
+            return None
+
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                text = json.load(f)["text"]
+        except Exception as e:
+            print(f"[ResponseCache] Dropping unreadable entry {path.name}: {e}")
+            path.unlink(missing_ok=True)
+            return None
+
+        # LRU bookkeeping: atime = last read, mtime = write time (kept)
+        os.utime(path, (now, stat.st_mtime))
+        return text
+
+    def put(self, key: str, model: str, text: str):
+        if not text:
+            return
+        self.root.mkdir(parents=True, exist_ok=True)
+        path = self.root / f"{key}.json"
+        tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump({"model": model, "created": time.time(), "text": text}, f, ensure_ascii=False)
+        os.replace(tmp, path)
+        with self._lock:
+            self.evict()
+
+    def evict(self):
+        """Deletes least-recently-read entries until the cache fits in max_bytes."""
+        if not self.root.exists():
+            return
+        entries = []
+        total = 0
+        for path in self.root.glob("*.json"):
+            stat = path.stat()
+            entries.append((stat.st_atime, stat.st_size, path))
+            total += stat.st_size
+
+        if total <= self.max_bytes:
+            return
+        for _, size, path in sorted(entries):
+            path.unlink(missing_ok=True)
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def clear(self):
+        if not self.root.exists():
+            return
+        for path in self.root.glob("*.json"):
+            path.unlink(missing_ok=True)
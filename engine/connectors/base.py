@@ -1,6 +1,8 @@
+import time
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, Iterator, List, Optional, Union
 import pandas as pd
+from engine.scripts.utils.telemetry import frame_bytes
 
 class BaseConnector(ABC):
     """
@@ -9,6 +11,12 @@ class BaseConnector(ABC):
     def __init__(self, config: Dict[str, Any]):
         self.config = config
         self.name = config.get('name', 'unnamed_source')
+        # Optional QueryCache, attached by BaseScript.get_connector (None = no caching)
+        self.cache = None
+        # Optional JobTelemetry, attached by BaseScript.get_connector (None = not recorded)
+        self.telemetry = None
+        # Tenant (region, app, env) of the script using this connector, set by BaseScript.get_connector
+        self.scope = None
 
     @abstractmethod
     def connect(self):
@@ -28,6 +36,59 @@ class BaseConnector(ABC):
         For Sheets: query_str could be a range "Shee1!A1:B10" or empty for whole sheet.
         """
         pass
+
+    def cache_identity(self) -> Dict[str, Any]:
+        """
+        What a cached result depends on besides the query text: the tenant scope and the
+        datasource. Connectors add their resolved connection target (host, database, user...).
+        """
+        return {"source": self.name, "scope": list(self.scope) if self.scope else None}
+
+    def cached_query(self, query_str: str, ttl: float = None, **kwargs) -> pd.DataFrame:
+        """
+        query() behind the local result cache.
+        Entries are keyed on (tenant scope + resolved connection, rendered query, params);
+        `ttl` is in seconds. Falls through to query() when no cache is attached or ttl is not set.
+        """
+        if self.cache is None or not ttl:
+            return self.query(query_str, **kwargs)
+
+        key = self.cache.make_key(self.cache_identity(), query_str, kwargs.get('params'))
+        started = time.perf_counter()
+        df = self.cache.get(key, ttl)
+        if df is not None:
+            print(f"[{self.name}] Cache hit ({len(df)} rows).")
+            self._record_call("cache_hit", started, df, cached=True)
+            return df
+
+        df = self.query(query_str, **kwargs)
+        if isinstance(df, pd.DataFrame):
+            self.cache.put(key, df)
+        return df
+
+    def iter_query(self, query_str: str, chunk_size: int = None, **kwargs) -> Iterator[pd.DataFrame]:
+        """
+        Execute a query and yield the result as DataFrame chunks of at most `chunk_size` rows.
+        Default implementation slices the full result; connectors that can stream
+        from the server (e.g. SQLConnector) override this to keep memory bounded.
+        """
+        chunk_size = chunk_size or self.config.get('stream_chunk_size', 50000)
+        df = self.query(query_str, **kwargs)
+        if not isinstance(df, pd.DataFrame):
+            df = pd.DataFrame(df)
+        for start in range(0, len(df), chunk_size):
+            yield df.iloc[start:start + chunk_size]
+    
+    def _record_call(self, kind: str, started: float, result=None, rows: int = None, nbytes: int = None, cached: bool = False):
+        """Reports one call to the attached JobTelemetry (rows/bytes taken from `result` if not given)."""
+        if self.telemetry is None:
+            return
+        if isinstance(result, pd.DataFrame):
+            rows = len(result) if rows is None else rows
+            nbytes = frame_bytes(result) if nbytes is None else nbytes
+        elif result is not None and rows is None:
+            rows = len(result)
+        self.telemetry.record_call(self.name, kind, time.perf_counter() - started, rows or 0, nbytes or 0, cached)
     
     def __enter__(self):
         self.connect()
@@ -0,0 +1,202 @@
+import os
+import json
+import time
+import decimal
+import hashlib
+import datetime
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from engine.scripts.utils.paths import get_store_root
+
+CACHE_ROOT = get_store_root() / "system" / "cache" / "queries"
+# Entry files written by older versions (pickle could execute code when read); only deleted
+LEGACY_SUFFIXES = ('.parquet', '.pkl')
+
+
+class _Uncacheable(Exception):
+    """A value with no lossless JSON form (bytes, nested containers, timedeltas, ...)."""
+
+
+def _encode_value(v):
+    if v is None or isinstance(v, (str, bool, int, float)):
+        return v
+    if isinstance(v, decimal.Decimal):
+        return {"$dec": str(v)}
+    if isinstance(v, datetime.datetime):
+        return {"$dt": v.isoformat()}
+    if isinstance(v, datetime.date):
+        return {"$date": v.isoformat()}
+    if isinstance(v, np.generic):
+        return _encode_value(v.item())
+    if v is pd.NA or v is pd.NaT:
+        return None
+    raise _Uncacheable(type(v).__name__)
+
+
+def _decode_value(v):
+    if isinstance(v, dict):
+        if "$dec" in v:
+            return decimal.Decimal(v["$dec"])
+        if "$dt" in v:
+            return datetime.datetime.fromisoformat(v["$dt"])
+        return datetime.date.fromisoformat(v["$date"])
+    return v
+
+
+def _encode_column(s: pd.Series) -> Dict[str, Any]:
+    dtype = s.dtype
+    if isinstance(dtype, np.dtype) and dtype.kind in 'biuf':
+        return {"dtype": dtype.str, "values": s.tolist()}
+    if isinstance(dtype, pd.DatetimeTZDtype) or (isinstance(dtype, np.dtype) and dtype.kind == 'M'):
+        return {"dtype": str(dtype), "datetime": True,
+                "values": [None if pd.isna(v) else v.isoformat() for v in s]}
+    if isinstance(dtype, np.dtype) and dtype.kind != 'O':
+        raise _Uncacheable(str(dtype))
+    # object and extension dtypes (Int64, string, category, ...): tagged values
+    return {"dtype": str(dtype), "values": [_encode_value(v) for v in s.astype(object)]}
+
+
+def _decode_column(col: Dict[str, Any]) -> pd.Series:
+    dtype = col["dtype"]
+    if col.get("datetime"):
+        out = pd.to_datetime(pd.Series(col["values"], dtype=object), utc=True, format='ISO8601')
+        tz = getattr(pd.api.types.pandas_dtype(dtype), 'tz', None)
+        out = out.dt.tz_convert(tz) if tz is not None else out.dt.tz_localize(None)
+        return out.astype(dtype)
+    if dtype.startswith(('<', '>', '|')):
+        return pd.Series(col["values"], dtype=np.dtype(dtype))
+    values = pd.Series([_decode_value(v) for v in col["values"]], dtype=object)
+    return values if dtype == 'object' else values.astype(dtype)
+
+
+def encode_frame(df: pd.DataFrame) -> Optional[str]:
+    """
+    JSON document for a result frame (column order and dtypes kept, index dropped).
+    None when a column has no lossless JSON form; such results are simply not cached.
+    """
+    if not all(isinstance(c, str) for c in df.columns):
+        return None
+    try:
+        columns: List[Dict[str, Any]] = [
+            {"name": name, **_encode_column(df.iloc[:, i])} for i, name in enumerate(df.columns)
+        ]
+    except _Uncacheable:
+        return None
+    return json.dumps({"rows": len(df), "columns": columns}, ensure_ascii=False)
+
+
+def decode_frame(text: str) -> pd.DataFrame:
+    doc = json.loads(text)
+    columns = doc["columns"]
+    if not columns:
+        return pd.DataFrame(index=range(doc["rows"]))
+    data = [_decode_column(c) for c in columns]
+    df = pd.concat(data, axis=1, ignore_index=True)
+    df.columns = [c["name"] for c in columns]
+    return df
+
+
+class QueryCache:
+    """
+    Content-addressed, size-bounded cache of query results.
+
+    - Key: sha256(connection identity, rendered SQL, params). The identity carries the
+      tenant (region/app/env) and resolved host/database/user, so apps never share entries.
+    - Entry age comes from the file mtime (write time); TTL is decided by the caller per query.
+    - Reads bump the file atime, and eviction drops least-recently-read entries once
+      the cache exceeds `max_bytes`.
+    - Stored as JSON (encode_frame): reading an entry never executes code, and Decimal,
+      date and datetime values come back with their types. Results with values that have
+      no JSON form are not cached.
+    """
+
+    def __init__(self, root: Path = None, max_bytes: int = 512 * 1024 * 1024):
+        self.root = Path(root) if root else CACHE_ROOT
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(identity: Any, sql: str, params: Any = None) -> str:
+        payload = json.dumps([identity, sql.strip(), params], sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def get(self, key: str, ttl: float) -> Optional[pd.DataFrame]:
+        """Returns the cached frame if it is younger than `ttl` seconds, else None."""
+        path = self._find(key)
+        if path is None:
+            return None
+
+        now = time.time()
+        stat = path.stat()
+        if now - stat.st_mtime > ttl:
+            return None
+
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                df = decode_frame(f.read())
+        except Exception as e:
+            print(f"[QueryCache] Dropping unreadable entry {path.name}: {e}")
+            path.unlink(missing_ok=True)
+            return None
+
+        # LRU bookkeeping: atime = last read, mtime = write time (kept)
+        os.utime(path, (now, stat.st_mtime))
+        return df
+
+    def put(self, key: str, df: pd.DataFrame):
+        text = encode_frame(df)
+        if text is None:
+            print("[QueryCache] Result has values without a JSON form; not caching it.")
+            return
+        self.root.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            self._remove(key)
+            path = self.root / f"{key}.json"
+            tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+            with open(tmp, 'w', encoding='utf-8') as f:
+                f.write(text)
+            os.replace(tmp, path)
+            self.evict()
+
+    def evict(self):
+        """Deletes least-recently-read entries until the cache fits in max_bytes."""
+        if not self.root.exists():
+            return
+        entries = []
+        total = 0
+        for path in self.root.iterdir():
+            if path.suffix != '.json':
+                if path.suffix in LEGACY_SUFFIXES:
+                    path.unlink(missing_ok=True)
+                continue
+            stat = path.stat()
+            entries.append((stat.st_atime, stat.st_size, path))
+            total += stat.st_size
+
+        if total <= self.max_bytes:
+            return
+        for _, size, path in sorted(entries):
+            path.unlink(missing_ok=True)
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def clear(self):
+        if not self.root.exists():
+            return
+        for path in self.root.iterdir():
+            if path.suffix == '.json' or path.suffix in LEGACY_SUFFIXES:
+                path.unlink(missing_ok=True)
+
+    def _find(self, key: str) -> Optional[Path]:
+        path = self.root / f"{key}.json"
+        return path if path.exists() else None
+
+    def _remove(self, key: str):
+        for suffix in ('.json',) + LEGACY_SUFFIXES:
+            (self.root / f"{key}{suffix}").unlink(missing_ok=True)
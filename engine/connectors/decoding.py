@@ -0,0 +1,98 @@
+from typing import List, Sequence
+
+import numpy as np
+import pandas as pd
+
+# Column kinds derived from cursor.description type codes
+INT, FLOAT, DECIMAL, DATETIME, DATE, BOOL, OBJECT = 'int', 'float', 'decimal', 'datetime', 'date', 'bool', 'object'
+
+# pymysql.constants.FIELD_TYPE
+MYSQL_TYPE_KINDS = {
+    0: DECIMAL, 246: DECIMAL,                  # DECIMAL, NEWDECIMAL
+    1: INT, 2: INT, 3: INT, 8: INT, 9: INT, 13: INT,  # TINY, SHORT, LONG, LONGLONG, INT24, YEAR
+    4: FLOAT, 5: FLOAT,                        # FLOAT, DOUBLE
+    7: DATETIME, 12: DATETIME,                 # TIMESTAMP, DATETIME
+    10: DATE, 14: DATE,                        # DATE, NEWDATE
+}
+
+# PostgreSQL type OIDs
+POSTGRES_TYPE_KINDS = {
+    16: BOOL,
+    20: INT, 21: INT, 23: INT,                 # int8, int2, int4
+    700: FLOAT, 701: FLOAT,                    # float4, float8
+    1700: DECIMAL,                             # numeric
+    1114: DATETIME, 1184: DATETIME,            # timestamp, timestamptz
+    1082: DATE,
+}
+
+
+def column_kinds(description: Sequence, db_type: str) -> List[str]:
+    """Maps DB-API cursor.description to one column kind per column."""
+    table = POSTGRES_TYPE_KINDS if db_type == 'postgresql' else MYSQL_TYPE_KINDS
+    return [table.get(d[1], OBJECT) for d in description]
+
+
+def _object_array(values: tuple) -> np.ndarray:
+    arr = np.empty(len(values), dtype=object)
+    arr[:] = values
+    return arr
+
+
+def _decode_column(values: tuple, kind: str, decimal_as_float: bool = False):
+    """Builds one typed array from a column of raw driver values."""
+    if kind == INT:
+        if None in values:
+            # Same as the dict path: NULLs promote integers to float64
+            return np.array(values, dtype=np.float64)
+        try:
+            return np.array(values, dtype=np.int64)
+        except OverflowError:
+            # BIGINT UNSIGNED above 2^63: uint64 if it fits, else keep the Python ints
+            if min(values) >= 0 and max(values) < 2 ** 64:
+                return np.array(values, dtype=np.uint64)
+            return _object_array(values)
+    if kind == FLOAT or (kind == DECIMAL and decimal_as_float):
+        # float(Decimal) per element; None -> NaN
+        if None in values:
+            values = [np.nan if v is None else v for v in values]
+        return np.fromiter(map(float, values), dtype=np.float64, count=len(values))
+    if kind in (DATETIME, DATE):
+        # Drivers hand back values they could not convert as strings (MySQL zero-dates
+        # '0000-00-00 ...', out-of-range years): those become NaT
+        if any(isinstance(v, str) for v in values):
+            values = [None if isinstance(v, str) else v for v in values]
+        # pandas' C datetime parser is far faster than numpy's per-object conversion
+        first = next((v for v in values if v is not None), None)
+        utc = getattr(first, 'tzinfo', None) is not None
+        return pd.to_datetime(pd.Series(values, dtype=object), utc=utc, errors='coerce').array
+    if kind == BOOL and None not in values:
+        return np.array(values, dtype=bool)
+    # DECIMAL stays Decimal objects, as in the dict path
+    return _object_array(values)
+
+
+def frame_from_rows(rows: Sequence[tuple], description: Sequence, db_type: str = 'mysql',
+                    decimal_as_float: bool = False) -> pd.DataFrame:
+    """
+    Builds a DataFrame from tuple rows column-by-column, using cursor.description
+    for names and types instead of letting pandas re-scan one dict per row.
+
+    DATE/DATETIME -> datetime64 (unparseable values such as zero-dates -> NaT),
+    integers -> int64 (float64 when NULLs are present; uint64 or object beyond int64),
+    DECIMAL/NUMERIC -> Decimal objects (float64 with decimal_as_float, losing exactness),
+    everything else -> object.
+    """
+    names = [d[0] for d in description]
+    if not rows:
+        return pd.DataFrame(columns=names)
+
+    if len(set(names)) != len(names):
+        # Duplicate column names (e.g. unaliased joins): keep positional semantics
+        return pd.DataFrame.from_records(rows, columns=names)
+
+    kinds = column_kinds(description, db_type)
+    columns = list(zip(*rows))
+    data = {}
+    for name, kind, values in zip(names, kinds, columns):
+        data[name] = _decode_column(values, kind, decimal_as_float)
+    return pd.DataFrame(data, columns=names)
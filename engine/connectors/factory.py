@@ -1,9 +1,14 @@
 from typing import Dict, Any, Optional
 from .base import BaseConnector
 from .sql import SQLConnector
+from .pool import get_pool
 from .gsheet import GSheetConnector
 
 class ConnectorFactory:
+    """
+    Builds connectors from datasource config.
+    SQL connectors share tunnels and connections through the process-wide pool (see pool.py).
+    """
     @staticmethod
     def get_connector(name: str, config: Dict[str, Any]) -> BaseConnector:
         source_type = config.get('type')
@@ -16,3 +21,8 @@ class ConnectorFactory:
             return GSheetConnector(config)
             
         raise ValueError(f"Unknown datasource type: {source_type}")
+
+    @staticmethod
+    def pool_stats() -> Dict[str, Any]:
+        """Current stats of the shared SQL connection pool."""
+        return get_pool().stats()
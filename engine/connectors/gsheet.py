@@ -2,6 +2,7 @@ from typing import Any, Dict, List, Union
 import pandas as pd
 import gspread
 import os
+import time
 from .base import BaseConnector
 
 class GSheetConnector(BaseConnector):
@@ -10,6 +11,9 @@ class GSheetConnector(BaseConnector):
         self.client = None
         self.sheet = None
         
+    def cache_identity(self) -> Dict[str, Any]:
+        return {**super().cache_identity(), "spreadsheet_id": self.config.get('spreadsheet_id')}
+
     def connect(self):
         # Authenticate using Service Account or Local Creds
         # For this design, we assume a standard 'credentials.json' or env vars
@@ -56,8 +60,11 @@ class GSheetConnector(BaseConnector):
             else:
                 worksheet = self.sheet.worksheet(query_str)
                 
+            started = time.perf_counter()
             data = worksheet.get_all_records()
-            return pd.DataFrame(data)
+            df = pd.DataFrame(data)
+            self._record_call("query", started, df)
+            return df
         except Exception as e:
             print(f"[{self.name}] Error fetching data: {e}")
             raise
@@ -0,0 +1,390 @@
+import os
+import time
+import atexit
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+import pymysql
+import psycopg2
+from psycopg2.extras import RealDictCursor
+from sshtunnel import SSHTunnelForwarder
+
+
+@dataclass(frozen=True)
+class ConnectionSpec:
+    """
+    Everything needed to open one DB connection (optionally through an SSH tunnel).
+    Connections are pooled by `pool_key`, tunnels by `tunnel_key`.
+    """
+    db_type: str                       # mysql / doris / postgresql
+    host: str
+    port: int
+    user: Optional[str]
+    password: Optional[str] = field(repr=False, default=None)
+    database: Optional[str] = None
+    ssh_alias: Optional[str] = None    # None = direct connection
+    remote_host: Optional[str] = None
+    remote_port: Optional[int] = None
+
+    @property
+    def tunnel_key(self) -> Optional[Tuple]:
+        if not self.ssh_alias:
+            return None
+        return (self.ssh_alias, self.remote_host, self.remote_port)
+
+    @property
+    def pool_key(self) -> Tuple:
+        # (ssh_alias, remote_host, remote_port, database, user) + direct host/port for untunnelled sources
+        if self.ssh_alias:
+            return (self.db_type, self.ssh_alias, self.remote_host, self.remote_port, self.database, self.user)
+        return (self.db_type, None, self.host, self.port, self.database, self.user)
+
+
+class _SharedTunnel:
+    __slots__ = ('key', 'forwarder', 'refs', 'last_used', 'stopped')
+
+    def __init__(self, key: Tuple, forwarder: SSHTunnelForwarder):
+        self.key = key
+        self.forwarder = forwarder
+        self.refs = 0
+        self.last_used = time.monotonic()
+        self.stopped = False
+
+
+class _PooledConn:
+    __slots__ = ('conn', 'spec', 'tunnel', 'created_at', 'last_used')
+
+    def __init__(self, conn, spec: ConnectionSpec, tunnel: Optional[_SharedTunnel] = None):
+        self.conn = conn
+        self.spec = spec
+        # The tunnel instance this connection runs through (its reference is dropped on close)
+        self.tunnel = tunnel
+        self.created_at = time.monotonic()
+        self.last_used = self.created_at
+
+
+class ConnectionPool:
+    """
+    Process-wide pool of DB connections and the SSH tunnels they run through.
+
+    - One SSHTunnelForwarder per (ssh_alias, remote_host, remote_port), shared by every connection behind it.
+    - Idle connections are kept per pool key and handed back out after a health check.
+    - Connections idle longer than `idle_timeout` are closed; tunnels with no connections left are stopped.
+    - Settings can be overridden per pool key (configure(pool_key, ...)), so datasources
+      sharing the process-wide pool keep their own limits.
+    - Network I/O (SSH handshakes, health checks, rollback, closing connections and tunnels)
+      runs outside the lock; the lock only guards the bookkeeping.
+    """
+
+    def __init__(self, max_idle_per_key: int = 4, idle_timeout: float = 300, health_check_after: float = 30):
+        self.max_idle_per_key = max_idle_per_key
+        self.idle_timeout = idle_timeout
+        self.health_check_after = health_check_after
+
+        self._lock = threading.RLock()
+        self._tunnels: Dict[Tuple, _SharedTunnel] = {}
+        self._idle: Dict[Tuple, List[_PooledConn]] = {}
+        self._in_use: Dict[int, _PooledConn] = {}
+        self._key_settings: Dict[Tuple, Dict[str, Any]] = {}
+        # Tunnel keys whose forwarder is being started (outside the lock) -> set when done
+        self._starting: Dict[Tuple, threading.Event] = {}
+        self._stats = {
+            'connections_opened': 0,
+            'connections_reused': 0,
+            'connections_closed': 0,
+            'health_check_failures': 0,
+            'tunnels_opened': 0,
+            'tunnels_reused': 0,
+            'tunnels_closed': 0,
+        }
+
+    SETTINGS = ('max_idle_per_key', 'idle_timeout', 'health_check_after')
+
+    def configure(self, pool_key: Tuple = None, **settings):
+        """
+        Override pool settings (max_idle_per_key, idle_timeout, health_check_after)
+        for one pool key, or the process-wide defaults when `pool_key` is None.
+        """
+        settings = {k: v for k, v in settings.items() if v is not None and k in self.SETTINGS}
+        with self._lock:
+            if pool_key is None:
+                for k, v in settings.items():
+                    setattr(self, k, v)
+            else:
+                self._key_settings.setdefault(pool_key, {}).update(settings)
+
+    def _setting(self, pool_key: Tuple, name: str):
+        return self._key_settings.get(pool_key, {}).get(name, getattr(self, name))
+
+    # --- Public API ---
+
+    def acquire(self, spec: ConnectionSpec):
+        """Returns a live DB connection for `spec`, reusing an idle one when possible."""
+        self.evict_idle()
+
+        while True:
+            with self._lock:
+                idle = self._idle.get(spec.pool_key)
+                entry = idle.pop() if idle else None
+            if entry is None:
+                break
+            # The entry is off the idle list, so the check can run without the lock
+            healthy = self._is_healthy(entry)
+            closing = []
+            with self._lock:
+                if healthy:
+                    entry.last_used = time.monotonic()
+                    self._in_use[id(entry.conn)] = entry
+                    self._stats['connections_reused'] += 1
+                    return entry.conn
+                self._stats['health_check_failures'] += 1
+                self._detach_entry(entry, closing)
+            self._close_detached(closing)
+
+        host, port, tunnel = self._resolve_endpoint(spec)
+
+        # Opening the DB connection is slow; do it outside the lock
+        try:
+            conn = self._open_connection(spec, host, port)
+        except Exception:
+            closing = []
+            with self._lock:
+                self._release_tunnel(tunnel, closing)
+            self._close_detached(closing)
+            raise
+
+        entry = _PooledConn(conn, spec, tunnel)
+        with self._lock:
+            self._in_use[id(conn)] = entry
+            self._stats['connections_opened'] += 1
+        return conn
+
+    def release(self, conn, discard: bool = False):
+        """Returns a connection to the pool (or closes it if `discard` or the pool is full)."""
+        with self._lock:
+            entry = self._in_use.pop(id(conn), None)
+        if entry is None:
+            # Not ours (or already released)
+            return
+
+        if not discard:
+            try:
+                # Never park a connection with an open transaction
+                conn.rollback()
+            except Exception:
+                discard = True
+
+        closing = []
+        with self._lock:
+            key = entry.spec.pool_key
+            idle = self._idle.setdefault(key, [])
+            if discard or len(idle) >= self._setting(key, 'max_idle_per_key'):
+                self._detach_entry(entry, closing)
+            else:
+                entry.last_used = time.monotonic()
+                idle.append(entry)
+        self._close_detached(closing)
+
+    def evict_idle(self):
+        """Closes connections idle past `idle_timeout` and stops unused tunnels."""
+        now = time.monotonic()
+        closing = []
+        with self._lock:
+            for key, idle in list(self._idle.items()):
+                timeout = self._setting(key, 'idle_timeout')
+                keep = []
+                for entry in idle:
+                    if now - entry.last_used > timeout:
+                        self._detach_entry(entry, closing)
+                    else:
+                        keep.append(entry)
+                self._idle[key] = keep
+        self._close_detached(closing)
+
+    def close_all(self):
+        """Closes every idle and in-use connection and stops all tunnels."""
+        closing = []
+        with self._lock:
+            for idle in self._idle.values():
+                for entry in idle:
+                    self._detach_entry(entry, closing)
+            self._idle.clear()
+            for entry in list(self._in_use.values()):
+                self._detach_entry(entry, closing)
+            self._in_use.clear()
+            for tunnel in list(self._tunnels.values()):
+                self._retire_tunnel(tunnel, closing)
+        self._close_detached(closing)
+
+    def stats(self) -> Dict[str, Any]:
+        """Snapshot of pool counters and current sizes."""
+        with self._lock:
+            return {
+                **self._stats,
+                'idle': sum(len(v) for v in self._idle.values()),
+                'in_use': len(self._in_use),
+                'tunnels_active': len(self._tunnels),
+                'keys': len([k for k, v in self._idle.items() if v]),
+            }
+
+    # --- Tunnels ---
+
+    def _resolve_endpoint(self, spec: ConnectionSpec) -> Tuple[str, int, Optional[_SharedTunnel]]:
+        """
+        Returns (host, port, tunnel) to connect to, starting or reusing a shared tunnel if needed
+        (tunnel is None for direct connections). Call without the lock: the SSH handshake runs
+        unlocked, behind a per-tunnel-key "starting" Event that concurrent callers wait on.
+        """
+        key = spec.tunnel_key
+        if key is None:
+            return spec.host, spec.port, None
+
+        while True:
+            closing = []
+            with self._lock:
+                tunnel = self._tunnels.get(key)
+                if tunnel and not tunnel.forwarder.is_active:
+                    # Connections still holding the dead tunnel release it by instance, not by key
+                    self._retire_tunnel(tunnel, closing)
+                    tunnel = None
+                if tunnel:
+                    self._stats['tunnels_reused'] += 1
+                    tunnel.refs += 1
+                    tunnel.last_used = time.monotonic()
+                    return '127.0.0.1', tunnel.forwarder.local_bind_port, tunnel
+                starting = self._starting.get(key)
+                owner = starting is None
+                if owner:
+                    starting = self._starting[key] = threading.Event()
+            self._close_detached(closing)
+            if owner:
+                break
+            # Someone else is opening this tunnel: wait, then re-check (it may have failed)
+            starting.wait()
+
+        try:
+            print(f"[Pool] Opening SSH Tunnel via {spec.ssh_alias}...")
+            forwarder = SSHTunnelForwarder(
+                ssh_address_or_host=spec.ssh_alias,
+                ssh_config_file=os.path.expanduser('~/.ssh/config'),
+                remote_bind_address=(spec.remote_host, spec.remote_port)
+            )
+            forwarder.start()
+        except BaseException:
+            with self._lock:
+                self._starting.pop(key, None)
+            starting.set()
+            raise
+
+        with self._lock:
+            tunnel = _SharedTunnel(key, forwarder)
+            tunnel.refs = 1
+            self._tunnels[key] = tunnel
+            self._stats['tunnels_opened'] += 1
+            self._starting.pop(key, None)
+        starting.set()
+        print(f"[Pool] Tunnel active at localhost:{forwarder.local_bind_port}")
+        return '127.0.0.1', forwarder.local_bind_port, tunnel
+
+    def _release_tunnel(self, tunnel: Optional[_SharedTunnel], closing: List):
+        """Drops one reference to `tunnel`; retires it when unused. Caller holds lock."""
+        if tunnel is None:
+            return
+        tunnel.refs -= 1
+        if tunnel.refs <= 0:
+            self._retire_tunnel(tunnel, closing)
+
+    def _retire_tunnel(self, tunnel: _SharedTunnel, closing: List):
+        """
+        Unregisters a tunnel (if it is still the live one for its key) and queues it on
+        `closing` to be stopped once, by _close_detached(). Caller holds lock.
+        """
+        if self._tunnels.get(tunnel.key) is tunnel:
+            del self._tunnels[tunnel.key]
+        if tunnel.stopped:
+            return
+        tunnel.stopped = True
+        self._stats['tunnels_closed'] += 1
+        closing.append(tunnel)
+
+    def _close_detached(self, closing: List):
+        """Closes connections and stops tunnels detached under the lock. Call without the lock."""
+        for item in closing:
+            if isinstance(item, _SharedTunnel):
+                try:
+                    item.forwarder.stop()
+                except Exception as e:
+                    print(f"[Pool] Failed to stop tunnel {item.key[0]}: {e}")
+                print(f"[Pool] SSH Tunnel via {item.key[0]} closed.")
+            else:
+                try:
+                    item.conn.close()
+                except Exception:
+                    pass
+
+    # --- Connections ---
+
+    def _open_connection(self, spec: ConnectionSpec, host: str, port: int):
+        print(f"[Pool] Connecting to {spec.db_type} {spec.database} at {host}:{port}...")
+        if spec.db_type in ('mysql', 'doris'):
+            return pymysql.connect(
+                host=host,
+                port=port,
+                user=spec.user,
+                password=spec.password,
+                database=spec.database,
+                charset='utf8mb4',
+                cursorclass=pymysql.cursors.DictCursor
+            )
+        if spec.db_type == 'postgresql':
+            return psycopg2.connect(
+                host=host,
+                port=port,
+                user=spec.user,
+                password=spec.password,
+                dbname=spec.database,
+                cursor_factory=RealDictCursor
+            )
+        raise ValueError(f"Unsupported SQL type: {spec.db_type}")
+
+    def _is_healthy(self, entry: _PooledConn) -> bool:
+        """Cheap liveness check; only pings connections that sat idle for a while. Call without the lock."""
+        if time.monotonic() - entry.last_used < self._setting(entry.spec.pool_key, 'health_check_after'):
+            return True
+        try:
+            if entry.spec.db_type == 'postgresql':
+                if entry.conn.closed:
+                    return False
+                with entry.conn.cursor() as cursor:
+                    cursor.execute("SELECT 1")
+                entry.conn.rollback()
+            else:
+                entry.conn.ping(reconnect=False)
+            return True
+        except Exception:
+            return False
+
+    def _detach_entry(self, entry: _PooledConn, closing: List):
+        """
+        Queues one connection on `closing` and drops its tunnel reference (the connection
+        goes first, so it closes before its tunnel stops). Caller holds lock.
+        """
+        closing.append(entry)
+        self._stats['connections_closed'] += 1
+        self._release_tunnel(entry.tunnel, closing)
+
+
+# Process-wide singleton
+_pool: Optional[ConnectionPool] = None
+_pool_lock = threading.Lock()
+
+def get_pool() -> ConnectionPool:
+    """Returns the process-wide ConnectionPool (created on first use, closed at exit)."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ConnectionPool()
+                atexit.register(_pool.close_all)
+    return _pool
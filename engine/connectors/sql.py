@@ -1,88 +1,159 @@
 import os
+import time
+import uuid
 import pymysql
-import psycopg2
-from psycopg2.extras import RealDictCursor
-from sshtunnel import SSHTunnelForwarder
-from typing import Any, Dict, List, Union
+import psycopg2.extensions
+from typing import Any, Dict, Iterator, List, Union
 import pandas as pd
 from .base import BaseConnector
+from .pool import ConnectionSpec, get_pool
+from .decoding import frame_from_rows
+from engine.scripts.utils.telemetry import frame_bytes
 
 class SQLConnector(BaseConnector):
     def __init__(self, config: Dict[str, Any]):
         super().__init__(config)
         self.type = config.get('type', 'mysql') # mysql or postgresql
-        self.tunnel = None
         self.conn = None
-        
-    def connect(self):
+        self.pool = get_pool()
+        # 'dict' (DictCursor -> pd.DataFrame) or 'columnar' (tuple cursor -> typed columns)
+        self.result_format = config.get('result_format', 'dict')
+        # Columnar only: DECIMAL/NUMERIC as float64 instead of exact Decimal objects
+        self.decimal_as_float = bool(config.get('decimal_as_float', False))
+
+        # Optional per-datasource pool tuning, e.g. pool: {max_idle_per_key: 4, idle_timeout: 300}.
+        # Applied to this datasource's pool key on connect; other datasources keep the defaults.
+        self.pool_cfg = config.get('pool') or {}
+
+    def _build_spec(self) -> ConnectionSpec:
         tunnel_cfg = self.config.get('ssh_tunnel')
         
         db_host = self.config.get('host', '127.0.0.1')
         db_port = self.config.get('port', 3306 if self.type == 'mysql' else 5432)
         
-        # 1. Establish SSH Tunnel if needed
-        if tunnel_cfg and tunnel_cfg.get('enabled'):
-            user_ssh_config = os.path.expanduser('~/.ssh/config')
-            print(f"[{self.name}] Opening SSH Tunnel via {tunnel_cfg.get('ssh_alias')}...")
-            
-            self.tunnel = SSHTunnelForwarder(
-                ssh_address_or_host=tunnel_cfg.get('ssh_alias'),
-                ssh_config_file=user_ssh_config,
-                remote_bind_address=(tunnel_cfg.get('remote_host'), tunnel_cfg.get('remote_port', db_port))
-            )
-            self.tunnel.start()
-            
-            # Point DB connection to local tunnel
-            db_host = '127.0.0.1'
-            db_port = self.tunnel.local_bind_port
-            print(f"[{self.name}] Tunnel active at localhost:{db_port}")
-
-        # 2. Connect to Database
         user = os.environ.get(f"{self.name.upper()}_USER") or self.config.get('user')
         password = os.environ.get(f"{self.name.upper()}_PASSWORD") or self.config.get('password') 
         # Fallback to generic DB_USER/DB_PASS if specific ones not found
         if not user: user = os.environ.get('DB_USER')
         if not password: password = os.environ.get('DB_PASSWORD')
 
-        db_name = self.config.get('database')
-        
-        print(f"[{self.name}] Connecting to {self.type} at {db_host}...")
-        
-        if self.type == 'mysql' or self.type == 'doris':
-            self.conn = pymysql.connect(
-                host=db_host,
-                port=db_port,
-                user=user,
-                password=password,
-                database=db_name,
-                charset='utf8mb4',
-                cursorclass=pymysql.cursors.DictCursor
-            )
-        elif self.type == 'postgresql':
-            self.conn = psycopg2.connect(
-                host=db_host,
-                port=db_port,
-                user=user,
-                password=password,
-                dbname=db_name,
-                cursor_factory=RealDictCursor
-            )
-        else:
-            raise ValueError(f"Unsupported SQL type: {self.type}")
+        use_tunnel = bool(tunnel_cfg and tunnel_cfg.get('enabled'))
+        return ConnectionSpec(
+            db_type=self.type,
+            host=db_host,
+            port=db_port,
+            user=user,
+            password=password,
+            database=self.config.get('database'),
+            ssh_alias=tunnel_cfg.get('ssh_alias') if use_tunnel else None,
+            remote_host=tunnel_cfg.get('remote_host') if use_tunnel else None,
+            remote_port=tunnel_cfg.get('remote_port', db_port) if use_tunnel else None
+        )
+
+    def cache_identity(self) -> Dict[str, Any]:
+        spec = self._build_spec()
+        return {
+            **super().cache_identity(),
+            "type": spec.db_type, "host": spec.host, "port": spec.port, "database": spec.database,
+            "user": spec.user, "ssh_alias": spec.ssh_alias, "remote_host": spec.remote_host,
+            "remote_port": spec.remote_port,
+        }
+
+    def connect(self):
+        if self.conn:
+            return
+        # Tunnel + DB connection come from the process-wide pool
+        spec = self._build_spec()
+        if self.pool_cfg:
+            self.pool.configure(spec.pool_key, **self.pool_cfg)
+        self.conn = self.pool.acquire(spec)
+        print(f"[{self.name}] Connected ({self.type}).")
 
     def query(self, query_str: str, **kwargs) -> pd.DataFrame:
         if not self.conn:
             self.connect()
             
-        with self.conn.cursor() as cursor:
-            cursor.execute(query_str, kwargs.get('params'))
-            res = cursor.fetchall()
+        columnar = self.result_format == 'columnar'
+        started = time.perf_counter()
+        try:
+            with self._cursor(tuples=columnar) as cursor:
+                cursor.execute(query_str, kwargs.get('params'))
+                res = cursor.fetchall()
+                description = cursor.description
+        except Exception:
+            # Connection state is unknown after a failure; don't hand it to the next caller
+            self.pool.release(self.conn, discard=True)
+            self.conn = None
+            raise
+        if columnar:
+            df = frame_from_rows(res, description or [], self.type, self.decimal_as_float)
+        else:
             # Convert to DataFrame for easier handling in Analysis
-            return pd.DataFrame(res)
+            df = pd.DataFrame(res)
+        self._record_call("query", started, df)
+        return df
+
+    def _cursor(self, tuples: bool = False):
+        """Returns a cursor; tuples=True skips the connection's dict row factory."""
+        if not tuples:
+            return self.conn.cursor()
+        if self.type == 'postgresql':
+            return self.conn.cursor(cursor_factory=psycopg2.extensions.cursor)
+        return self.conn.cursor(pymysql.cursors.Cursor)
+
+    def iter_query(self, query_str: str, chunk_size: int = None, **kwargs) -> Iterator[pd.DataFrame]:
+        """
+        Streams the result with a server-side cursor (pymysql SSCursor / psycopg2 named cursor),
+        yielding DataFrames of at most `chunk_size` rows. Only one chunk is held in memory at a time.
+        """
+        chunk_size = chunk_size or self.config.get('stream_chunk_size', 50000)
+        if not self.conn:
+            self.connect()
+
+        if self.type == 'postgresql':
+            # Named cursors live on the server; plain tuple rows avoid per-row dicts
+            cursor = self.conn.cursor(name=f"kiwi_{uuid.uuid4().hex[:12]}", cursor_factory=psycopg2.extensions.cursor)
+            cursor.itersize = chunk_size
+        else:
+            cursor = self.conn.cursor(pymysql.cursors.SSCursor)
+
+        started = time.perf_counter()
+        total_rows = total_bytes = 0
+        try:
+            cursor.execute(query_str, kwargs.get('params'))
+            columns = None
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if columns is None:
+                    # Named cursors only expose description after the first fetch
+                    columns = [d[0] for d in cursor.description] if cursor.description else []
+                if not rows:
+                    break
+                if self.result_format == 'columnar':
+                    chunk = frame_from_rows(rows, cursor.description, self.type, self.decimal_as_float)
+                else:
+                    chunk = pd.DataFrame.from_records(rows, columns=columns)
+                total_rows += len(chunk)
+                if self.telemetry is not None:
+                    total_bytes += frame_bytes(chunk)
+                yield chunk
+            # Time includes the consumer's work between chunks (the stream is lazy)
+            self._record_call("stream", started, rows=total_rows, nbytes=total_bytes)
+        except Exception:
+            cursor = None
+            self.pool.release(self.conn, discard=True)
+            self.conn = None
+            raise
+        finally:
+            if cursor is not None:
+                try:
+                    # SSCursor.close() drains unread rows so the connection stays usable
+                    cursor.close()
+                except Exception:
+                    pass
 
     def disconnect(self):
         if self.conn:
-            self.conn.close()
-        if self.tunnel:
-            self.tunnel.stop()
-            print(f"[{self.name}] Connection closed.")
+            self.pool.release(self.conn)
+            self.conn = None
+            print(f"[{self.name}] Connection returned to pool.")
@@ -13,6 +13,7 @@ if str(PROJECT_ROOT) not in sys.path:
 from engine.scripts.utils.context_loader import loader
 from engine.scripts.utils.output_manager import OutputManager
 from engine.scripts.utils.notifier import Notifier
+from engine.scripts.utils.telemetry import JobTelemetry
 
 import logging
 
@@ -34,9 +35,13 @@ class BaseScript(ABC):
     NOTIFY_ON_SUCCESS = False
     NOTIFY_ON_FAILURE = True
 
-    def __init__(self):
+    def __init__(self, argv: List[str] = None):
+        """
+        Args:
+            argv: CLI arguments to parse instead of sys.argv (used by the in-process matrix runner).
+        """
         self._validate_meta()
-        self.args = self._parse_args()
+        self.args = self._parse_args(argv)
         self.dry_run = self.args.dry_run
         
         # Setup Logging
@@ -47,6 +52,9 @@ class BaseScript(ABC):
         )
         self.logger = logging.getLogger(self.JOB_NAME)
         
+        # Per-run timings, row counts and connector calls (meta.json + audit log)
+        self.telemetry = JobTelemetry()
+        
         # Load Config
         self.config = loader.load(
             region=self.args.region,
@@ -69,6 +77,9 @@ class BaseScript(ABC):
         
         # Init Paths Helper
         self.paths = self.PathHelper()
+        
+        # Connectors handed out by get_connector(); returned to the pool after run()
+        self._connectors = []
 
     class PathHelper:
         """Helper to access standard paths."""
@@ -88,7 +99,40 @@ class BaseScript(ABC):
 
     def get_connector(self, source_name: str):
         """Helper to get data connector from config."""
-        return loader.get_source(source_name, self.config)
+        connector = loader.get_source(source_name, self.config)
+        if not self.args.no_cache:
+            connector.cache = self._get_query_cache()
+        connector.telemetry = self.telemetry
+        connector.scope = (self.args.region, self.args.app, self.args.env)
+        self._connectors.append(connector)
+        return connector
+
+    def stage(self, name: str):
+        """
+        Times one phase of run() (wall, CPU, peak RSS; connector rows/bytes read inside it).
+
+            with self.stage("extract") as st:
+                df = connector.query(sql)
+            with self.stage("transform") as st:
+                out = build(df)
+                st.rows_out = len(out)
+        """
+        return self.telemetry.stage(name)
+
+    def _get_query_cache(self):
+        """Shared local result cache (size from config 'query_cache.max_size_mb')."""
+        from engine.connectors.cache import QueryCache
+        max_mb = self.config.get('query_cache', {}).get('max_size_mb', 512)
+        return QueryCache(max_bytes=int(max_mb) * 1024 * 1024)
+
+    def _release_connectors(self):
+        """Returns all connectors opened during run() to the shared pool."""
+        while self._connectors:
+            connector = self._connectors.pop()
+            try:
+                connector.disconnect()
+            except Exception as e:
+                self.logger.warning(f"Failed to release connector {connector.name}: {e}")
 
     def get_store_path(self, store_type: str, filename: str) -> Path:
         """
@@ -119,7 +163,7 @@ class BaseScript(ABC):
         if self.DOMAIN not in self.VALID_DOMAINS:
             raise ValueError(f"Invalid DOMAIN '{self.DOMAIN}'. Must be one of {self.VALID_DOMAINS}")
 
-    def _parse_args(self):
+    def _parse_args(self, argv: List[str] = None):
         parser = argparse.ArgumentParser(description=f"Kiwi Script: {self.JOB_NAME}")
         # Region and Env can have defaults, but App is mandatory for Multi-Tenancy
         parser.add_argument("--region", default="uae", help="Target Region (e.g. uae, br)")
@@ -129,10 +173,13 @@ class BaseScript(ABC):
         # Standard Dry Run Flag
         parser.add_argument("--dry-run", action="store_true", help="Simulate execution without side effects.")
         
+        # Bypass the local query result / LLM response caches (always hit the datasource / model)
+        parser.add_argument("--no-cache", action="store_true", help="Do not read or write the local query result and LLM response caches.")
+        
         # Allow subclasses to add arguments
         self.add_arguments(parser)
         
-        return parser.parse_args()
+        return parser.parse_args(argv)
 
     def add_arguments(self, parser):
         """Override to add custom arguments."""
@@ -152,6 +199,7 @@ class BaseScript(ABC):
         # Routing Key for Notifications
         routing_key = f"{self.DOMAIN}.{self.SUB_DOMAIN}" if self.SUB_DOMAIN else self.DOMAIN
         
+        result_meta, error, succeeded = {}, None, False
         try:
             print(f"[{self.JOB_NAME}] Starting execution...")
             if self.dry_run:
@@ -160,34 +208,67 @@ class BaseScript(ABC):
             # --- RUN ---
             result_meta = self.run() or {}
             # -----------
+            succeeded = True
             
-            # 1. Save Meta (via OutputManager)
-            self.out.save_meta(extra_info=result_meta)
-            
-            # 2. Notify Success
+            # Notify Success
             if self.NOTIFY_ON_SUCCESS:
                 summary = "\n".join([f"{k}: {v}" for k, v in result_meta.items()])
-                self.notifier.send(
-                    title=f"✅ Job Complete: {self.JOB_NAME}",
-                    message=f"Output: {self.out.output_dir}\n{summary}",
-                    key=routing_key
-                )
+                with self.stage("notify"):
+                    self.notifier.send(
+                        title=f"✅ Job Complete: {self.JOB_NAME}",
+                        message=f"Output: {self.out.output_dir}\n{summary}",
+                        key=routing_key
+                    )
             
         except Exception as e:
             # 1. Print Stack Trace
             traceback.print_exc()
+            error = str(e)
             
             # 2. Send Failure Notification
             error_msg = f"Error: {str(e)}\n\nTrace:\n{traceback.format_exc()[-500:]}" # Last 500 chars
             
             if self.NOTIFY_ON_FAILURE:
-                self.notifier.send(
-                    title=f"❌ Job Failed: {self.JOB_NAME}",
-                    message=error_msg,
-                    level="ERROR",
-                    key=routing_key
-                )
+                with self.stage("notify"):
+                    self.notifier.send(
+                        title=f"❌ Job Failed: {self.JOB_NAME}",
+                        message=error_msg,
+                        level="ERROR",
+                        key=routing_key
+                    )
             sys.exit(1)
+        finally:
+            self._release_connectors()
+            # Deliver queued notifications before the process exits
+            with self.stage("notify"):
+                self.notifier.flush()
+            try:
+                self._record_run("SUCCESS" if succeeded else "FAILED", result_meta, error)
+            except Exception as e:
+                self.logger.warning(f"Failed to record run metadata: {e}")
+
+    def _record_run(self, status: str, result_meta: Dict[str, Any], error: str = None):
+        """Writes meta.json and the execution_log row (both carry the telemetry summary)."""
+        from engine.scripts.system.audit_logger import AuditLogger
+        
+        telemetry = self.telemetry.summary()
+        self.out.save_meta(extra_info=result_meta, telemetry=telemetry, status=status)
+        AuditLogger().log_run(
+            domain=self.DOMAIN,
+            job_name=self.JOB_NAME,
+            output_path=str(self.out.output_dir),
+            status=status,
+            context=result_meta,
+            telemetry=telemetry,
+            app=self.args.app,
+            env=self.args.env,
+            error=error
+        )
+        stages = ", ".join(f"{name} {s['wall_sec']}s" for name, s in telemetry['stages'].items())
+        self.logger.info(
+            f"{status} in {telemetry['wall_sec']}s (cpu {telemetry['cpu_sec']}s, peak RSS {telemetry['peak_rss_mb']}MB, "
+            f"rows in/out {telemetry['rows_in']}/{telemetry['rows_out']})" + (f" | {stages}" if stages else "")
+        )
 
 if __name__ == "__main__":
     print("This is an abstract base class. Cannot run directly.")
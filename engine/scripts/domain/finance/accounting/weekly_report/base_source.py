@@ -1,43 +1,27 @@
 import pandas as pd
+import numpy as np
 import datetime
-from engine.clients.google_sheet import GoogleSheetClient
+from typing import Dict
+from engine.scripts.utils.sheet_schema import SheetSchema, ColumnSpec, DATE, NUMBER
+
+# India operations sheets: row 1 is config junk, row 2 holds the headers
+OPERATIONS_SCHEMA = SheetSchema([
+    ColumnSpec('Date', DATE, aliases=('日期',)),
+    ColumnSpec('Spend', NUMBER, aliases=('消耗',)),
+    ColumnSpec('CumSpend', NUMBER, aliases=('累计消耗',), default=None),
+    ColumnSpec('Orders', NUMBER, aliases=('首充人数',)),
+    ColumnSpec('CumOrders', NUMBER, aliases=('累计总首充',), default=None), # Usually inaccurate in sheet, checking logic below
+    ColumnSpec('NetDeposit', NUMBER, aliases=('实际冲提（USD)',)),
+], dropna=['Date'], label="Operations Sheet")
 
 class OperationsDataProcessor:
     """Encapsulates Pandas Clean-up & Calculation Logic."""
     
+    schema = OPERATIONS_SCHEMA
+    
     def clean_data(self, df: pd.DataFrame) -> pd.DataFrame:
-        df = df.copy()
-        
-        # 1. Fix Headers (Row 0 is usually junk config, Row 1 is headers)
-        if len(df) > 1:
-            real_headers = df.iloc[0]
-            df = df[1:].copy()
-            df.columns = real_headers
-            df.columns = df.columns.astype(str).str.strip()
-        
-        # Map Columns (Chinese -> English)
-        rename_map = {
-            '日期': 'Date',
-            '消耗': 'Spend',
-            '累计消耗': 'CumSpend',
-            '首充人数': 'Orders',
-            '累计总首充': 'CumOrders', # Usually inaccurate in sheet, checking logic below
-            '实际冲提（USD)': 'NetDeposit'
-        }
-        df = df.rename(columns=rename_map)
-        
-        # Clean Date
-        df['Date'] = pd.to_datetime(df['Date'], errors='coerce')
-        df = df.dropna(subset=['Date']) 
-        
-        # Clean Numeric Columns (Remove '$', ',')
-        cols_to_clean = ['Spend', 'Orders', 'NetDeposit', 'CumSpend', 'CumOrders']
-        for col in cols_to_clean:
-            if col in df.columns:
-                df[col] = df[col].astype(str).str.replace('$', '', regex=False).str.replace(',', '', regex=False).str.replace('%', '', regex=False)
-                df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0)
-                
-        return df
+        # Row 0 is usually junk config, Row 1 is headers
+        return self.schema.clean(df, header_row=0 if len(df) > 1 else None)
 
     def calc_weekly_metrics(self, df: pd.DataFrame) -> dict:
         total_spend = df['Spend'].sum()
@@ -74,9 +58,63 @@ class OperationsDataProcessor:
         metrics_cum["cpa"] = metrics_cum["spend"] / metrics_cum["orders"] if metrics_cum["orders"] > 0 else 0
         return metrics_cum
 
+# Daily columns feeding the weekly metrics (and the per-week checksums)
+WEEKLY_SUM_COLUMNS = {'Spend': 'spend', 'Orders': 'orders', 'NetDeposit': 'net_deposit'}
+
+def week_buckets(dates: pd.Series, last_week_start: datetime.date) -> np.ndarray:
+    """
+    Week index per row: 0 = the week starting `last_week_start`, 1 = the week before, ...
+    Rows after that week get -1. Pure datetime64 arithmetic (no per-row date objects).
+    """
+    end = np.datetime64(last_week_start + datetime.timedelta(days=7), 'D')
+    days_before_end = (end - dates.to_numpy().astype('datetime64[D]')).astype('int64')
+    buckets = (days_before_end - 1) // 7
+    buckets[days_before_end <= 0] = -1
+    return buckets
+
+def weekly_windows(df: pd.DataFrame, last_week_start: datetime.date, weeks: int = 2,
+                   buckets: np.ndarray = None, processor=None) -> pd.DataFrame:
+    """
+    Metrics for `weeks` trailing Mon-Sun weeks ending with the week starting `last_week_start`.
+    Rows are split by week bucket in one groupby; each week's metrics come from
+    processor.calc_weekly_metrics (default: OperationsDataProcessor). Weeks without rows
+    get the processor's metrics for an empty frame.
+    Returns:
+        One row per week (index 0 = last week), columns: start, end + the processor's
+        metrics (spend, orders, cpa, net_deposit, gross_profit).
+    """
+    processor = processor or OperationsDataProcessor()
+    if buckets is None:
+        buckets = week_buckets(df['Date'], last_week_start)
+    in_window = (buckets >= 0) & (buckets < weeks)
+    
+    by_week = dict(tuple(df[in_window].groupby(buckets[in_window])))
+    empty = df.iloc[:0]
+    rows = []
+    for i in range(weeks):
+        start = last_week_start - datetime.timedelta(days=7 * i)
+        metrics = processor.calc_weekly_metrics(by_week.get(i, empty))
+        rows.append({'start': start, 'end': start + datetime.timedelta(days=6), **metrics})
+    return pd.DataFrame(rows)
+
+def week_checksums(df: pd.DataFrame, buckets: np.ndarray) -> Dict[int, str]:
+    """
+    Content checksum per week bucket (>= 0) over the cleaned rows feeding the metrics.
+    Order-insensitive: row count + wrapped sum of per-row hashes.
+    """
+    closed = buckets >= 0
+    if not closed.any():
+        return {}
+    hashes = pd.util.hash_pandas_object(df.loc[closed, ['Date'] + list(WEEKLY_SUM_COLUMNS)], index=False)
+    grouped = pd.Series(hashes.to_numpy(), dtype='uint64').groupby(buckets[closed]).agg(['count', 'sum'])
+    return {int(b): f"{int(r['count'])}-{int(r['sum']):016x}" for b, r in grouped.iterrows()}
+
 class BaseWeeklySource:
     """Abstract Base Class (ABC) for Weekly Report Sources."""
     
+    # Trailing rows re-read on every run (finance back-fills recent days)
+    mutable_rows = 60
+    
     def __init__(self, sheet_id: str, app_name: str, sheet_gid: int = None, processor=None):
         self.sheet_id = sheet_id
         self.app_name = app_name
@@ -84,17 +122,25 @@ class BaseWeeklySource:
         # Default to India Processor if none provided
         self.processor = processor if processor else OperationsDataProcessor()
         
-    def get_weekly_data(self):
-        """Fetches data, calculates Last Week, Prev Week, and Cumulative metrics."""
-        gs = GoogleSheetClient()
+    def get_weekly_data(self, gs: 'GoogleSheetClient' = None, weeks: int = 2, store=None):
+        """
+        Fetches data, calculates Last Week, Prev Week, and Cumulative metrics.
+        Args:
+            gs: Shared, already-authenticated client. A new one is created if omitted.
+            weeks: Trailing weeks to aggregate (>= 2); all of them are returned under 'weeks'.
+            store: Optional WeeklyHistoryStore. Only weeks whose rows changed are
+                   re-aggregated and saved; the returned weeks are read from it.
+        """
+        if gs is None:
+            from engine.clients.google_sheet import GoogleSheetClient
+            gs = GoogleSheetClient()
         # Read Sheet
         url = f"https://docs.google.com/spreadsheets/d/{self.sheet_id}"
         
+        # Sheets are append-only daily logs: after the first run only rows past the
+        # cached watermark (plus a mutable tail for late edits) are transferred.
         # Pass GID explicitly if present
-        if self.sheet_gid is not None:
-             df = gs.read_as_dataframe(url, worksheet_gid=self.sheet_gid)
-        else:
-             df = gs.read_as_dataframe(url)
+        df = gs.read_incremental(url, worksheet_gid=self.sheet_gid, mutable_rows=self.mutable_rows)
              
         # Delegate cleaning to the specific processor
         # The processor is responsible for handling headers/indices
@@ -106,17 +152,16 @@ class BaseWeeklySource:
         last_week_start = today - datetime.timedelta(days=today.weekday() + 7)
         last_week_end = last_week_start + datetime.timedelta(days=6)
         
-        # Prev Week
-        prev_week_start = last_week_start - datetime.timedelta(days=7)
-        prev_week_end = last_week_start - datetime.timedelta(days=1)
-        
-        # 4. Filter
-        df_last_week = df[(df['Date'].dt.date >= last_week_start) & (df['Date'].dt.date <= last_week_end)]
-        df_prev_week = df[(df['Date'].dt.date >= prev_week_start) & (df['Date'].dt.date <= prev_week_end)]
-        
-        # 5. Calculate Metrics
-        metrics_last = self.processor.calc_weekly_metrics(df_last_week)
-        metrics_prev = self.processor.calc_weekly_metrics(df_prev_week)
+        # 4. Bucket every row into its week once, 5. then aggregate all weeks in one groupby
+        buckets = week_buckets(df['Date'], last_week_start)
+        recomputed = None
+        if store is not None:
+            table, recomputed = self._sync_history(store, df, buckets, last_week_start, max(weeks, 2))
+        else:
+            table = weekly_windows(df, last_week_start, weeks=max(weeks, 2), buckets=buckets,
+                                   processor=self.processor)
+        weekly = table.to_dict('records')
+        metrics_last, metrics_prev = weekly[0], weekly[1]
         
         # 6. Cumulative
         # Delegate cumulative extraction to processor if custom logic needed?
@@ -140,14 +185,11 @@ class BaseWeeklySource:
             metrics_cum["cpa"] = metrics_cum["spend"] / metrics_cum["orders"] if metrics_cum["orders"] > 0 else 0
         
         # 7. Check for missing spend (New Alert)
+        # Rows of last week where Spend is 0 or less (assuming valid spend is positive)
         missing_dates = []
-        if not df_last_week.empty:
-            # Check rows where Spend is 0 or less (assuming valid spend is positive)
-            # Use 'Spend' column.
-            # Convert to list of string YYYY-MM-DD
-            zero_spend = df_last_week[df_last_week['Spend'] <= 0]
-            if not zero_spend.empty:
-                missing_dates = zero_spend['Date'].dt.strftime('%Y-%m-%d').tolist()
+        zero_spend = df.loc[(buckets == 0) & (df['Spend'] <= 0).to_numpy(), 'Date']
+        if not zero_spend.empty:
+            missing_dates = zero_spend.dt.strftime('%Y-%m-%d').tolist()
 
         return {
             "app_name": self.app_name,
@@ -158,5 +200,34 @@ class BaseWeeklySource:
             "date_range": {
                 "start": last_week_start,
                 "end": last_week_end
-            }
+            },
+            # Newest first: [{"start", "end", "spend", "orders", "cpa", "net_deposit", "gross_profit"}, ...]
+            "weeks": weekly,
+            # Weeks re-aggregated this run (None without a history store)
+            "recomputed_weeks": recomputed
         }
+
+    def _sync_history(self, store, df: pd.DataFrame, buckets: np.ndarray, last_week_start: datetime.date, weeks: int):
+        """
+        Re-aggregates and saves only the closed weeks whose checksum differs from the
+        store (weeks no longer in the sheet are dropped), then reads the window back.
+        Returns (table, number of weeks recomputed).
+        """
+        def start_of(bucket: int) -> datetime.date:
+            return last_week_start - datetime.timedelta(days=7 * bucket)
+            
+        checksums = week_checksums(df, buckets)
+        stored = store.checksums(self.app_name)
+        
+        changed = sorted(b for b, c in checksums.items() if stored.get(start_of(b)) != c)
+        if changed:
+            mask = np.isin(buckets, changed)
+            table = weekly_windows(df[mask], last_week_start, weeks=changed[-1] + 1, buckets=buckets[mask],
+                                   processor=self.processor)
+            store.upsert(self.app_name, table.loc[changed], {start_of(b): checksums[b] for b in changed})
+            
+        current = {start_of(b) for b in checksums}
+        stale = [d for d in stored if d <= last_week_start and d not in current]
+        if stale:
+            store.delete(self.app_name, stale)
+        return store.history(self.app_name, last_week_start, weeks), len(changed)
@@ -0,0 +1,110 @@
+import os
+import sqlite3
+import datetime
+from pathlib import Path
+from typing import Dict, List
+
+import pandas as pd
+
+# Report metrics persisted per app and week (same names as weekly_windows)
+METRIC_COLUMNS = ['spend', 'orders', 'net_deposit', 'cpa', 'gross_profit']
+
+
+class WeeklyHistoryStore:
+    """
+    Per-app weekly metrics of the unified weekly report in a local SQLite table.
+
+    Each (app_name, week_start) row carries the checksum of the cleaned sheet rows
+    it was computed from, so a run only re-aggregates weeks whose rows changed
+    and reads every other week (and any trend window) from here.
+    """
+
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path)
+        os.makedirs(self.db_path.parent, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS weekly_metrics (
+                    app_name TEXT NOT NULL,
+                    week_start TEXT NOT NULL,
+                    week_end TEXT NOT NULL,
+                    spend REAL,
+                    orders REAL,
+                    net_deposit REAL,
+                    cpa REAL,
+                    gross_profit REAL,
+                    checksum TEXT,
+                    updated_at TEXT,
+                    PRIMARY KEY (app_name, week_start)
+                )
+            """)
+
+    def _connect(self):
+        # Sources are synced from worker threads: wait on the write lock instead of failing
+        return sqlite3.connect(self.db_path, timeout=30)
+
+    def checksums(self, app_name: str) -> Dict[datetime.date, str]:
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT week_start, checksum FROM weekly_metrics WHERE app_name = ?", (app_name,)
+            ).fetchall()
+        return {datetime.date.fromisoformat(start): checksum for start, checksum in rows}
+
+    def upsert(self, app_name: str, weeks: pd.DataFrame, checksums: Dict[datetime.date, str]):
+        """Stores weekly_windows rows (columns start, end + METRIC_COLUMNS) with their checksums."""
+        now = datetime.datetime.now().isoformat()
+        records = [
+            (app_name, r['start'].isoformat(), r['end'].isoformat(),
+             *[float(r[c]) for c in METRIC_COLUMNS], checksums[r['start']], now)
+            for r in weeks.to_dict('records')
+        ]
+        with self._connect() as conn:
+            conn.executemany(
+                f"""
+                INSERT OR REPLACE INTO weekly_metrics
+                (app_name, week_start, week_end, {', '.join(METRIC_COLUMNS)}, checksum, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                records
+            )
+
+    def delete(self, app_name: str, week_starts: List[datetime.date]):
+        with self._connect() as conn:
+            conn.executemany(
+                "DELETE FROM weekly_metrics WHERE app_name = ? AND week_start = ?",
+                [(app_name, d.isoformat()) for d in week_starts]
+            )
+
+    def history(self, app_name: str, last_week_start: datetime.date, weeks: int) -> pd.DataFrame:
+        """
+        `weeks` trailing weeks ending with the week starting `last_week_start`, newest first.
+        Same layout as weekly_windows; weeks with no stored row report zeros.
+        """
+        starts = [last_week_start - datetime.timedelta(days=7 * i) for i in range(weeks)]
+        with self._connect() as conn:
+            stored = pd.read_sql_query(
+                f"""
+                SELECT week_start, {', '.join(METRIC_COLUMNS)} FROM weekly_metrics
+                WHERE app_name = ? AND week_start BETWEEN ? AND ?
+                """,
+                conn,
+                params=(app_name, starts[-1].isoformat(), starts[0].isoformat())
+            )
+        stored = stored.set_index('week_start').reindex([d.isoformat() for d in starts], fill_value=0.0)
+        table = stored.reset_index(drop=True)
+        table.insert(0, 'start', starts)
+        table.insert(1, 'end', [d + datetime.timedelta(days=6) for d in starts])
+        return table
+
+    def frame(self, app_name: str = None) -> pd.DataFrame:
+        """All stored weeks (optionally one app), for ad-hoc WoW / MoM views."""
+        query = "SELECT * FROM weekly_metrics"
+        params = ()
+        if app_name:
+            query += " WHERE app_name = ?"
+            params = (app_name,)
+        with self._connect() as conn:
+            df = pd.read_sql_query(query + " ORDER BY app_name, week_start", conn, params=params)
+        for col in ('week_start', 'week_end'):
+            df[col] = pd.to_datetime(df[col])
+        return df
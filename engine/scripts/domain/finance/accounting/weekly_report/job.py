@@ -1,4 +1,5 @@
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 # Add engine to path
@@ -8,6 +9,7 @@ if str(PROJECT_ROOT) not in sys.path:
 
 from engine.scripts.core.base_script import BaseScript
 from engine.scripts.domain.finance.accounting.weekly_report.sources import ALL_SOURCES
+from engine.scripts.domain.finance.accounting.weekly_report.history_store import WeeklyHistoryStore
 
 class UnifiedWeeklyReportJob(BaseScript):
     DOMAIN = "finance"
@@ -22,19 +24,28 @@ class UnifiedWeeklyReportJob(BaseScript):
         # But BaseScript usually adds arguments. Let's just run with --app unified in command line.
         pass
 
+    def add_arguments(self, parser):
+        parser.add_argument("--concurrency", type=int, default=None, help="Max sources fetched in parallel (default: config weekly_report.max_concurrency or 3)")
+        parser.add_argument("--weeks", type=int, default=2, help="Trailing weeks aggregated per source (returned under 'weeks')")
+        parser.add_argument("--no-history", action="store_true", help="Aggregate straight from the sheets without the weekly history store")
+
     def run(self):
         self.logger.info("🚀 Starting Unified Weekly Report Job")
         
-        results = []
-        for SourceClass in ALL_SOURCES:
-            source = SourceClass()
-            self.logger.info(f"🔄 Processing Source: {source.app_name}")
-            try:
-                data = source.get_weekly_data()
-                results.append(data)
-                self.logger.info(f"✅ Success: {source.app_name}")
-            except Exception as e:
-                self.logger.error(f"❌ Failed: {source.app_name} - {e}", exc_info=True)
+        # One authenticated client shared by all sources; concurrency capped to stay under Sheets read quota
+        from engine.clients.google_sheet import GoogleSheetClient
+        gs = GoogleSheetClient()
+        concurrency = self.args.concurrency or self.config.get('weekly_report', {}).get('max_concurrency', 3)
+        sources = [SourceClass() for SourceClass in ALL_SOURCES]
+        
+        # Per-app weekly metrics persisted across runs; only weeks whose sheet rows changed are recomputed
+        store = None if self.args.no_history else WeeklyHistoryStore(self.get_store_path("db", "weekly_history.db"))
+        
+        with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+            futures = [pool.submit(self._fetch_source, source, gs, store) for source in sources]
+            # Collect in ALL_SOURCES order so the report layout is deterministic
+            results = [f.result() for f in futures]
+        results = [r for r in results if r is not None]
                 
         if not results:
             self.logger.warning("⚠️ No results generated.")
@@ -67,6 +78,19 @@ class UnifiedWeeklyReportJob(BaseScript):
         
         self.send_custom_notification(report_content)
 
+    def _fetch_source(self, source, gs, store=None):
+        """Fetches one source; errors are logged and isolated to that source."""
+        self.logger.info(f"🔄 Processing Source: {source.app_name}")
+        try:
+            data = source.get_weekly_data(gs, weeks=self.args.weeks, store=store)
+            recomputed = data.get('recomputed_weeks')
+            suffix = f" ({recomputed} week(s) recomputed)" if recomputed is not None else ""
+            self.logger.info(f"✅ Success: {source.app_name}{suffix}")
+            return data
+        except Exception as e:
+            self.logger.error(f"❌ Failed: {source.app_name} - {e}", exc_info=True)
+            return None
+
     def send_custom_notification(self, content):
         """Sends the unified report to the configured Lark webhook."""
         if hasattr(self, 'notifier'):
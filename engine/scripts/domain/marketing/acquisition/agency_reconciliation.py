@@ -5,7 +5,7 @@ from typing import Dict, Any, List
 from datetime import datetime, timedelta
 
 from engine.scripts.core.base_script import BaseScript
-from engine.clients.google_sheet import GoogleSheetClient
+from engine.scripts.utils.sheet_schema import SheetSchema, ColumnSpec, DATE, CURRENCY
 
 # --- Strategy Pattern for Agency Parsers ---
 
@@ -25,88 +25,51 @@ class BaseAgencyParser(ABC):
         """
         pass
 
+    def _finalize(self, clean_df: pd.DataFrame, target_date: str, agency: str) -> pd.DataFrame:
+        """Keeps only `target_date` rows (Date as 'YYYY-MM-DD') and tags the agency."""
+        clean_df['Date'] = clean_df['Date'].dt.strftime('%Y-%m-%d')
+        clean_df = clean_df[clean_df['Date'] == target_date].copy()
+        clean_df['Agency'] = agency
+        return clean_df
+
 class ADCParser(BaseAgencyParser):
     """Parser for ADC Agency (7+1% Fee)."""
     
+    # Column Selection by Index (Robust to header errors like #REF!)
+    # A(0): 日期 -> Date
+    # B(1): 打款金额 -> Payment Amount
+    # E(4): 花费（含汇损） -> Cost with Fee
+    # G(6): 花费 -> Cost
+    # Account level columns (C: 账号ID, D: 账号名称) live on the details tab, skipped for summary
+    schema = SheetSchema([
+        ColumnSpec('Date', DATE, index=0),
+        ColumnSpec('Payment Amount', CURRENCY, index=1, fill=0.0),
+        ColumnSpec('Cost with Fee', CURRENCY, index=4, fill=0.0),
+        ColumnSpec('Cost', CURRENCY, index=6, fill=0.0),
+    ], label="ADC Parser Error")
+    
     def parse(self, df: pd.DataFrame, target_date: str) -> pd.DataFrame:
-        # 1. Column Mapping (Based on User Requirements)
-        # A: 日期 -> Date
-        # B: 打款金额 -> Payment Amount
-        # C: 账号ID -> Account ID
-        # D: 账号名称 -> Account Name
-        # E: 花费（含汇损） -> Cost with Fee
-        # G: 花费 -> Cost
-        
-        # 1. Column Selection by Index (Robust to header errors like #REF!)
-        # A(0): Date
-        # B(1): Payment Amount
-        # E(4): Cost with Fee
-        # G(6): Cost
-        
-        try:
-            clean_df = df.iloc[:, [0, 1, 4, 6]].copy()
-            clean_df.columns = ['Date', 'Payment Amount', 'Cost with Fee', 'Cost']
-        except IndexError:
+        if df.shape[1] < 7:
             raise ValueError(f"ADC Parser Error: Sheet has fewer than 7 columns.")
-            
-        # Optional Map (Account Level) - specific to details tab, skipped for summary
-        # If we need account details later, we'd need a different parser or tab.
-        
-        # 3. Data Cleaning
-        # Convert Date to string YYYY-MM-DD
-        clean_df['Date'] = pd.to_datetime(clean_df['Date'], errors='coerce').dt.strftime('%Y-%m-%d')
-        
-        # Filter by Target Date
-        clean_df = clean_df[clean_df['Date'] == target_date].copy()
-        
-        # Numeric Conversion
-        numeric_cols = ['Payment Amount', 'Cost', 'Cost with Fee']
-        for col in numeric_cols:
-            clean_df[col] = pd.to_numeric(
-                clean_df[col].astype(str).str.replace(r'[^\d.-]', '', regex=True), 
-                errors='coerce'
-            ).fillna(0.0)
-            
-        # Add Agency Name
-        clean_df['Agency'] = 'ADC'
-        
-        return clean_df
+        return self._finalize(self.schema.clean(df), target_date, 'ADC')
 
 class UDParser(BaseAgencyParser):
     """Parser for UD Agency."""
     
+    # UD Mapping (Based on '消耗报表')
+    # A: 日期 -> Date
+    # B: 打款金额 -> Payment Amount
+    # E: 花费 -> Cost with Fee (Confirmed by user: 1.08 * Cost)
+    # G: 消耗 -> Cost
+    schema = SheetSchema([
+        ColumnSpec('Date', DATE, aliases=('日期',)),
+        ColumnSpec('Payment Amount', CURRENCY, aliases=('打款金额',), fill=0.0),
+        ColumnSpec('Cost with Fee', CURRENCY, aliases=('花费',), fill=0.0),
+        ColumnSpec('Cost', CURRENCY, aliases=('消耗',), fill=0.0),
+    ], label="UD Parser Error")
+    
     def parse(self, df: pd.DataFrame, target_date: str) -> pd.DataFrame:
-        # UD Mapping (Based on '消耗报表')
-        # A: 日期 -> Date
-        # B: 打款金额 -> Payment Amount
-        # E: 花费 -> Cost with Fee (Confirmed by user: 1.08 * Cost)
-        # G: 消耗 -> Cost
-        
-        column_map = {
-            '日期': 'Date',
-            '打款金额': 'Payment Amount',
-            '花费': 'Cost with Fee',
-            '消耗': 'Cost'
-        }
-        
-        missing_cols = [col for col in column_map.keys() if col not in df.columns]
-        if missing_cols:
-            raise ValueError(f"UD Parser Error: Missing columns {missing_cols}")
-
-        clean_df = df[list(column_map.keys())].rename(columns=column_map)
-        
-        # Data Cleaning
-        clean_df['Date'] = pd.to_datetime(clean_df['Date'], errors='coerce').dt.strftime('%Y-%m-%d')
-        clean_df = clean_df[clean_df['Date'] == target_date].copy()
-        
-        for col in ['Payment Amount', 'Cost', 'Cost with Fee']:
-            clean_df[col] = pd.to_numeric(
-                clean_df[col].astype(str).str.replace(r'[^\d.-]', '', regex=True), 
-                errors='coerce'
-            ).fillna(0.0)
-            
-        clean_df['Agency'] = 'UD'
-        return clean_df
+        return self._finalize(self.schema.clean(df), target_date, 'UD')
 
 class AgencyParserFactory:
     """Factory to get the correct parser based on template_type."""
@@ -141,21 +104,36 @@ class AgencyReconciliationScript(BaseScript):
         self.logger.info(f"🚀 Starting Ad Spend Reconciliation for Date: {yesterday}")
 
         all_data = []
+        from engine.clients.google_sheet import GoogleSheetClient
         gs_client = GoogleSheetClient(self.config)
 
-        # 2. Iterate Agencies
+        # 2. Fetch every agency tab up front: one batchGet per spreadsheet,
+        # only rows from the day before yesterday onward (header + trailing window)
+        since = (datetime.now() - timedelta(days=2)).date()
+        specs = {}
+        for agency_name, config in agencies.items():
+            if 'source_sheet_url' not in config:
+                self.logger.error(f"❌ Failed to process agency {agency_name}: missing source_sheet_url")
+                continue
+            tab_name = config.get('sheet_tab_name', '消耗报表')
+            self.logger.info(f"  - Reading Sheet: {config['source_sheet_url']} (Tab: {tab_name}) for {agency_name}")
+            specs[agency_name] = {
+                'sheet': config['source_sheet_url'],
+                'worksheet_name': tab_name,
+                'since': since,
+                'date_col': 1
+            }
+        raw_frames = gs_client.read_many(specs, raise_errors=False)
+
+        # 3. Parse Agencies
         for agency_name, config in agencies.items():
+            if agency_name not in specs:
+                continue
             try:
                 self.logger.info(f"Processing Agency: {agency_name}...")
                 
-                # Fetch Data
-                sheet_url = config['source_sheet_url']
-                tab_name = config.get('sheet_tab_name', '消耗报表')
                 template_type = config.get('template_type')
-                
-                self.logger.info(f"  - Reading Sheet: {sheet_url} (Tab: {tab_name})")
-                    
-                raw_df = gs_client.read_as_dataframe(sheet_url, worksheet_name=tab_name)
+                raw_df = raw_frames.get(agency_name, pd.DataFrame())
                 
                 if raw_df.empty:
                     self.logger.warning(f"  - Sheet is empty or failed to load.")
@@ -175,7 +153,7 @@ class AgencyReconciliationScript(BaseScript):
             except Exception as e:
                 self.logger.error(f"❌ Failed to process agency {agency_name}: {e}")
 
-        # 3. Aggregation & Output
+        # 4. Aggregation & Output
         if not all_data:
             self.logger.warning("⚠️ No data found for yesterday. Skipping report generation.")
             return
@@ -205,7 +183,7 @@ class AgencyReconciliationScript(BaseScript):
         self.logger.info(f"Total Records: {len(final_df)}")
         self.logger.info(f"Total Cost: {final_df['Cost'].sum()}")
         
-        # 4. Notify (Lark)
+        # 5. Notify (Lark)
         self._send_notification(yesterday, all_data)
         
     def _send_notification(self, date_str: str, dfs: List[pd.DataFrame]):
@@ -0,0 +1,86 @@
+from typing import Any, Dict
+
+import numpy as np
+import pandas as pd
+
+KEYS = ['route_type', 'sub_channel_norm', 'pay_method']
+
+
+class ChannelAnomalyGate:
+    """
+    Deterministic per-channel anomaly test run before the LLM.
+
+    A channel (route_type, sub_channel_norm, pay_method) is flagged as:
+    - 'drop':      SR fell vs baseline with a two-proportion z-score <= -z_threshold and
+                   by at least min_abs_delta points, with >= min_orders on both sides.
+    - 'low_sr':    SR below max_low_sr with >= min_orders (if max_low_sr is set).
+    - 'zero_flow': no orders now, while the baseline expects >= min_orders
+                   (baseline orders / baseline_days).
+    Channels with too little volume are never flagged, so small-sample noise stays out.
+    """
+
+    def __init__(self, z_threshold: float = 3.0, min_orders: int = 50, min_abs_delta: float = 2.0,
+                 max_low_sr: float = None, baseline_days: int = 1, skip_when_quiet: bool = False):
+        self.z_threshold = z_threshold
+        self.min_orders = min_orders
+        self.min_abs_delta = min_abs_delta
+        self.max_low_sr = max_low_sr
+        self.baseline_days = max(int(baseline_days), 1)
+        self.skip_when_quiet = skip_when_quiet
+
+    @classmethod
+    def from_config(cls, cfg: Dict[str, Any] = None) -> "ChannelAnomalyGate":
+        cfg = cfg or {}
+        return cls(
+            z_threshold=float(cfg.get('z_threshold', 3.0)),
+            min_orders=int(cfg.get('min_orders', 50)),
+            min_abs_delta=float(cfg.get('min_abs_delta', 2.0)),
+            max_low_sr=cfg.get('max_low_sr'),
+            baseline_days=cfg.get('baseline_days', 1),
+            skip_when_quiet=bool(cfg.get('skip_when_quiet', False)),
+        )
+
+    def evaluate(self, df_details: pd.DataFrame, df_base_details: pd.DataFrame) -> pd.DataFrame:
+        """
+        Returns df_details (current channels merged with 7d_* baseline columns, as built by
+        PaymentInsightScript) plus `z_score` and `anomaly` ('' if normal) columns.
+        Baseline channels missing from the current window are appended as zero-flow candidates.
+        """
+        df = df_details.copy()
+
+        # Two-proportion z-test, pooled variance
+        n1 = df['total_orders'].astype(float)
+        s1 = df['success_count'].astype(float)
+        n0 = df['7d_total_orders'].astype(float)
+        s0 = df['7d_success_count'].astype(float)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            pooled = (s1 + s0) / (n1 + n0)
+            se = np.sqrt(pooled * (1 - pooled) * (1 / n1 + 1 / n0))
+            z = (s1 / n1 - s0 / n0) / se
+        # Identical rates (se == 0) are not a change; no baseline gives no score
+        df['z_score'] = z.where(se > 0, 0.0).where(n0 > 0).round(2)
+
+        enough = (n1 >= self.min_orders)
+        drop = (
+            enough & (n0 >= self.min_orders)
+            & (df['z_score'] <= -self.z_threshold)
+            & (df['sr_delta'] <= -self.min_abs_delta)
+        )
+        df['anomaly'] = ''
+        if self.max_low_sr is not None:
+            df.loc[enough & (df['success_rate_pct'] < float(self.max_low_sr)), 'anomaly'] = 'low_sr'
+        df.loc[drop, 'anomaly'] = 'drop'
+
+        # Zero-flow: baseline channels with material expected volume that have no orders now
+        base = df_base_details[df_base_details['7d_total_orders'] / self.baseline_days >= self.min_orders]
+        current = df[KEYS].merge(base[KEYS], how='right', on=KEYS, indicator=True)
+        gone = current[current['_merge'] == 'right_only'][KEYS]
+        if not gone.empty:
+            zero = gone.merge(base, on=KEYS, how='left')
+            zero = zero.assign(total_orders=0, success_count=0, success_rate_pct=np.nan,
+                               sr_delta=np.nan, z_score=np.nan, anomaly='zero_flow')
+            df = pd.concat([df, zero[[c for c in df.columns if c in zero.columns]]], ignore_index=True)
+        zero_now = (df['total_orders'] == 0) & (df['7d_total_orders'] / self.baseline_days >= self.min_orders)
+        df.loc[zero_now, 'anomaly'] = 'zero_flow'
+
+        return df
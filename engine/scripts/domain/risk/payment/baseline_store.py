@@ -0,0 +1,65 @@
+import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List
+
+import pandas as pd
+
+
+class DailyPartitionStore:
+    """
+    Local per-day aggregates of gene_t_recharge_order for one app.
+
+    One small CSV per closed day holding the channel/pay_method group-by
+    (recharge_channel, upstream_channel, pay_method, total_orders, success_count).
+    A N-day baseline is the sum of N partitions, so each run only has to
+    query the days that are not stored yet.
+    """
+
+    KEYS = ['recharge_channel', 'upstream_channel', 'pay_method']
+    METRICS = ['total_orders', 'success_count']
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+
+    def path(self, day: datetime.date) -> Path:
+        return self.root / f"{day.strftime('%Y%m%d')}.csv"
+
+    def has(self, day: datetime.date) -> bool:
+        return self.path(day).exists()
+
+    def missing(self, days: Iterable[datetime.date]) -> List[datetime.date]:
+        return [d for d in days if not self.has(d)]
+
+    def save(self, day: datetime.date, df: pd.DataFrame):
+        """Stores one day's aggregate (re-grouped to the partition grain). Empty days are stored too."""
+        self.root.mkdir(parents=True, exist_ok=True)
+        if df.empty:
+            part = pd.DataFrame(columns=self.KEYS + self.METRICS)
+        else:
+            part = df[self.KEYS + self.METRICS].copy()
+            for col in self.METRICS:
+                part[col] = pd.to_numeric(part[col])
+            part = part.groupby(self.KEYS, dropna=False, as_index=False)[self.METRICS].sum()
+
+        # Write-then-rename so a crashed run never leaves a half-written partition
+        tmp = self.path(day).with_suffix('.tmp')
+        part.to_csv(tmp, index=False)
+        tmp.replace(self.path(day))
+
+    def load(self, day: datetime.date) -> pd.DataFrame:
+        return pd.read_csv(self.path(day))
+
+    def merge(self, days: Iterable[datetime.date], pending: Dict[datetime.date, pd.DataFrame] = None) -> pd.DataFrame:
+        """
+        Sums the partitions for `days` into one aggregate. Days in `pending` use the given
+        (not yet stored) frame instead of the file, e.g. for dry runs.
+        """
+        pending = pending or {}
+        parts = [pending[d] if d in pending else self.load(d) for d in days if d in pending or self.has(d)]
+        parts = [p[self.KEYS + self.METRICS] for p in parts if not p.empty]
+        if not parts:
+            return pd.DataFrame(columns=self.KEYS + self.METRICS)
+        merged = pd.concat(parts, ignore_index=True)
+        for col in self.METRICS:
+            merged[col] = pd.to_numeric(merged[col])
+        return merged.groupby(self.KEYS, dropna=False, as_index=False)[self.METRICS].sum()
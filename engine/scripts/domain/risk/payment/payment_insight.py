@@ -1,8 +1,5 @@
-import numpy as np
 import sys
-import pandas as pd
 import datetime
-import yaml
 from pathlib import Path
 from dateutil.relativedelta import relativedelta
 
@@ -12,8 +9,31 @@ if str(PROJECT_ROOT) not in sys.path:
     sys.path.append(str(PROJECT_ROOT))
 
 from engine.scripts.core.base_script import BaseScript
-from engine.clients.gemini import GeminiClient
-from engine.clients.google_drive import GoogleDriveClient
+from engine.scripts.utils.lazy_import import lazy_import
+from engine.scripts.utils.prompt_table import compact_table, estimate_tokens
+
+# Loaded on first use so `--help` and early exits don't pay for them
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+yaml = lazy_import("yaml")
+
+# Compact prompt tables: short headers (a legend in the prompt maps them back) and rounding
+PROMPT_ABBREVIATIONS = {
+    "route_type": "route",
+    "sub_channel_norm": "sub_channel",
+    "pay_method": "method",
+    "total_orders": "n",
+    "success_rate_pct": "sr",
+    "order_share_pct": "share",
+    "7d_total_orders": "n_base",
+    "7d_success_rate_pct": "sr_base",
+    "sr_delta": "d_sr",
+    "z_score": "z",
+}
+PROMPT_DECIMALS = {"total_orders": 0, "7d_total_orders": 0}
+SUMMARY_PROMPT_COLUMNS = ['route_type', 'pay_method', 'total_orders', 'success_rate_pct', 'order_share_pct']
+DETAIL_PROMPT_COLUMNS = ['anomaly', 'route_type', 'sub_channel_norm', 'pay_method', 'total_orders', 'success_rate_pct',
+                         '7d_success_rate_pct', 'sr_delta', '7d_total_orders', 'z_score']
 
 class PaymentInsightScript(BaseScript):
     DOMAIN = "risk"
@@ -22,6 +42,9 @@ class PaymentInsightScript(BaseScript):
     
     def add_arguments(self, parser):
         parser.add_argument("--period", type=str, default="yesterday", choices=["yesterday", "today"], help="Analysis Period: 'yesterday' (Daily Report) or 'today' (Intraday)")
+        parser.add_argument("--backfill-days", type=int, default=0, help="Populate the daily baseline partition store for the last N closed days, then exit.")
+        parser.add_argument("--rebuild", action="store_true", help="With --backfill-days: re-query days that are already stored.")
+        parser.add_argument("--full-baseline", action="store_true", help="Build the 7-day baseline with one full-range query instead of the daily partition store.")
 
     def run(self):
         app_name = self.args.app
@@ -33,10 +56,17 @@ class PaymentInsightScript(BaseScript):
         # Initialize Connector
         self.connector = self.get_connector('doris')
         
+        # Per-app store of daily channel aggregates (baseline partitions)
+        from engine.scripts.domain.risk.payment.baseline_store import DailyPartitionStore
+        self.partitions = DailyPartitionStore(self.get_store_path('files', 'baseline_partitions'))
+        
+        if self.args.backfill_days:
+            return self._backfill_partitions(app_id, self.args.backfill_days, self.args.rebuild)
+        
         if period == "yesterday":
-            self._run_daily(app_name, app_id)
+            return self._run_daily(app_name, app_id)
         else:
-            self._run_intraday(app_name, app_id)
+            return self._run_intraday(app_name, app_id)
 
     def _run_daily(self, app_name, app_id):
         # 1. Load SQL Config
@@ -62,20 +92,33 @@ class PaymentInsightScript(BaseScript):
         self.logger.info(f"📅 Daily Time Range: {start_time} to {end_time}")
 
         # 3. Extract Data
-        # Yesterday
-        sql_yesterday = self._inject_params(sql_cfg['queries']['yesterday_stats'], params)
-        df_yesterday = self.connector.query(sql_yesterday)
+        # Per-query cache TTL (seconds) declared in the report YAML
+        cache_ttl = sql_cfg.get('cache_ttl', {})
         
-        # Baseline
-        sql_baseline = self._inject_params(sql_cfg['queries']['baseline_stats'], params)
-        df_baseline = self.connector.query(sql_baseline)
+        with self.stage("extract"):
+            # Yesterday
+            sql_yesterday = self._inject_params(sql_cfg['queries']['yesterday_stats'], params)
+            df_yesterday = self._query(sql_yesterday, ttl=cache_ttl.get('yesterday_stats'))
+            
+            # Baseline: merge of stored daily partitions, querying only the missing days.
+            # --full-baseline falls back to the full 7-day scan.
+            if self.args.full_baseline:
+                sql_baseline = self._inject_params(sql_cfg['queries']['baseline_stats'], params)
+                df_baseline = self._query(sql_baseline, ttl=cache_ttl.get('baseline_stats'))
+            else:
+                baseline_days = [t_baseline.date() + datetime.timedelta(days=i) for i in range(7)]
+                df_baseline = self._load_baseline(sql_cfg, app_id, baseline_days)
+        
+        # Yesterday is closed: store it so tomorrow's baseline needs no new day query
+        if not self.dry_run:
+            self.partitions.save(t_yesterday.date(), df_yesterday)
         
         if df_yesterday.empty:
             self.logger.warning("No data for yesterday.")
             return
 
         # 4. Transform
-        self._process_and_deliver(app_name, df_yesterday, df_baseline, t_yesterday, "daily")
+        return self._process_and_deliver(app_name, df_yesterday, df_baseline, t_yesterday, "daily", sql_cfg)
 
     def _run_intraday(self, app_name, app_id):
         # 1. Load SQL Config
@@ -102,13 +145,16 @@ class PaymentInsightScript(BaseScript):
         self.logger.info(f"⏱️ Intraday Time Range: {t_today_start} to NOW vs Yesterday Same-Time")
 
         # 3. Extract Data
-        # Today
-        sql_today = self._inject_params(sql_cfg['queries']['today_stats'], params)
-        df_today = self.connector.query(sql_today)
+        cache_ttl = sql_cfg.get('cache_ttl', {})
         
-        # Yesterday Same Time
-        sql_yesterday = self._inject_params(sql_cfg['queries']['yesterday_same_time_stats'], params)
-        df_yesterday_baseline = self.connector.query(sql_yesterday)
+        with self.stage("extract"):
+            # Today
+            sql_today = self._inject_params(sql_cfg['queries']['today_stats'], params)
+            df_today = self._query(sql_today, ttl=cache_ttl.get('today_stats'))
+            
+            # Yesterday Same Time
+            sql_yesterday = self._inject_params(sql_cfg['queries']['yesterday_same_time_stats'], params)
+            df_yesterday_baseline = self._query(sql_yesterday, ttl=cache_ttl.get('yesterday_same_time_stats'))
         
         if df_today.empty:
             self.logger.warning("No data for today yet.")
@@ -125,70 +171,178 @@ class PaymentInsightScript(BaseScript):
             "success_count_yesterday": "success_count_7d"
         })
         
-        self._process_and_deliver(app_name, df_today, df_yesterday_baseline, t_now, "intraday")
+        return self._process_and_deliver(app_name, df_today, df_yesterday_baseline, t_now, "intraday", sql_cfg)
 
-    def _process_and_deliver(self, app_name, df_primary, df_baseline, date_obj, mode="daily"):
+    def _process_and_deliver(self, app_name, df_primary, df_baseline, date_obj, mode="daily", report_cfg=None):
+        report_cfg = report_cfg or {}
         # 4. Transform Data (Pandas Logic)
-        processor = PaymentDataProcessor()
-        
-        # Process Primary
-        df_processed = processor.process_raw_data(df_primary)
-        
-        # Process Baseline (for comparison)
-        df_base_processed = processor.process_raw_data(df_baseline, is_baseline=True)
-        
-        # Aggregate logic
-        df_summary = processor.aggregate_summary(df_processed)
-        df_details = processor.aggregate_details(df_processed)
-        df_base_details = processor.aggregate_details(df_base_processed, prefix="7d_")
-        
-        # Merge Baseline into Details
-        df_final_details = pd.merge(
-            df_details,
-            df_base_details[['route_type', 'sub_channel_norm', 'pay_method', '7d_success_rate_pct', '7d_total_orders']],
-            on=['route_type', 'sub_channel_norm', 'pay_method'],
-            how='left'
-        )
-        # Calculate Delta
-        df_final_details['sr_delta'] = df_final_details['success_rate_pct'] - df_final_details['7d_success_rate_pct']
+        with self.stage("transform"):
+            processor = PaymentDataProcessor()
+        
+            # Process Primary
+            df_processed = processor.process_raw_data(df_primary)
+        
+            # Process Baseline (for comparison)
+            df_base_processed = processor.process_raw_data(df_baseline, is_baseline=True)
+        
+            # Aggregate logic
+            df_summary = processor.aggregate_summary(df_processed)
+            df_details = processor.aggregate_details(df_processed)
+            df_base_details = processor.aggregate_details(df_base_processed, prefix="7d_")
+        
+            # Merge Baseline into Details
+            df_final_details = pd.merge(
+                df_details,
+                df_base_details[['route_type', 'sub_channel_norm', 'pay_method', '7d_success_rate_pct', '7d_total_orders', '7d_success_count']],
+                on=['route_type', 'sub_channel_norm', 'pay_method'],
+                how='left'
+            )
+            # Calculate Delta
+            df_final_details['sr_delta'] = df_final_details['success_rate_pct'] - df_final_details['7d_success_rate_pct']
+
+            # Statistical gate: flags significant SR drops, failing and zero-flow channels
+            from engine.scripts.domain.risk.payment.anomaly_gate import ChannelAnomalyGate
+            gate = ChannelAnomalyGate.from_config(report_cfg.get('gate'))
+            df_final_details = gate.evaluate(df_final_details, df_base_details)
+            n_flagged = int((df_final_details['anomaly'] != '').sum())
+            self.logger.info(f"🔎 Anomaly gate: {n_flagged} of {len(df_final_details)} channels flagged")
 
         # 5. Load / Export (Multi-Output)
-        output_dir = self.paths.get_output_root(self.DOMAIN, self.SUB_DOMAIN) / app_name / date_obj.strftime("%Y-%m")
-        output_dir.mkdir(parents=True, exist_ok=True)
+        with self.stage("export") as st:
+            output_dir = self.paths.get_output_root(self.DOMAIN, self.SUB_DOMAIN) / app_name / date_obj.strftime("%Y-%m")
+            output_dir.mkdir(parents=True, exist_ok=True)
+        
+            suffix = mode
+            summary_path = output_dir / f"payment_summary_{date_obj.strftime('%Y%m%d')}_{suffix}.csv"
+            df_summary.to_csv(summary_path, index=False)
         
-        suffix = mode
-        summary_path = output_dir / f"payment_summary_{date_obj.strftime('%Y%m%d')}_{suffix}.csv"
-        df_summary.to_csv(summary_path, index=False)
+            details_path = output_dir / f"payment_details_{date_obj.strftime('%Y%m%d')}_{suffix}.csv"
+            df_final_details.to_csv(details_path, index=False)
         
-        details_path = output_dir / f"payment_details_{date_obj.strftime('%Y%m%d')}_{suffix}.csv"
-        df_final_details.to_csv(details_path, index=False)
+            st.rows_out = len(df_summary) + len(df_final_details)
+            self.logger.info(f"💾 Data saved to:\n  - {summary_path}")
         
-        self.logger.info(f"💾 Data saved to:\n  - {summary_path}")
+        # Quiet window: nothing for the model to explain, so no upload, LLM call or alert
+        if not n_flagged and gate.skip_when_quiet:
+            self.logger.info("✅ All channels within normal bands; skipping AI analysis.")
+            return {"mode": mode, "flagged_channels": 0, "ai_analysis": "skipped"}
         
         # 5.1 Upload to Google Drive (if configured)
-        drive_links = {}
-        folder_id = self.config.get('google_drive', {}).get('payment_risk_folder_id')
-        
-        if folder_id:
-            try:
-                # Intraday might skip drive upload to save API quota? OR upload to a 'Temp' folder?
-                # User didn't specify, but for safety let's upload.
-                self.logger.info(f"🚀 Uploading to Google Drive...")
-                drive = GoogleDriveClient(self.config)
+        with self.stage("export"):
+            drive_links = {}
+            drive_cfg = self.config.get('google_drive', {})
+            folder_id = drive_cfg.get('payment_risk_folder_id')
+        
+            if folder_id:
+                try:
+                    self.logger.info(f"🚀 Uploading to Google Drive...")
+                    from engine.clients.google_drive import GoogleDriveClient
+                    drive = GoogleDriveClient(self.config)
                 
-                f_sum = drive.upload_file(str(summary_path), folder_id=folder_id)
-                drive_links['Summary'] = f_sum.get('webViewLink')
-                
-                f_det = drive.upload_file(str(details_path), folder_id=folder_id)
-                drive_links['Details'] = f_det.get('webViewLink')
-            except Exception as e:
-                self.logger.error(f"❌ Google Drive Upload Failed: {e}")
+                    # Both files in parallel. Re-runs (hourly intraday, retries) update the same-named
+                    # file in place, and skip the upload entirely when its content is unchanged.
+                    # The folder is shared by all apps: the Drive name must carry the app.
+                    paths = [summary_path, details_path]
+                    f_sum, f_det = drive.upload_files(
+                        [str(p) for p in paths], folder_id=folder_id,
+                        new_names=[f"{app_name}_{p.name}" for p in paths],
+                        compress=drive_cfg.get('upload_compress'), replace=True
+                    )
+                    drive_links['Summary'] = f_sum.get('webViewLink')
+                    drive_links['Details'] = f_det.get('webViewLink')
+                except Exception as e:
+                    self.logger.error(f"❌ Google Drive Upload Failed: {e}")
 
         # 6. Prepare AI Prompt
-        df_top_movers = df_final_details.sort_values('total_orders', ascending=False).head(20)
-        data_text = f"## Overall Performance\n{df_summary.to_markdown(index=False)}\n\n## Top Channels Detail\n{df_top_movers.to_markdown(index=False)}"
+        data_text = self._build_data_text(df_summary, df_final_details, report_cfg.get('prompt', {}))
         
         self._run_ai_analysis(app_name, date_obj, data_text, details_path, drive_links, mode)
+        return {"mode": mode, "flagged_channels": n_flagged, "ai_analysis": "requested"}
+
+    def _build_data_text(self, df_summary, df_details, prompt_cfg):
+        """
+        Compact prompt tables: the overall summary plus only the channels flagged by
+        the anomaly gate, by volume, cut to the token budget.
+        """
+        budget = prompt_cfg.get('token_budget', 1200)
+
+        summary_text = compact_table(
+            df_summary.sort_values('total_orders', ascending=False), SUMMARY_PROMPT_COLUMNS,
+            PROMPT_ABBREVIATIONS, PROMPT_DECIMALS, title="## Overall Performance"
+        )
+
+        # Zero-flow rows have no orders now: rank them by their expected (baseline) volume
+        volume = df_details['total_orders'].where(df_details['total_orders'] > 0, df_details['7d_total_orders'])
+        df_details = df_details.assign(_volume=volume).sort_values('_volume', ascending=False)
+        flagged = df_details['anomaly'] != ''
+        df_flagged = df_details[flagged]
+        stable = int((~flagged).sum())
+        details_text = compact_table(
+            df_flagged, DETAIL_PROMPT_COLUMNS, PROMPT_ABBREVIATIONS, PROMPT_DECIMALS,
+            max_rows=prompt_cfg.get('max_detail_rows', 20),
+            token_budget=max(budget - estimate_tokens(summary_text), 100),
+            title=f"## Flagged Channels ({stable} channels within normal bands omitted)"
+        )
+
+        data_text = f"{summary_text}\n\n{details_text}"
+        self.logger.info(f"🧾 Prompt data: ~{estimate_tokens(data_text)} tokens "
+                         f"({len(df_summary)} summary rows, {len(df_flagged)} of {len(df_details)} channels flagged)")
+        return data_text
+
+    def _load_baseline(self, sql_cfg, app_id, days):
+        """
+        Builds the N-day baseline from stored partitions, filling any missing days first.
+        Under --dry-run the missing days are queried but only merged in memory.
+        """
+        missing = self.partitions.missing(days)
+        self.logger.info(f"🗂️ Baseline: {len(days) - len(missing)} cached partitions, {len(missing)} to query")
+        fresh = {day: self._fill_partition(sql_cfg, app_id, day) for day in missing}
+            
+        df = self.partitions.merge(days, pending=fresh)
+        return df.rename(columns={
+            "total_orders": "total_orders_7d",
+            "success_count": "success_count_7d"
+        })
+
+    def _fill_partition(self, sql_cfg, app_id, day):
+        """Queries one closed day at partition grain and stores it (unless dry-running)."""
+        params = {
+            "app_id": app_id,
+            "day_start": day.strftime("%Y-%m-%d 00:00:00"),
+            "day_end": (day + datetime.timedelta(days=1)).strftime("%Y-%m-%d 00:00:00")
+        }
+        sql = self._inject_params(sql_cfg['queries']['daily_partition_stats'], params)
+        df = self._query(sql)
+        if not self.dry_run:
+            self.partitions.save(day, df)
+        return df
+
+    def _backfill_partitions(self, app_id, n_days, rebuild=False):
+        """Populates partitions for the last `n_days` closed days (yesterday backwards)."""
+        sql_cfg_path = self.paths.knowledge_root / "reports" / "risk" / "payment" / "payment_insight_daily.yaml"
+        with open(sql_cfg_path, 'r') as f:
+            sql_cfg = yaml.safe_load(f)
+            
+        today = datetime.date.today()
+        days = [today - datetime.timedelta(days=i) for i in range(1, n_days + 1)]
+        todo = days if rebuild else self.partitions.missing(days)
+        self.logger.info(f"🗂️ Backfilling {len(todo)} of {len(days)} day partitions into {self.partitions.root}")
+        
+        if self.dry_run:
+            return {"backfill_days": n_days, "would_query": len(todo)}
+            
+        for day in sorted(todo):
+            df = self._fill_partition(sql_cfg, app_id, day)
+            self.logger.info(f"  - {day}: {len(df)} rows")
+        return {"backfill_days": n_days, "queried": len(todo)}
+
+    def _query(self, sql, ttl=None):
+        """
+        Runs a report query through the local cache for `ttl` seconds (if set).
+        The queries GROUP BY channel on the server, so results stay small and are
+        fetched in one go; streaming would not bound memory here.
+        """
+        return self.connector.cached_query(sql, ttl=ttl)
 
     def _inject_params(self, sql, params):
         for k, v in params.items():
@@ -217,13 +371,32 @@ class PaymentInsightScript(BaseScript):
                          .replace("{{time}}", time_str)\
                          .replace("{{data_table}}", data_text)
         
-        self.logger.info("🧠 Requesting Gemini Analysis (Model: gemini-3-pro-preview)...")
+        self.logger.info(f"🧠 Requesting Gemini Analysis (Model: gemini-3-pro-preview, ~{estimate_tokens(prompt)} prompt tokens)...")
+        from engine.clients.gemini import GeminiClient
         gemini = GeminiClient(self.config, model="gemini-3-pro-preview")
-        analysis_text = gemini.generate_content(prompt) or "⚠️ Analysis Failed."
+        # Re-runs over the same data snapshot are answered from the local response cache
+        use_cache = not self.args.no_cache
+        if mode == "intraday":
+            # Time-to-alert matters: stream, and post the first section (urgent alerts) as
+            # soon as the model moves on to the next one; the full analysis follows.
+            from engine.clients.llm_batch import FirstSection
+            headline = FirstSection(lambda section: self._send_headline(app_name, date_obj, section))
+            analysis_text = gemini.generate_stream(prompt, on_chunk=headline, use_cache=use_cache) or "⚠️ Analysis Failed."
+        else:
+            analysis_text = gemini.generate_content(prompt, use_cache=use_cache) or "⚠️ Analysis Failed."
 
         # Send Notification
         self._send_notification(app_name, date_obj, analysis_text, csv_path, drive_links, mode)
 
+    def _send_headline(self, app_name, date_obj, section):
+        """Early intraday alert with the first streamed section of the analysis."""
+        title = f"🚨 日内支付预警 (速报): {app_name}"
+        message = f"**{title}**\n📅 Time: {date_obj.strftime('%Y-%m-%d %H:%M')}\n"
+        message += "--------------------------------\n"
+        message += section
+        message += "\n--------------------------------\n⏳ 完整分析稍后发送 (Full analysis follows)"
+        self.notifier.send(title=title, message=message, key="risk.payment")
+
     def _send_notification(self, app_name, date_obj, analysis, csv_path, drive_links=None, mode="daily"):
         if mode == "intraday":
             title_emoji = "🚨" if "alert" in analysis.lower() or "urgent" in analysis.lower() else "⏱️"
@@ -252,7 +425,7 @@ class PaymentInsightScript(BaseScript):
 class PaymentDataProcessor:
     """Encapsulates Pandas transformation logic for Payment domain."""
     
-    def process_raw_data(self, df: pd.DataFrame, is_baseline=False) -> pd.DataFrame:
+    def process_raw_data(self, df: 'pd.DataFrame', is_baseline=False) -> 'pd.DataFrame':
         """Raw Logs -> Normalized Data"""
         if df.empty:
             return df
@@ -275,7 +448,7 @@ class PaymentDataProcessor:
         
         return df
 
-    def aggregate_summary(self, df: pd.DataFrame) -> pd.DataFrame:
+    def aggregate_summary(self, df: 'pd.DataFrame') -> 'pd.DataFrame':
         """Aggregates by Route + PayMethod (High Level)"""
         # Group
         g = df.groupby(['route_type', 'pay_method']).agg({
@@ -286,7 +459,7 @@ class PaymentDataProcessor:
         # Calculate Metrics
         return self._calc_metrics(g)
 
-    def aggregate_details(self, df: pd.DataFrame, prefix="") -> pd.DataFrame:
+    def aggregate_details(self, df: 'pd.DataFrame', prefix="") -> 'pd.DataFrame':
         """Aggregates by SubChannel (Provider Level)"""
         # Group by Normalized Channel
         g = df.groupby(['route_type', 'sub_channel_norm', 'pay_method']).agg({
@@ -310,7 +483,7 @@ class PaymentDataProcessor:
             
         return res
 
-    def _calc_metrics(self, df: pd.DataFrame) -> pd.DataFrame:
+    def _calc_metrics(self, df: 'pd.DataFrame') -> 'pd.DataFrame':
         """Shared Metric Calculation"""
         # Success Rate
         df['success_rate_pct'] = (df['success_count'] / df['total_orders'] * 100).round(2)
@@ -9,6 +9,20 @@ from engine.scripts.utils.paths import get_store_root
 PROJECT_ROOT = Path(__file__).resolve().parents[4] # engine/scripts/system/ -> ROOT
 AUDIT_DB_PATH = get_store_root() / "system" / "db" / "audit.db"
 
+# Run telemetry columns added to execution_log after the original schema (migrated in place)
+TELEMETRY_COLUMNS = {
+    "app": "TEXT",
+    "env": "TEXT",
+    "duration_sec": "REAL",
+    "cpu_sec": "REAL",
+    "peak_rss_mb": "REAL",
+    "rows_in": "INTEGER",
+    "rows_out": "INTEGER",
+    "bytes_in": "INTEGER",
+    "error": "TEXT",
+    "telemetry_json": "TEXT",
+}
+
 class AuditLogger:
     """
     Logs execution events to a central SQLite database.
@@ -32,30 +46,88 @@ class AuditLogger:
                     meta_json TEXT
                 )
             """)
+            existing = {row[1] for row in conn.execute("PRAGMA table_info(execution_log)")}
+            for column, col_type in TELEMETRY_COLUMNS.items():
+                if column not in existing:
+                    conn.execute(f"ALTER TABLE execution_log ADD COLUMN {column} {col_type}")
+            # One row per telemetry stage, so stage reports don't parse telemetry_json
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS execution_stage (
+                    log_id INTEGER NOT NULL,
+                    timestamp TEXT,
+                    job_name TEXT,
+                    app TEXT,
+                    stage TEXT,
+                    count INTEGER,
+                    wall_sec REAL,
+                    cpu_sec REAL,
+                    rows_in INTEGER,
+                    rows_out INTEGER
+                )
+            """)
+            # Time-window scans (perf_report) stay index range scans as the log grows
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_execution_log_ts ON execution_log (timestamp)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_execution_log_job_ts ON execution_log (job_name, timestamp)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_execution_stage_ts ON execution_stage (timestamp)")
 
     def log_success(self, domain: str, job_name: str, output_path: str, context: Dict[str, Any]):
+        self.log_run(domain, job_name, output_path, "SUCCESS", context)
+
+    def log_run(self, domain: str, job_name: str, output_path: str, status: str, context: Dict[str, Any],
+                telemetry: Dict[str, Any] = None, app: str = None, env: str = None, error: str = None):
+        """
+        Logs one run (SUCCESS or FAILED) with its JobTelemetry summary.
+        Totals go to their own columns; the full summary (stages, connectors) to telemetry_json.
+        """
+        telemetry = telemetry or {}
         try:
             import json
             import getpass
             import socket
             
+            timestamp = datetime.now().isoformat()
             with sqlite3.connect(AUDIT_DB_PATH) as conn:
-                conn.execute(
+                cur = conn.execute(
                     """
                     INSERT INTO execution_log 
-                    (timestamp, domain, job_name, user, host, output_path, status, meta_json)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                    (timestamp, domain, job_name, user, host, output_path, status, meta_json,
+                     app, env, duration_sec, cpu_sec, peak_rss_mb, rows_in, rows_out, bytes_in, error, telemetry_json)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
                     """,
                     (
-                        datetime.now().isoformat(),
+                        timestamp,
                         domain,
                         job_name,
                         getpass.getuser(),
                         socket.gethostname(),
                         str(output_path),
-                        "SUCCESS",
-                        json.dumps(context)
+                        status,
+                        json.dumps(context, default=str),
+                        app,
+                        env,
+                        telemetry.get('wall_sec'),
+                        telemetry.get('cpu_sec'),
+                        telemetry.get('peak_rss_mb'),
+                        telemetry.get('rows_in'),
+                        telemetry.get('rows_out'),
+                        telemetry.get('bytes_in'),
+                        error,
+                        json.dumps(telemetry, default=str) if telemetry else None
                     )
                 )
+                stages = telemetry.get('stages') or {}
+                if stages:
+                    conn.executemany(
+                        """
+                        INSERT INTO execution_stage
+                        (log_id, timestamp, job_name, app, stage, count, wall_sec, cpu_sec, rows_in, rows_out)
+                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                        """,
+                        [
+                            (cur.lastrowid, timestamp, job_name, app, name, st.get('count'), st.get('wall_sec'),
+                             st.get('cpu_sec'), st.get('rows_in'), st.get('rows_out'))
+                            for name, st in stages.items()
+                        ]
+                    )
         except Exception as e:
             print(f"[Error] Failed to write audit log: {e}")
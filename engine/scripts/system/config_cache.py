@@ -0,0 +1,78 @@
+import os
+import sys
+import time
+import argparse
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.append(str(PROJECT_ROOT))
+
+from engine.scripts.utils.paths import get_knowledge_root
+from engine.scripts.utils.context_loader import COMPILED_CONFIG_ROOT, compiled_config_path, get_loader
+
+DEFAULT_ENV = "prod"   # BaseScript's --env default
+
+def discover_contexts():
+    """
+    Every region/app/env under knowledge/platforms.
+    Env folders are the app's subdirectories; an app without any gets DEFAULT_ENV.
+    """
+    contexts = []
+    platforms = get_knowledge_root() / "platforms"
+    for region_dir in sorted(p for p in platforms.iterdir() if p.is_dir()):
+        for app_dir in sorted(p for p in region_dir.iterdir() if p.is_dir()):
+            envs = sorted(p.name for p in app_dir.iterdir() if p.is_dir()) or [DEFAULT_ENV]
+            contexts.extend((region_dir.name, app_dir.name, env) for env in envs)
+    return contexts
+
+def warm(contexts):
+    loader = get_loader()
+    for region, app, env in contexts:
+        # Leaf .env files are loaded into os.environ; don't let one app's secrets leak into the next
+        saved_env = dict(os.environ)
+        t0 = time.perf_counter()
+        try:
+            loader.load(region, app, env)
+            print(f"  {region}/{app}/{env}: compiled in {(time.perf_counter() - t0) * 1000:.1f}ms")
+        except Exception as e:
+            print(f"  {region}/{app}/{env}: FAILED ({e})")
+        finally:
+            os.environ.clear()
+            os.environ.update(saved_env)
+
+def clear():
+    removed = 0
+    if COMPILED_CONFIG_ROOT.exists():
+        # *.pkl: compiled configs written by older versions
+        for pattern in ("*.json", "*.pkl"):
+            for path in COMPILED_CONFIG_ROOT.glob(pattern):
+                path.unlink()
+                removed += 1
+    print(f"Removed {removed} compiled config(s).")
+
+def main():
+    parser = argparse.ArgumentParser(description="Kiwi Compiled Config Cache")
+    parser.add_argument("action", choices=["warm", "list", "clear"], help="Action to perform")
+    parser.add_argument("--region", help="Only this region")
+    parser.add_argument("--app", help="Only this app")
+    args = parser.parse_args()
+
+    if args.action == "clear":
+        clear()
+        return
+
+    contexts = [
+        c for c in discover_contexts()
+        if (not args.region or c[0] == args.region) and (not args.app or c[1] == args.app)
+    ]
+    if args.action == "list":
+        for region, app, env in contexts:
+            cached = compiled_config_path(region, app, env).exists()
+            print(f"  {region}/{app}/{env}{'  (compiled)' if cached else ''}")
+    elif args.action == "warm":
+        print(f"Compiling {len(contexts)} config(s) into {COMPILED_CONFIG_ROOT}")
+        warm(contexts)
+
+if __name__ == "__main__":
+    main()
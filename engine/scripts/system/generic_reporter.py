@@ -1,5 +1,4 @@
-import yaml
-import pandas as pd
+import re
 import sys
 from pathlib import Path
 
@@ -9,6 +8,10 @@ if str(PROJECT_ROOT) not in sys.path:
     sys.path.append(str(PROJECT_ROOT))
 
 from engine.scripts.core.base_script import BaseScript
+from engine.scripts.utils.lazy_import import lazy_import
+
+yaml = lazy_import("yaml")
+pd = lazy_import("pandas")
 
 class GenericReporter(BaseScript):
     DOMAIN = "tech" # Default, but overridable by config
@@ -116,28 +119,53 @@ class GenericReporter(BaseScript):
         print(f"Executing SQL on {source_name}...")
         print(f"[Report] Period: {period} | Range: {context_vars['start_time']} -> {context_vars['end_time']}")
         
-        df = db.query(sql_query)
+        csv_name = f"{period}_report.csv"
+        csv_path = self.out.get_path(csv_name)
+        
+        stream = bool(report_cfg.get('stream'))
+        condition = report_cfg.get('trigger_rule', 'count > 0' if stream else 'len(df) > 0')
+        msg_tmpl = report_cfg.get('message', "Report Triggered: {count} rows.")
+        if stream:
+            # Streaming Mode never holds the full result, so rules can only use 'count'
+            for name, text in (("trigger_rule", condition), ("message", msg_tmpl)):
+                if re.search(r'\bdf\b', text):
+                    raise ValueError(f"'{name}' references 'df', which is not available with stream: true; use 'count'")
+            # Write CSV chunk by chunk, memory bounded by chunk_size (extract and export in one pass)
+            with self.stage("extract") as st:
+                count = self._stream_to_csv(db, sql_query, csv_path, report_cfg.get('chunk_size'))
+                st.rows_out = count
+            df = None
+        else:
+            # cache_ttl (seconds) in the report YAML enables the local result cache
+            with self.stage("extract"):
+                df = db.cached_query(sql_query, ttl=report_cfg.get('cache_ttl'))
+            count = len(df)
         
         # 4. Check Condition
-        condition = report_cfg.get('trigger_rule', 'len(df) > 0') 
-        is_triggered = eval(condition, {"df": df, "pd": pd})
+        with self.stage("transform"):
+            scope = {"pd": pd, "count": count}
+            if not stream:
+                scope["df"] = df
+            is_triggered = eval(condition, scope)
         
         meta = {
-            "result_count": len(df),
+            "result_count": count,
             "triggered": is_triggered,
             "period": period
         }
         
         if is_triggered:
             # 5. Export
-            csv_name = f"{period}_report.csv"
-            csv_path = self.out.get_path(csv_name)
-            df.to_csv(csv_path, index=False)
+            if not stream:
+                with self.stage("export") as st:
+                    df.to_csv(csv_path, index=False)
+                    st.rows_out = count
             
             # 6. Notify
-            msg_tmpl = report_cfg.get('message', "Report Triggered: {count} rows.")
             # Inject context into message template too
-            full_context = {**context_vars, "count": len(df), "df": df}
+            full_context = {**context_vars, "count": count}
+            if not stream:
+                full_context["df"] = df
             try:
                 msg = msg_tmpl.format(**full_context)
             except:
@@ -153,8 +181,18 @@ class GenericReporter(BaseScript):
         else:
             print("Condition not met. No alert sent.")
             self.NOTIFY_ON_SUCCESS = False 
+            if stream and csv_path.exists():
+                csv_path.unlink()
             
         return meta
 
+    def _stream_to_csv(self, db, sql_query: str, csv_path: Path, chunk_size: int = None):
+        """Streams query results into csv_path. Returns the total row count."""
+        count = 0
+        for chunk in db.iter_query(sql_query, chunk_size=chunk_size):
+            chunk.to_csv(csv_path, mode='a' if count else 'w', header=not count, index=False)
+            count += len(chunk)
+        return count
+
 if __name__ == "__main__":
     GenericReporter().execute()
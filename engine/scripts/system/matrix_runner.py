@@ -0,0 +1,117 @@
+import sys
+import time
+import inspect
+import importlib
+import threading
+import traceback
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+# Setup Path to allow engine imports when run standalone
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.append(str(PROJECT_ROOT))
+
+from engine.scripts.core.base_script import BaseScript
+
+# Script construction loads config (and leaf .env files into os.environ); keep it serial
+_construct_lock = threading.Lock()
+
+
+def load_script_class(script_rel: str):
+    """
+    Imports a script by its path relative to engine/scripts (as used in scheduler.yaml)
+    and returns the BaseScript subclass it defines.
+    """
+    module_name = "engine.scripts." + script_rel[:-3].replace("/", ".")
+    module = importlib.import_module(module_name)
+    for _, obj in inspect.getmembers(module, inspect.isclass):
+        if issubclass(obj, BaseScript) and obj is not BaseScript and obj.__module__ == module_name:
+            return obj
+    raise ValueError(f"No BaseScript subclass found in {script_rel}")
+
+
+def build_argv(app: str, env: str, params: Dict[str, Any] = None) -> List[str]:
+    argv = ["--app", app, "--env", env]
+    for k, v in (params or {}).items():
+        argv += [f"--{k}", str(v)]
+    return argv
+
+
+def run_one(script_rel: str, app: str, env: str, params: Dict[str, Any] = None) -> Dict[str, Any]:
+    """
+    Runs one matrix cell in the current process. Never raises: failures
+    (including BaseScript's sys.exit(1)) are returned as status 'FAILED'.
+    """
+    started = time.monotonic()
+    result = {"app": app, "env": env, "status": "SUCCESS", "error": None}
+    try:
+        script_cls = load_script_class(script_rel)
+        with _construct_lock:
+            script = script_cls(argv=build_argv(app, env, params))
+        script.execute()
+    except SystemExit as e:
+        if e.code not in (0, None):
+            result.update(status="FAILED", error=f"exit code {e.code}")
+    except BaseException as e:
+        traceback.print_exc()
+        result.update(status="FAILED", error=str(e))
+    result["duration_sec"] = round(time.monotonic() - started, 2)
+    return result
+
+
+def run_matrix(job_id: str, spec: Dict[str, Any], workers: Optional[int] = None, mode: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    Executes every app x env cell of a scheduler job inside one runner.
+
+    mode='process' (default): every cell runs in a fresh worker process, so each app
+        only ever sees its own leaf .env secrets (they are loaded into os.environ).
+    mode='thread': cells share this process's config layer cache and connection pool,
+        but also os.environ; connectors and the notifier read secrets from it at run time,
+        so only use it for jobs whose apps have no leaf secrets of their own.
+    """
+    script_rel = spec.get('script')
+    matrix = spec.get('matrix', {})
+    apps = matrix.get('apps', [])
+    envs = matrix.get('envs', ['prod'])
+    params = spec.get('params', {})
+
+    cells = [(app, env) for app in apps for env in envs]
+    if not script_rel or not cells:
+        raise ValueError(f"Job {job_id} has no script or empty matrix.")
+
+    mode = mode or spec.get('mode', 'process')
+    workers = workers or spec.get('workers') or min(4, len(cells))
+    if mode == 'process':
+        # One process per cell: a reused worker would keep the previous app's .env values
+        pool_ctx = ProcessPoolExecutor(max_workers=workers, max_tasks_per_child=1)
+    else:
+        pool_ctx = ThreadPoolExecutor(max_workers=workers)
+
+    print(f"[MatrixRunner] {job_id}: {len(cells)} cells, {workers} {mode} workers")
+    results = []
+    with pool_ctx as pool:
+        futures = {pool.submit(run_one, script_rel, app, env, params): (app, env) for app, env in cells}
+        for future in as_completed(futures):
+            app, env = futures[future]
+            try:
+                results.append(future.result())
+            except Exception as e:
+                # Only reachable if a worker process died
+                results.append({"app": app, "env": env, "status": "FAILED", "error": str(e), "duration_sec": None})
+
+    # Deterministic report order (matrix order)
+    order = {cell: i for i, cell in enumerate(cells)}
+    results.sort(key=lambda r: order[(r['app'], r['env'])])
+
+    print(f"[MatrixRunner] {job_id} summary:")
+    for r in results:
+        suffix = f" ({r['error']})" if r['error'] else ""
+        print(f"  - {r['app']}/{r['env']}: {r['status']} in {r['duration_sec']}s{suffix}")
+    return results
+
+
+def exit_code(results: List[Dict[str, Any]]) -> int:
+    """0 if every cell succeeded, 1 otherwise."""
+    return 0 if all(r['status'] == 'SUCCESS' for r in results) else 1
@@ -0,0 +1,53 @@
+import sys
+import time
+import argparse
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.append(str(PROJECT_ROOT))
+
+from engine.scripts.utils.notify_outbox import NotificationOutbox
+
+def drain(outbox: NotificationOutbox, loop: bool, interval: float):
+    """Sends everything due; with --loop keeps polling every `interval` seconds."""
+    while True:
+        total = {'sent': 0, 'retry': 0, 'failed': 0, 'posts': 0}
+        while True:
+            stats = outbox.drain()
+            for k in total:
+                total[k] += stats[k]
+            # A batch that went out cleanly may have left more due rows behind it
+            if not stats['posts'] or stats['retry']:
+                break
+        if total['posts']:
+            print(f"[Outbox] Sent {total['sent']} | retry later {total['retry']} | failed {total['failed']} ({total['posts']} posts)")
+        if not loop:
+            return
+        time.sleep(interval)
+
+def main():
+    parser = argparse.ArgumentParser(description="Kiwi Notification Outbox")
+    parser.add_argument("action", choices=["drain", "stats", "retry-failed", "purge"], help="Action to perform")
+    parser.add_argument("--loop", action="store_true", help="Keep draining (drain)")
+    parser.add_argument("--interval", type=float, default=10, help="Seconds between polls with --loop")
+    parser.add_argument("--days", type=int, default=30, help="Keep sent and failed rows this many days (purge)")
+    args = parser.parse_args()
+
+    outbox = NotificationOutbox()
+
+    if args.action == "drain":
+        drain(outbox, args.loop, args.interval)
+    elif args.action == "stats":
+        stats = outbox.stats()
+        if not stats:
+            print("Outbox is empty.")
+        for status, count in sorted(stats.items()):
+            print(f"{status:>8}: {count}")
+    elif args.action == "retry-failed":
+        print(f"Re-queued {outbox.retry_failed()} failed notification(s).")
+    elif args.action == "purge":
+        print(f"Deleted {outbox.purge(args.days)} sent/failed notification(s).")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+import re
+import sys
+import sqlite3
+import argparse
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.append(str(PROJECT_ROOT))
+
+from engine.scripts.system.audit_logger import AUDIT_DB_PATH, AuditLogger
+
+BUCKET_FORMATS = {"hour": "%Y-%m-%d %H:00", "day": "%Y-%m-%d", "week": "%G-W%V"}
+
+def parse_span(span: str) -> timedelta:
+    """'90m', '24h', '7d', '4w' -> timedelta."""
+    m = re.fullmatch(r'(\d+)([mhdw])', span.strip())
+    if not m:
+        raise ValueError(f"Invalid time span '{span}' (use e.g. 24h, 7d, 4w)")
+    value, unit = int(m.group(1)), m.group(2)
+    return {"m": timedelta(minutes=value), "h": timedelta(hours=value),
+            "d": timedelta(days=value), "w": timedelta(weeks=value)}[unit]
+
+def percentile(values: List[float], q: float) -> Optional[float]:
+    """Linear-interpolated percentile (q in 0..100) of unsorted values."""
+    if not values:
+        return None
+    values = sorted(values)
+    pos = (len(values) - 1) * q / 100
+    lo = int(pos)
+    hi = min(lo + 1, len(values) - 1)
+    return values[lo] + (values[hi] - values[lo]) * (pos - lo)
+
+def fetch_runs(conn, start: datetime, end: datetime = None, job: str = None, app: str = None) -> List[Tuple]:
+    """(job_name, app, timestamp, duration_sec, status, error) for runs in [start, end) via the timestamp indexes."""
+    query = "SELECT job_name, app, timestamp, duration_sec, status, error FROM execution_log WHERE timestamp >= ?"
+    params = [start.isoformat()]
+    if end:
+        query += " AND timestamp < ?"
+        params.append(end.isoformat())
+    if job:
+        query += " AND job_name = ?"
+        params.append(job)
+    if app:
+        query += " AND app = ?"
+        params.append(app)
+    return conn.execute(query, params).fetchall()
+
+def _fmt(v: Optional[float], unit: str = "s") -> str:
+    return "-" if v is None else f"{v:.2f}{unit}"
+
+def report_summary(conn, args):
+    start = datetime.now() - parse_span(args.since)
+    groups: Dict[Tuple, List[float]] = {}
+    counts: Dict[Tuple, List[int]] = {}
+    for job, app, ts, duration, status, _ in fetch_runs(conn, start, job=args.job, app=args.app):
+        bucket = datetime.fromisoformat(ts).strftime(BUCKET_FORMATS[args.bucket]) if args.bucket else ""
+        key = (job, app or "-", bucket)
+        counts.setdefault(key, [0, 0])
+        counts[key][0] += 1
+        counts[key][1] += status != "SUCCESS"
+        if duration is not None and status == "SUCCESS":
+            groups.setdefault(key, []).append(duration)
+
+    print(f"Run durations since {start:%Y-%m-%d %H:%M} (successful runs)")
+    print(f"{'job':<28} {'app':<12} {'bucket':<16} {'runs':>5} {'fail':>5} {'p50':>9} {'p95':>9} {'max':>9}")
+    for key in sorted(counts):
+        durations = groups.get(key, [])
+        runs, failed = counts[key]
+        print(f"{key[0]:<28} {key[1]:<12} {key[2]:<16} {runs:>5} {failed:>5} "
+              f"{_fmt(percentile(durations, 50)):>9} {_fmt(percentile(durations, 95)):>9} {_fmt(max(durations, default=None)):>9}")
+
+def report_stages(conn, args):
+    start = datetime.now() - parse_span(args.since)
+    query = "SELECT job_name, app, stage, wall_sec, cpu_sec, rows_in, rows_out FROM execution_stage WHERE timestamp >= ?"
+    params = [start.isoformat()]
+    if args.job:
+        query += " AND job_name = ?"
+        params.append(args.job)
+    if args.app:
+        query += " AND app = ?"
+        params.append(args.app)
+
+    groups: Dict[Tuple, Dict[str, list]] = {}
+    for job, app, stage, wall, cpu, rows_in, rows_out in conn.execute(query, params):
+        g = groups.setdefault((job, app or "-", stage), {"wall": [], "cpu": [], "rows_in": [], "rows_out": []})
+        g["wall"].append(wall or 0.0)
+        g["cpu"].append(cpu or 0.0)
+        g["rows_in"].append(rows_in or 0)
+        g["rows_out"].append(rows_out or 0)
+
+    ranked = sorted(groups.items(), key=lambda kv: percentile(kv[1]["wall"], 95), reverse=True)[:args.top]
+    print(f"Slowest stages since {start:%Y-%m-%d %H:%M} (by p95 wall time)")
+    print(f"{'job':<28} {'app':<12} {'stage':<16} {'runs':>5} {'p50':>9} {'p95':>9} {'cpu p50':>9} {'rows in':>10} {'rows out':>10}")
+    for (job, app, stage), g in ranked:
+        print(f"{job:<28} {app:<12} {stage:<16} {len(g['wall']):>5} {_fmt(percentile(g['wall'], 50)):>9} "
+              f"{_fmt(percentile(g['wall'], 95)):>9} {_fmt(percentile(g['cpu'], 50)):>9} "
+              f"{int(percentile(g['rows_in'], 50)):>10} {int(percentile(g['rows_out'], 50)):>10}")
+
+def report_regressions(conn, args):
+    now = datetime.now()
+    recent_start = now - parse_span(args.window)
+    baseline_start = recent_start - parse_span(args.baseline)
+
+    def p50_by_key(rows):
+        out: Dict[Tuple, List[float]] = {}
+        for job, app, _, duration, status, _ in rows:
+            if duration is not None and status == "SUCCESS":
+                out.setdefault((job, app or "-"), []).append(duration)
+        return out
+
+    recent = p50_by_key(fetch_runs(conn, recent_start, job=args.job, app=args.app))
+    baseline = p50_by_key(fetch_runs(conn, baseline_start, recent_start, job=args.job, app=args.app))
+
+    print(f"Median duration, last {args.window} vs previous {args.baseline} (flag at >= {args.threshold:.2f}x)")
+    print(f"{'job':<28} {'app':<12} {'runs':>5} {'recent':>9} {'baseline':>9} {'ratio':>7}")
+    flagged = 0
+    for key in sorted(recent):
+        if len(recent[key]) < args.min_runs or len(baseline.get(key, [])) < args.min_runs:
+            continue
+        now_p50, base_p50 = percentile(recent[key], 50), percentile(baseline[key], 50)
+        ratio = now_p50 / base_p50 if base_p50 else float('inf')
+        if ratio >= args.threshold:
+            flagged += 1
+            print(f"{key[0]:<28} {key[1]:<12} {len(recent[key]):>5} {_fmt(now_p50):>9} {_fmt(base_p50):>9} {ratio:>6.2f}x")
+    if not flagged:
+        print("No regressions.")
+    return flagged
+
+def report_failures(conn, args):
+    start = datetime.now() - parse_span(args.since)
+    stats: Dict[Tuple, Dict] = {}
+    for job, app, ts, _, status, error in fetch_runs(conn, start, job=args.job, app=args.app):
+        s = stats.setdefault((job, app or "-"), {"runs": 0, "failed": 0, "last_error": None, "last_failed": None})
+        s["runs"] += 1
+        if status != "SUCCESS":
+            s["failed"] += 1
+            if s["last_failed"] is None or ts > s["last_failed"]:
+                s["last_failed"], s["last_error"] = ts, error
+
+    print(f"Failure rates since {start:%Y-%m-%d %H:%M}")
+    print(f"{'job':<28} {'app':<12} {'runs':>5} {'fail':>5} {'rate':>7}  last failure")
+    for key, s in sorted(stats.items(), key=lambda kv: kv[1]["failed"] / kv[1]["runs"], reverse=True):
+        last = f"{s['last_failed'][:16]} {(s['last_error'] or '')[:60]}" if s["last_failed"] else ""
+        print(f"{key[0]:<28} {key[1]:<12} {s['runs']:>5} {s['failed']:>5} {s['failed'] / s['runs']:>6.1%}  {last}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Kiwi Job Performance Report (audit.db)")
+    parser.add_argument("action", choices=["summary", "stages", "regressions", "failures"], help="Report to show")
+    parser.add_argument("--job", help="Only this job name")
+    parser.add_argument("--app", help="Only this app")
+    parser.add_argument("--since", default="7d", help="Look-back window (summary/stages/failures), e.g. 24h, 7d")
+    parser.add_argument("--bucket", choices=sorted(BUCKET_FORMATS), help="Split summary per hour/day/week")
+    parser.add_argument("--top", type=int, default=15, help="Rows to show (stages)")
+    parser.add_argument("--window", default="1d", help="Recent window (regressions)")
+    parser.add_argument("--baseline", default="14d", help="Trailing baseline before the window (regressions)")
+    parser.add_argument("--threshold", type=float, default=1.5, help="Recent/baseline median ratio to flag (regressions)")
+    parser.add_argument("--min-runs", type=int, default=3, help="Runs needed on both sides to compare (regressions)")
+    args = parser.parse_args()
+    for span in (args.since, args.window, args.baseline):
+        try:
+            parse_span(span)
+        except ValueError as e:
+            parser.error(str(e))
+
+    # Creates the tables/indexes (and migrates older databases) if needed
+    AuditLogger()
+    with sqlite3.connect(AUDIT_DB_PATH) as conn:
+        if args.action == "summary":
+            report_summary(conn, args)
+        elif args.action == "stages":
+            report_stages(conn, args)
+        elif args.action == "regressions":
+            # Non-zero exit when something regressed, for use in alerts
+            sys.exit(1 if report_regressions(conn, args) else 0)
+        elif args.action == "failures":
+            report_failures(conn, args)
+
+if __name__ == "__main__":
+    main()
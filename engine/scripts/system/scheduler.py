@@ -5,7 +5,9 @@ import argparse
 from pathlib import Path
 
 # Setup Path to allow imports if needed, though this script is self-contained mainly.
-PROJECT_ROOT = Path(__file__).parent.parent.parent.parent
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.append(str(PROJECT_ROOT))
 
 def load_registry():
     yaml_path = PROJECT_ROOT / "knowledge" / "scheduler.yaml"
@@ -57,40 +59,30 @@ def generate_cron_lines(config: dict):
              lines.append(f"# WARNING: Script not found {script_rel}")
              continue
 
-        for app in apps:
-            for env in envs:
-                # Command Construction
-                # uv run --project {root}/engine {script} --app {app} --env {env}
-                # redirect stdout/stderr to log? relying on BaseScript generic logging?
-                # BaseScript logs to DB/Lark. But cron output (print) goes to mail usually.
-                # Let's silence or redirect to /dev/null to prevent mailbox spam, 
-                # as BaseScript handles its own logging.
-                
-                # Concurrency Control: Use lockf to prevent overlapping execution
-                # Lock File: /tmp/kiwi_{job_id}_{app}_{env}.lock
-                lock_file = f"/tmp/kiwi_{job_id}_{app}_{env}.lock"
-                
-                # Params Injection
-                extra_args = []
-                params = spec.get('params', {})
-                for k, v in params.items():
-                    extra_args.append(f"--{k} {v}")
-                extra_args_str = " ".join(extra_args)
-                
-                # Command: lockf -t 0 /tmp/xxx /bin/bash -c "cd ... && uv run ..."
-                # We wrap the actual work in bash -c to handle cd and redirection safely within the lock context (or getting the lock first).
-                # Actually, lockf executes the command. 
-                # Added {extra_args_str} to command
-                inner_cmd = f"cd '{PROJECT_ROOT}' && /Users/mark/.local/bin/uv run --project engine '{script_abs}' --app {app} --env {env} {extra_args_str} >> '{PROJECT_ROOT}/data/outputs/cron.log' 2>&1"
-                
-                # Escape double quotes for the bash -c string if necessary, but paths usually don't have them. 
-                # Safe usage: /usr/bin/lockf -t 0 {lock_file} /bin/bash -c "{inner_cmd}"
-                final_cmd = f"/usr/bin/lockf -t 0 {lock_file} /bin/bash -c \"{inner_cmd}\""
-                
-                lines.append(f"{cron_expr} {final_cmd}")
+        # One in-process matrix runner per job (instead of one cold start per app x env)
+        # Concurrency Control: lockf prevents overlapping runs of the same job
+        # Lock File: /tmp/kiwi_{job_id}.lock
+        lock_file = f"/tmp/kiwi_{job_id}.lock"
+        runner_abs = PROJECT_ROOT / "engine" / "scripts" / "system" / "scheduler.py"
         
-        lines.append("")
+        inner_cmd = f"cd '{PROJECT_ROOT}' && /Users/mark/.local/bin/uv run --project engine '{runner_abs}' run-matrix {job_id} >> '{PROJECT_ROOT}/data/outputs/cron.log' 2>&1"
+        final_cmd = f"/usr/bin/lockf -t 0 {lock_file} /bin/bash -c \"{inner_cmd}\""
+        
+        lines.append(f"# Matrix: {', '.join(apps)} x {', '.join(envs)}")
+        lines.append(f"{cron_expr} {final_cmd}")
         
+        lines.append("")
+
+    # Notifications left in the outbox by jobs that exited before delivery (retries, webhook outages)
+    drainer_abs = PROJECT_ROOT / "engine" / "scripts" / "system" / "outbox_drainer.py"
+    inner_cmd = f"cd '{PROJECT_ROOT}' && /Users/mark/.local/bin/uv run --project engine '{drainer_abs}' drain >> '{PROJECT_ROOT}/data/outputs/cron.log' 2>&1"
+    lines.append("# Notification outbox drainer")
+    lines.append(f"* * * * * /usr/bin/lockf -t 0 /tmp/kiwi_outbox_drainer.lock /bin/bash -c \"{inner_cmd}\"")
+    # Daily: drop old delivered rows and failed rows (those still hold webhook URLs / tokens)
+    purge_cmd = f"cd '{PROJECT_ROOT}' && /Users/mark/.local/bin/uv run --project engine '{drainer_abs}' purge >> '{PROJECT_ROOT}/data/outputs/cron.log' 2>&1"
+    lines.append(f"30 3 * * * /bin/bash -c \"{purge_cmd}\"")
+    lines.append("")
+
     lines.append("# END KIWI_SCHEDULER_BLOCK")
     return lines
 
@@ -131,12 +123,46 @@ def update_crontab(new_block_lines):
     
     print("Crontab updated successfully.")
 
+def run_matrix_job(registry: dict, job_id: str, workers: int = None, mode: str = None) -> int:
+    """Runs every app x env cell of one job in this process. Returns the combined exit status."""
+    from engine.scripts.system.matrix_runner import run_matrix, exit_code
+    
+    spec = registry.get('jobs', {}).get(job_id)
+    if not spec:
+        print(f"Unknown job: {job_id}")
+        return 2
+    return exit_code(run_matrix(job_id, spec, workers=workers, mode=mode))
+
 def main():
     parser = argparse.ArgumentParser(description="Kiwi Scheduler Manager")
-    parser.add_argument("action", choices=["sync", "preview"], help="Action to perform")
+    parser.add_argument("action", choices=["sync", "preview", "run-matrix", "daemon", "history"], help="Action to perform")
+    parser.add_argument("job_id", nargs="?", help="Job ID from scheduler.yaml (run-matrix; optional filter for history)")
+    parser.add_argument("--workers", type=int, help="Max concurrent matrix cells (run-matrix)")
+    parser.add_argument("--mode", choices=["thread", "process"], help="Worker pool type (run-matrix)")
+    parser.add_argument("--max-jobs", type=int, default=4, help="Max concurrently running jobs (daemon)")
+    parser.add_argument("--limit", type=int, default=20, help="Rows to show (history)")
     args = parser.parse_args()
     
+    # In-process alternative to the crontab block: one warm process evaluates the crons itself
+    if args.action == "daemon":
+        from engine.scripts.system.scheduler_daemon import run_daemon
+        run_daemon(max_jobs=args.max_jobs)
+        return
+    if args.action == "history":
+        from engine.scripts.system.scheduler_daemon import RunHistory
+        for r in RunHistory().recent(args.job_id, args.limit):
+            duration = f"{r['duration_sec']}s" if r['duration_sec'] is not None else "-"
+            suffix = f" ({r['error']})" if r['error'] else ""
+            print(f"#{r['id']:<5} {r['job_id']:<28} due {r['scheduled_for'][:16]}  {r['status']:<9} {duration:>8}{suffix}")
+        return
+    
     registry = load_registry()
+    
+    if args.action == "run-matrix":
+        if not args.job_id:
+            parser.error("run-matrix requires a job_id")
+        sys.exit(run_matrix_job(registry, args.job_id, args.workers, args.mode))
+    
     new_lines = generate_cron_lines(registry)
     
     if args.action == "preview":
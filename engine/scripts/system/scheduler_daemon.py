@@ -0,0 +1,339 @@
+import os
+import sys
+import json
+import signal
+import asyncio
+import sqlite3
+import datetime
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set
+
+# Setup Path to allow engine imports when run standalone
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.append(str(PROJECT_ROOT))
+
+from engine.scripts.utils.paths import get_store_root
+
+REGISTRY_PATH = PROJECT_ROOT / "knowledge" / "scheduler.yaml"
+SCHEDULER_DB_PATH = get_store_root() / "system" / "db" / "scheduler.db"
+
+
+class CronExpression:
+    """
+    Standard 5-field cron expression: minute hour day-of-month month day-of-week.
+
+    Fields accept `*`, numbers, ranges (`1-5`), steps (`*/15`, `0-30/10`) and lists
+    (`1,15,30`). Day-of-week is 0-7 (0 and 7 are Sunday). As in Vixie cron, when both
+    day fields are restricted a day matching either one fires.
+    """
+
+    BOUNDS = [(0, 59), (0, 23), (1, 31), (1, 12), (0, 7)]
+
+    def __init__(self, expr: str):
+        fields = expr.split()
+        if len(fields) != 5:
+            raise ValueError(f"Cron expression needs 5 fields: '{expr}'")
+        self.expr = expr
+        self.minutes, self.hours, self.days, self.months, dows = (
+            self._parse_field(f, lo, hi) for f, (lo, hi) in zip(fields, self.BOUNDS)
+        )
+        self.dows = {d % 7 for d in dows}
+        self.any_day = fields[2] == '*'
+        self.any_dow = fields[4] == '*'
+
+    @staticmethod
+    def _parse_field(field: str, lo: int, hi: int) -> Set[int]:
+        values = set()
+        for part in field.split(','):
+            rng, _, step = part.partition('/')
+            if rng == '*':
+                start, end = lo, hi
+            elif '-' in rng:
+                start, end = (int(x) for x in rng.split('-', 1))
+            else:
+                start = end = int(rng)
+                if step:
+                    end = hi
+            step = int(step) if step else 1
+            if start < lo or end > hi or start > end or step < 1:
+                raise ValueError(f"Cron field '{field}' out of range {lo}-{hi}")
+            values.update(range(start, end + 1, step))
+        return values
+
+    def _day_matches(self, dt: datetime.datetime) -> bool:
+        dom = dt.day in self.days
+        dow = (dt.isoweekday() % 7) in self.dows
+        if self.any_day or self.any_dow:
+            return dom and dow
+        return dom or dow
+
+    def matches(self, dt: datetime.datetime) -> bool:
+        return (dt.minute in self.minutes and dt.hour in self.hours
+                and dt.month in self.months and self._day_matches(dt))
+
+    def next_after(self, dt: datetime.datetime) -> datetime.datetime:
+        """First matching minute strictly after `dt`."""
+        t = dt.replace(second=0, microsecond=0) + datetime.timedelta(minutes=1)
+        limit = t + datetime.timedelta(days=366 * 5)
+        while t < limit:
+            if t.month not in self.months:
+                t = (t.replace(day=1, hour=0, minute=0) + datetime.timedelta(days=32)).replace(day=1)
+            elif not self._day_matches(t):
+                t = t.replace(hour=0, minute=0) + datetime.timedelta(days=1)
+            elif t.hour not in self.hours:
+                t = t.replace(minute=0) + datetime.timedelta(hours=1)
+            elif t.minute not in self.minutes:
+                t += datetime.timedelta(minutes=1)
+            else:
+                return t
+        raise ValueError(f"Cron expression '{self.expr}' never fires")
+
+
+class RunHistory:
+    """Daemon job runs (one row per triggered or skipped run) in a local SQLite table."""
+
+    def __init__(self, db_path: Path = None):
+        self.db_path = Path(db_path) if db_path else SCHEDULER_DB_PATH
+        os.makedirs(self.db_path.parent, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS job_runs (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    job_id TEXT NOT NULL,
+                    trigger TEXT,
+                    scheduled_for TEXT,
+                    started_at TEXT,
+                    finished_at TEXT,
+                    status TEXT,
+                    duration_sec REAL,
+                    cells_json TEXT,
+                    error TEXT
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_job_runs_job ON job_runs (job_id, id)")
+
+    def _connect(self):
+        return sqlite3.connect(self.db_path, timeout=30)
+
+    def start(self, job_id: str, trigger: str, scheduled_for: datetime.datetime) -> int:
+        with self._connect() as conn:
+            cur = conn.execute(
+                "INSERT INTO job_runs (job_id, trigger, scheduled_for, started_at, status) VALUES (?, ?, ?, ?, 'RUNNING')",
+                (job_id, trigger, scheduled_for.isoformat(), datetime.datetime.now().isoformat())
+            )
+            return cur.lastrowid
+
+    def finish(self, run_id: int, status: str, duration_sec: float, cells: List[Dict[str, Any]] = None, error: str = None):
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE job_runs SET finished_at = ?, status = ?, duration_sec = ?, cells_json = ?, error = ? WHERE id = ?",
+                (datetime.datetime.now().isoformat(), status, round(duration_sec, 2),
+                 json.dumps(cells) if cells is not None else None, error, run_id)
+            )
+
+    def skip(self, job_id: str, scheduled_for: datetime.datetime, reason: str):
+        now = datetime.datetime.now().isoformat()
+        with self._connect() as conn:
+            conn.execute(
+                """
+                INSERT INTO job_runs (job_id, trigger, scheduled_for, started_at, finished_at, status, duration_sec, error)
+                VALUES (?, 'cron', ?, ?, ?, 'SKIPPED', 0, ?)
+                """,
+                (job_id, scheduled_for.isoformat(), now, now, reason)
+            )
+
+    def abandon_running(self) -> int:
+        """Marks runs left RUNNING by a daemon that died as ABANDONED."""
+        with self._connect() as conn:
+            cur = conn.execute(
+                "UPDATE job_runs SET status = 'ABANDONED', finished_at = ? WHERE status = 'RUNNING'",
+                (datetime.datetime.now().isoformat(),)
+            )
+            return cur.rowcount
+
+    def recent(self, job_id: str = None, limit: int = 20) -> List[Dict[str, Any]]:
+        query = "SELECT id, job_id, trigger, scheduled_for, started_at, status, duration_sec, error FROM job_runs"
+        params: tuple = ()
+        if job_id:
+            query += " WHERE job_id = ?"
+            params = (job_id,)
+        with self._connect() as conn:
+            conn.row_factory = sqlite3.Row
+            rows = conn.execute(query + " ORDER BY id DESC LIMIT ?", (*params, limit)).fetchall()
+        return [dict(r) for r in rows]
+
+
+class SchedulerDaemon:
+    """
+    Long-running replacement for the per-job crontab lines.
+
+    - Evaluates each job's `cron` itself once a minute and runs it via run_matrix with
+      mode 'process': every cell is a freshly spawned interpreter, exactly as under cron.
+      The `max_jobs` thread pool only waits on those processes. There is NO warm worker
+      pool: imports, config and database connections are not reused across runs, since
+      leaf .env files load into os.environ for good and would leak between apps.
+    - Per job at most `max_concurrency` runs at once (default 1); a due run beyond that
+      is recorded as SKIPPED instead of piling up.
+    - knowledge/scheduler.yaml is re-read whenever its mtime changes.
+    - Every run (cells, status, duration) is recorded in RunHistory.
+    """
+
+    def __init__(self, registry_path: Path = REGISTRY_PATH, max_jobs: int = 4, history: RunHistory = None):
+        self.registry_path = Path(registry_path)
+        self.max_jobs = max_jobs
+        self.history = history or RunHistory()
+        self.pool = ThreadPoolExecutor(max_workers=max_jobs, thread_name_prefix="kiwi-job")
+
+        self.jobs: Dict[str, Dict[str, Any]] = {}
+        self.crons: Dict[str, CronExpression] = {}
+        self.running: Dict[str, int] = {}
+        self._registry_mtime: Optional[int] = None
+        self._tasks: Set[asyncio.Task] = set()
+        self._stop: Optional[asyncio.Event] = None
+
+    # --- Registry ---
+
+    def reload_if_changed(self):
+        try:
+            mtime = self.registry_path.stat().st_mtime_ns
+        except FileNotFoundError:
+            mtime = None
+        if mtime == self._registry_mtime:
+            return
+        self._registry_mtime = mtime
+
+        import yaml
+        registry = {}
+        if mtime is not None:
+            try:
+                with open(self.registry_path, 'r', encoding='utf-8') as f:
+                    registry = yaml.safe_load(f) or {}
+            except Exception as e:
+                print(f"[SchedulerDaemon] Keeping previous registry, failed to parse {self.registry_path.name}: {e}")
+                return
+
+        jobs, crons = {}, {}
+        for job_id, spec in (registry.get('jobs') or {}).items():
+            # Same rules as scheduler.py's crontab rendering (generate_cron_lines)
+            if not spec or not spec.get('script') or not spec.get('cron'):
+                print(f"[SchedulerDaemon] Skipping invalid job {job_id}")
+                continue
+            if not (spec.get('matrix') or {}).get('apps'):
+                print(f"[SchedulerDaemon] Skipping job {job_id}: No apps specified in matrix.")
+                continue
+            if not (PROJECT_ROOT / "engine" / "scripts" / spec['script']).exists():
+                print(f"[SchedulerDaemon] Skipping job {job_id}: Script not found {spec['script']}")
+                continue
+            try:
+                crons[job_id] = CronExpression(spec['cron'])
+            except ValueError as e:
+                print(f"[SchedulerDaemon] Skipping job {job_id}: {e}")
+                continue
+            jobs[job_id] = spec
+
+        added = jobs.keys() - self.jobs.keys()
+        removed = self.jobs.keys() - jobs.keys()
+        changed = {j for j in jobs.keys() & self.jobs.keys() if jobs[j] != self.jobs[j]}
+        self.jobs, self.crons = jobs, crons
+        print(f"[SchedulerDaemon] Registry loaded: {len(jobs)} jobs"
+              f" (+{sorted(added)} -{sorted(removed)} ~{sorted(changed)})")
+        for job_id in sorted(jobs):
+            print(f"  - {job_id}: '{crons[job_id].expr}' next {crons[job_id].next_after(datetime.datetime.now())}")
+
+    # --- Loop ---
+
+    async def serve(self):
+        self._stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, self._stop.set)
+            except (NotImplementedError, RuntimeError):
+                pass
+
+        abandoned = self.history.abandon_running()
+        if abandoned:
+            print(f"[SchedulerDaemon] Marked {abandoned} run(s) from a previous daemon as ABANDONED.")
+        self.reload_if_changed()
+        self._start_outbox_drainer()
+
+        last_tick = datetime.datetime.now().replace(second=0, microsecond=0)
+        print(f"[SchedulerDaemon] Started (max {self.max_jobs} concurrent jobs).")
+        while not self._stop.is_set():
+            now = datetime.datetime.now()
+            next_tick = last_tick + datetime.timedelta(minutes=1)
+            try:
+                await asyncio.wait_for(self._stop.wait(), timeout=max(0.0, (next_tick - now).total_seconds()))
+                break
+            except asyncio.TimeoutError:
+                pass
+
+            self.reload_if_changed()
+            now = datetime.datetime.now().replace(second=0, microsecond=0)
+            # Every minute in (last_tick, now] is due; minutes missed while the host slept
+            # fire a job once, not once per missed minute
+            for job_id, cron in self.crons.items():
+                due = cron.next_after(last_tick)
+                if due <= now:
+                    self.trigger(job_id, due)
+            last_tick = now
+
+        print("[SchedulerDaemon] Stopping; waiting for running jobs...")
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        self.pool.shutdown(wait=True)
+        print("[SchedulerDaemon] Stopped.")
+
+    def trigger(self, job_id: str, scheduled_for: datetime.datetime, trigger: str = "cron") -> bool:
+        spec = self.jobs[job_id]
+        limit = int(spec.get('max_concurrency', 1))
+        if self.running.get(job_id, 0) >= limit:
+            reason = f"{self.running[job_id]} run(s) still in progress (max_concurrency={limit})"
+            print(f"[SchedulerDaemon] Skipping {job_id} @ {scheduled_for:%H:%M}: {reason}")
+            self.history.skip(job_id, scheduled_for, reason)
+            return False
+
+        self.running[job_id] = self.running.get(job_id, 0) + 1
+        task = asyncio.get_running_loop().create_task(self._run(job_id, dict(spec), scheduled_for, trigger))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return True
+
+    async def _run(self, job_id: str, spec: Dict[str, Any], scheduled_for: datetime.datetime, trigger: str):
+        from engine.scripts.system.matrix_runner import run_matrix, exit_code
+
+        run_id = self.history.start(job_id, trigger, scheduled_for)
+        started = asyncio.get_running_loop().time()
+        print(f"[SchedulerDaemon] Running {job_id} (run #{run_id}, due {scheduled_for:%Y-%m-%d %H:%M})")
+        if spec.get('mode', 'process') != 'process':
+            print(f"[SchedulerDaemon] {job_id}: ignoring mode '{spec['mode']}', the daemon always runs cells in fresh processes")
+        try:
+            # Leaf .env files load into os.environ and are never unloaded: in this long-lived
+            # process every cell gets its own short-lived process so no app inherits another's keys
+            cells = await asyncio.get_running_loop().run_in_executor(
+                self.pool, run_matrix, job_id, spec, None, 'process'
+            )
+            status = "SUCCESS" if exit_code(cells) == 0 else "FAILED"
+            self.history.finish(run_id, status, asyncio.get_running_loop().time() - started, cells)
+        except Exception as e:
+            traceback.print_exc()
+            self.history.finish(run_id, "FAILED", asyncio.get_running_loop().time() - started, error=str(e))
+        finally:
+            self.running[job_id] -= 1
+
+    @staticmethod
+    def _start_outbox_drainer():
+        """Notifications queued by earlier processes are delivered by this process from now on."""
+        try:
+            from engine.scripts.utils.notify_outbox import get_outbox
+            _, drainer = get_outbox()
+            drainer.kick()
+        except Exception as e:
+            print(f"[SchedulerDaemon] Outbox drainer not started: {e}")
+
+
+def run_daemon(max_jobs: int = 4):
+    asyncio.run(SchedulerDaemon(max_jobs=max_jobs).serve())
@@ -0,0 +1,74 @@
+import sys
+import json
+import time
+import sqlite3
+import tempfile
+import threading
+from pathlib import Path
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.append(str(PROJECT_ROOT))
+
+from engine.scripts.utils.notify_dispatch import Delivery
+from engine.scripts.utils.notify_outbox import NotificationOutbox, OutboxDrainer
+
+
+class SlowWebhook(BaseHTTPRequestHandler):
+    """Lark-style webhook that takes a while to answer."""
+    hits = 0
+    delay = 0.5
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        time.sleep(self.delay)
+        SlowWebhook.hits += 1
+        body = json.dumps({"code": 0}).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def _statuses(db_path):
+    with sqlite3.connect(db_path) as conn:
+        return dict(conn.execute("SELECT status, COUNT(*) FROM outbox GROUP BY status").fetchall())
+
+
+def test_flush_waits_for_background_claim():
+    server = HTTPServer(('127.0.0.1', 0), SlowWebhook)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        db_path = Path(tempfile.mkdtemp()) / "outbox.db"
+        outbox = NotificationOutbox(db_path)
+        outbox.session.trust_env = False   # no proxies for the local webhook
+        drainer = OutboxDrainer(outbox)
+
+        url = f"http://127.0.0.1:{server.server_port}/hook"
+        outbox.enqueue(Delivery("ops", "lark_webhook", {"url": url}, "Job failed", "boom"))
+        drainer.kick()
+
+        # Let the background drainer claim the row, so flush finds nothing claimable
+        deadline = time.monotonic() + 5
+        while _statuses(db_path).get('sending') is None and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert _statuses(db_path).get('sending') == 1
+
+        assert outbox.drain_until_idle(timeout=5)
+        statuses = _statuses(db_path)
+        assert 'sending' not in statuses, statuses
+        assert statuses.get('sent') == 1
+        assert SlowWebhook.hits == 1
+    finally:
+        server.shutdown()
+
+    print("✅ Outbox flush waits for in-flight deliveries")
+
+
+if __name__ == "__main__":
+    test_flush_waits_for_background_claim()
@@ -0,0 +1,79 @@
+import sys
+import time
+import random
+import decimal
+import argparse
+import datetime
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.append(str(PROJECT_ROOT))
+
+import pandas as pd
+from engine.connectors.decoding import frame_from_rows
+
+# Shape of a raw gene_t_recharge_order pull (pymysql FIELD_TYPE codes)
+DESCRIPTION = [
+    ('order_id', 8),           # LONGLONG
+    ('app_id', 3),             # LONG
+    ('recharge_channel', 3),
+    ('upstream_channel', 253), # VAR_STRING
+    ('pay_method', 253),
+    ('amount', 246),           # NEWDECIMAL
+    ('order_status', 1),       # TINY
+    ('created_time', 12),      # DATETIME
+]
+
+def synthesize(n: int) -> list:
+    rnd = random.Random(42)
+    channels = ['PlusPay', 'OnePay', 'FastPix', 'UPI_Direct', None]
+    methods = ['upi', 'card', 'pix', 'wallet']
+    base = datetime.datetime(2026, 1, 1)
+    return [
+        (
+            i,
+            1004,
+            rnd.choice((1, 7)),
+            rnd.choice(channels),
+            rnd.choice(methods),
+            decimal.Decimal(rnd.randint(100, 500000)) / 100,
+            rnd.choice((0, 1)),
+            base + datetime.timedelta(seconds=i),
+        )
+        for i in range(n)
+    ]
+
+def main():
+    parser = argparse.ArgumentParser(description="Kiwi SQL Result Decoding Benchmark (dict vs columnar)")
+    parser.add_argument("--rows", type=int, default=1_000_000, help="Synthetic result size")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per path (best is reported)")
+    args = parser.parse_args()
+
+    rows = synthesize(args.rows)
+    names = [d[0] for d in DESCRIPTION]
+    print(f"Synthesized {len(rows):,} rows x {len(names)} columns")
+
+    # Dict path: what DictCursor + pd.DataFrame(res) does (dict building included)
+    def dict_path():
+        dict_rows = [dict(zip(names, r)) for r in rows]
+        return pd.DataFrame(dict_rows)
+
+    def columnar_path():
+        return frame_from_rows(rows, DESCRIPTION, 'mysql')
+
+    results = {}
+    for label, fn in (("dict", dict_path), ("columnar", columnar_path)):
+        best = None
+        for _ in range(args.repeat):
+            t0 = time.perf_counter()
+            df = fn()
+            elapsed = time.perf_counter() - t0
+            best = elapsed if best is None else min(best, elapsed)
+        results[label] = best
+        print(f"{label:>9}: {best:.3f}s | shape={df.shape}")
+
+    print(f"Columnar speedup: {results['dict'] / results['columnar']:.2f}x")
+
+if __name__ == "__main__":
+    main()
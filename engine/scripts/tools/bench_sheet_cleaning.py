@@ -0,0 +1,81 @@
+import sys
+import time
+import random
+import argparse
+import datetime
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.append(str(PROJECT_ROOT))
+
+import pandas as pd
+from engine.scripts.domain.finance.accounting.weekly_report.base_source import OperationsDataProcessor
+
+# Raw India operations sheet as read_as_dataframe returns it (all strings, headers in data row 0)
+HEADERS = ['日期', '消耗', '累计消耗', '首充人数', '累计总首充', '实际冲提（USD)', '备注']
+
+def legacy_clean(df: pd.DataFrame) -> pd.DataFrame:
+    """OperationsDataProcessor.clean_data before the schema engine (per-column string chains)."""
+    df = df.copy()
+    real_headers = df.iloc[0]
+    df = df[1:].copy()
+    df.columns = real_headers
+    df.columns = df.columns.astype(str).str.strip()
+    df = df.rename(columns={
+        '日期': 'Date', '消耗': 'Spend', '累计消耗': 'CumSpend',
+        '首充人数': 'Orders', '累计总首充': 'CumOrders', '实际冲提（USD)': 'NetDeposit'
+    })
+    df['Date'] = pd.to_datetime(df['Date'], errors='coerce')
+    df = df.dropna(subset=['Date'])
+    for col in ['Spend', 'Orders', 'NetDeposit', 'CumSpend', 'CumOrders']:
+        df[col] = df[col].astype(str).str.replace('$', '', regex=False).str.replace(',', '', regex=False).str.replace('%', '', regex=False)
+        df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0)
+    return df
+
+def synthesize(n: int) -> pd.DataFrame:
+    rnd = random.Random(42)
+    base = datetime.date(2020, 1, 1)
+    rows = [HEADERS]
+    cum_spend = 0.0
+    for i in range(n):
+        spend = rnd.randint(0, 5_000_000) / 100
+        cum_spend += spend
+        rows.append([
+            # Mostly ISO dates, some slash dates and the odd blank/summary row
+            (base + datetime.timedelta(days=i // 40)).strftime('%Y/%m/%d' if i % 7 == 0 else '%Y-%m-%d') if i % 97 else '',
+            f"${spend:,.2f}",
+            f"${cum_spend:,.2f}",
+            str(rnd.randint(0, 900)),
+            f"{rnd.randint(0, 10_000_000):,}",
+            f"{rnd.randint(-100_000, 100_000):,}",
+            '',
+        ])
+    # Sheet row 1 (config junk) becomes the column labels
+    return pd.DataFrame(rows, columns=[''] * len(HEADERS))
+
+def main():
+    parser = argparse.ArgumentParser(description="Kiwi Sheet Cleaning Benchmark (legacy vs schema)")
+    parser.add_argument("--rows", type=int, default=100_000, help="Synthetic sheet size")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per path (best is reported)")
+    args = parser.parse_args()
+
+    raw = synthesize(args.rows)
+    print(f"Synthesized {len(raw):,} rows x {raw.shape[1]} columns")
+
+    processor = OperationsDataProcessor()
+    results = {}
+    for label, fn in (("legacy", legacy_clean), ("schema", processor.clean_data)):
+        best = None
+        for _ in range(args.repeat):
+            t0 = time.perf_counter()
+            df = fn(raw)
+            elapsed = time.perf_counter() - t0
+            best = elapsed if best is None else min(best, elapsed)
+        results[label] = best
+        print(f"{label:>7}: {best:.3f}s | shape={df.shape} | spend={df['Spend'].sum():,.2f}")
+
+    print(f"Schema speedup: {results['legacy'] / results['schema']:.2f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+import os
+import re
+import sys
+import time
+import argparse
+import subprocess
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.append(str(PROJECT_ROOT))
+
+import yaml
+from engine.scripts.utils.paths import get_project_root, get_knowledge_root
+
+# Same as script_library.yaml's startup_budget_ms; only used when the file does not set it
+DEFAULT_BUDGET_MS = 200
+
+# "import time:  self [us] | cumulative | imported package" (nesting = leading spaces in the name)
+IMPORTTIME_LINE = re.compile(r'^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|( *)(\S+)')
+
+def measure(script_path: str) -> dict:
+    """Runs `<script> --help` under -X importtime; returns import total, wall time and heaviest imports."""
+    root = str(get_project_root())
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(p for p in (root, os.environ.get("PYTHONPATH")) if p)}
+    t0 = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", script_path, "--help"],
+        cwd=root, env=env, capture_output=True, text=True
+    )
+    wall_ms = (time.perf_counter() - t0) * 1000
+    if proc.returncode != 0:
+        raise RuntimeError(f"{script_path} --help failed:\n{proc.stderr[-1000:]}")
+
+    top = []
+    for line in proc.stderr.splitlines():
+        m = IMPORTTIME_LINE.match(line)
+        if m and len(m.group(3)) == 1:
+            top.append((m.group(4), int(m.group(2)) / 1000))
+    top.sort(key=lambda t: t[1], reverse=True)
+    return {"import_ms": sum(ms for _, ms in top), "wall_ms": wall_ms, "top": top}
+
+def bench(entries, default_budget: int, repeat: int, top_n: int) -> list:
+    """Measures each script_library.yaml entry; returns the names over budget."""
+    over = []
+    for entry in entries:
+        budget = entry.get('startup_budget_ms', default_budget)
+        best = None
+        try:
+            for _ in range(repeat):
+                run = measure(entry['path'])
+                if best is None or run['import_ms'] < best['import_ms']:
+                    best = run
+        except RuntimeError as e:
+            # A script that can't even print --help has no startup to measure
+            print(f"SKIP {entry['name']}: {e}")
+            continue
+        ok = best['import_ms'] <= budget
+        if not ok:
+            over.append(entry['name'])
+
+        heaviest = ", ".join(f"{name} {ms:.0f}ms" for name, ms in best['top'][:top_n])
+        print(
+            f"{'OK  ' if ok else 'OVER'} {entry['name']}: imports {best['import_ms']:.0f}ms "
+            f"(budget {budget}ms), --help wall {best['wall_ms']:.0f}ms | {heaviest}"
+        )
+    return over
+
+def main():
+    parser = argparse.ArgumentParser(description="Kiwi Script Startup Benchmark")
+    parser.add_argument("--script", help="Only this script_library.yaml entry (name)")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per script (best is reported)")
+    parser.add_argument("--top", type=int, default=5, help="Heaviest top-level imports to list per script")
+    args = parser.parse_args()
+
+    with open(get_knowledge_root() / "script_library.yaml", 'r', encoding='utf-8') as f:
+        library = yaml.safe_load(f) or {}
+    default_budget = library.get('startup_budget_ms', DEFAULT_BUDGET_MS)
+
+    entries = [s for s in library.get('scripts', []) if not args.script or s['name'] == args.script]
+    if not entries:
+        print(f"No script_library.yaml entry named '{args.script}'")
+        sys.exit(2)
+
+    over = bench(entries, default_budget, args.repeat, args.top)
+    if over:
+        print(f"Startup budget exceeded: {', '.join(over)}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
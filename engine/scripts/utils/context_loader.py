@@ -1,7 +1,10 @@
-import yaml
 import os
 import sys
 import re
+import copy
+import json
+import hashlib
+import threading
 from pathlib import Path
 from typing import Dict, Any, Optional
 
@@ -11,15 +14,32 @@ if str(PROJECT_ROOT) not in sys.path:
     sys.path.append(str(PROJECT_ROOT))
 
 # Now we can import from engine...
-from engine.scripts.utils.paths import get_knowledge_root
+from engine.scripts.utils.paths import get_knowledge_root, get_store_root
+from engine.scripts.utils.lazy_import import lazy_import
+yaml = lazy_import("yaml")
 try:
     from dotenv import load_dotenv
 except ImportError:
     load_dotenv = None
 
+# Merged, env-substituted configs per region/app/env (see ContextLoader.load)
+COMPILED_CONFIG_ROOT = get_store_root() / "system" / "cache" / "config"
+# Bump when load()'s layering / substitution semantics change
+COMPILED_CONFIG_VERSION = 2
+
+
+def compiled_config_path(region: str, app: str, env: str) -> Path:
+    return COMPILED_CONFIG_ROOT / f"{region}__{app}__{env}.json"
+
 class ContextLoader:
+    ENV_VAR_PATTERN = re.compile(r'\$\{([A-Z0-9_]+)\}')
+
     def __init__(self):
         self.knowledge_root = get_knowledge_root()
+        # Parsed layers shared across load() calls in this process (e.g. the matrix runner).
+        # Key: (path, mtime_ns, values of referenced env vars)
+        self._layer_cache = {}
+        self._layer_lock = threading.Lock()
         # Load .env from project root if available
         if load_dotenv:
             # 1. Engine Root (engine/.env)
@@ -30,12 +50,23 @@ class ContextLoader:
             project_root = engine_root.parent
             load_dotenv(project_root / ".env")
 
-    def _load_yaml(self, path: Path) -> Dict[str, Any]:
+    def _load_yaml(self, path: Path, used_vars: set = None) -> Dict[str, Any]:
+        """Parses one layer; names of the ${VAR}s it references are added to `used_vars`."""
         if not path.exists():
             return {}
         try:
             with open(path, 'r', encoding='utf-8') as f:
                 content = f.read()
+
+            # Reuse the parsed layer if neither the file nor its ${VAR}s changed
+            env_vars = sorted(set(self.ENV_VAR_PATTERN.findall(content)))
+            if used_vars is not None:
+                used_vars.update(env_vars)
+            cache_key = (str(path), path.stat().st_mtime_ns, tuple(os.environ.get(v) for v in env_vars))
+            with self._layer_lock:
+                cached = self._layer_cache.get(cache_key)
+            if cached is not None:
+                return copy.deepcopy(cached)
                 
             # Perform variable substitution
             # Pattern: ${VAR_NAME} or ${VAR_NAME:default}
@@ -50,9 +81,12 @@ class ContextLoader:
                 var_name = match.group(1)
                 return os.environ.get(var_name, match.group(0)) # Return original if not found
                 
-            content = re.sub(r'\$\{([A-Z0-9_]+)\}', replace_env, content)
+            content = self.ENV_VAR_PATTERN.sub(replace_env, content)
             
-            return yaml.safe_load(content) or {}
+            parsed = yaml.safe_load(content) or {}
+            with self._layer_lock:
+                self._layer_cache[cache_key] = parsed
+            return copy.deepcopy(parsed)
         except Exception as e:
             print(f"[WARN] Failed to load config at {path}: {e}")
             return {}
@@ -67,37 +101,60 @@ class ContextLoader:
                 result[key] = value
         return result
 
-    def load(self, region: str, app: str, env: str) -> Dict[str, Any]:
+    def load(self, region: str, app: str, env: str, use_cache: bool = True) -> Dict[str, Any]:
         """
         Loads configuration by merging 4 layers:
         1. Global
         2. Region
         3. App
         4. Environment
-        """
-        # Layer 1: Global
-        config = self._load_yaml(self.knowledge_root / "general" / "config.yaml")
 
-        # Layer 2: Region
+        The result is compiled to COMPILED_CONFIG_ROOT and reused while every layer file
+        (and the leaf .env) is unchanged and every referenced ${VAR} has the same value.
+        Layers 1-3 are substituted before the leaf .env is loaded, layer 4 after it,
+        so the two groups are validated separately.
+        """
         region_path = self.knowledge_root / "platforms" / region
-        config = self._merge_configs(config, self._load_yaml(region_path / "config.yaml"))
-
-        # Layer 3: App
         app_path = region_path / app
-        config = self._merge_configs(config, self._load_yaml(app_path / "config.yaml"))
+        env_path = app_path / env
+        leaf_env = env_path / ".env"
+        layer_files = [
+            self.knowledge_root / "general" / "config.yaml",
+            region_path / "config.yaml",
+            app_path / "config.yaml",
+            env_path / "config.yaml",
+        ]
+
+        files = self._fingerprint_files(layer_files + [leaf_env])
+        compiled = self._read_compiled(region, app, env) if use_cache else None
+        if compiled and compiled['files'] != files:
+            compiled = None
+
+        # Layers 1-3 (Global, Region, App)
+        if compiled and self._env_matches(compiled['base_env']):
+            base, base_env = compiled['base'], compiled['base_env']
+        else:
+            compiled = None
+            base_vars = set()
+            base = {}
+            for path in layer_files[:3]:
+                base = self._merge_configs(base, self._load_yaml(path, base_vars))
+            base_env = self._fingerprint_env(base_vars)
 
         # Layer 4: Environment
-        env_path = app_path / env
         
         # Leaf Secrets Loading
         # If a .env exists in the target environment folder, load it with override=True
         # This allows "Context-Aware" secrets (e.g. DB_PASS) to be defined locally.
-        leaf_env = env_path / ".env"
         if leaf_env.exists() and load_dotenv:
             # print(f"[Context] Loading leaf secrets from {leaf_env}")
             load_dotenv(leaf_env, override=True)
 
-        config = self._merge_configs(config, self._load_yaml(env_path / "config.yaml"))
+        if compiled and self._env_matches(compiled['leaf_env']):
+            return compiled['config']
+
+        leaf_vars = set()
+        config = self._merge_configs(copy.deepcopy(base), self._load_yaml(layer_files[3], leaf_vars))
 
         # Inject Context Metadata
         config['_meta'] = {
@@ -107,9 +164,78 @@ class ContextLoader:
             'config_path': str(env_path),
             'secrets_path': str(leaf_env) if leaf_env.exists() else None
         }
-        
+
+        if use_cache:
+            self._write_compiled(region, app, env, {
+                'version': COMPILED_CONFIG_VERSION,
+                'files': files,
+                'base_env': base_env,
+                'leaf_env': self._fingerprint_env(leaf_vars),
+                'base': base,
+                'config': config,
+            })
         return config
 
+    @staticmethod
+    def _fingerprint_files(paths):
+        """[path, mtime_ns, size] per file, [path, None] for missing ones (JSON-native)."""
+        out = []
+        for path in paths:
+            try:
+                st = path.stat()
+                out.append([str(path), st.st_mtime_ns, st.st_size])
+            except FileNotFoundError:
+                out.append([str(path), None])
+        return out
+
+    @staticmethod
+    def _fingerprint_env(names):
+        """Hashed current value per env var (secrets are not stored in the clear)."""
+        return {name: ContextLoader._hash_env(name) for name in sorted(names)}
+
+    @staticmethod
+    def _hash_env(name):
+        value = os.environ.get(name)
+        return None if value is None else hashlib.sha256(value.encode('utf-8')).hexdigest()
+
+    def _env_matches(self, recorded: Dict[str, Optional[str]]) -> bool:
+        return all(self._hash_env(name) == digest for name, digest in recorded.items())
+
+    def _read_compiled(self, region: str, app: str, env: str) -> Optional[Dict[str, Any]]:
+        path = compiled_config_path(region, app, env)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                compiled = json.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"[WARN] Ignoring unreadable compiled config {path.name}: {e}")
+            return None
+        if not isinstance(compiled, dict) or compiled.get('version') != COMPILED_CONFIG_VERSION:
+            return None
+        return compiled
+
+    def _write_compiled(self, region: str, app: str, env: str, compiled: Dict[str, Any]):
+        path = compiled_config_path(region, app, env)
+        try:
+            text = json.dumps(compiled)
+        except (TypeError, ValueError):
+            text = None
+        if text is None or json.loads(text) != compiled:
+            # YAML dates, non-string keys etc. would not come back unchanged: don't cache
+            print(f"[Context] Config for {region}/{app}/{env} is not plain JSON; not caching it.")
+            return
+        try:
+            os.makedirs(path.parent, exist_ok=True)
+            tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+            # Resolved configs carry secrets: owner-only, like the .env files they come from
+            fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.write(text)
+            os.replace(tmp, path)
+        except Exception as e:
+            print(f"[WARN] Could not write compiled config {path.name}: {e}")
+
     def get_source(self, source_name: str, config: Dict = None):
         """
         Returns a DataConnector instance for the given source name.
@@ -136,5 +262,26 @@ class ContextLoader:
         source_config = datasources[source_name]
         return ConnectorFactory.get_connector(source_name, source_config)
 
+_instance: Optional[ContextLoader] = None
+_instance_lock = threading.Lock()
+
+
+def get_loader() -> ContextLoader:
+    """Process-wide ContextLoader, created (and .env files read) on first use."""
+    global _instance
+    if _instance is None:
+        with _instance_lock:
+            if _instance is None:
+                _instance = ContextLoader()
+    return _instance
+
+
+class _DeferredLoader:
+    """Proxy for the singleton: importing this module no longer reads .env files."""
+
+    def __getattr__(self, name):
+        return getattr(get_loader(), name)
+
+
 # Singleton instance
-loader = ContextLoader()
+loader = _DeferredLoader()
@@ -0,0 +1,40 @@
+import sys
+import types
+import importlib
+import threading
+
+_import_lock = threading.Lock()
+
+
+class LazyModule(types.ModuleType):
+    """
+    Stand-in for a module that is imported on first attribute access.
+
+        pd = lazy_import("pandas")   # nothing imported yet
+        pd.DataFrame()               # pandas imported here, once
+
+    After the first access the real module's namespace is copied in, so later
+    lookups are plain attribute reads. Annotations like `df: pd.DataFrame` in a
+    signature are evaluated at def time and would defeat this; quote them.
+    """
+
+    def __init__(self, name: str):
+        super().__init__(name)
+        self.__dict__['_lazy_target'] = name
+
+    def _load(self) -> types.ModuleType:
+        with _import_lock:
+            module = importlib.import_module(self.__dict__['_lazy_target'])
+            self.__dict__.update(module.__dict__)
+        return module
+
+    def __getattr__(self, attr: str):
+        return getattr(self._load(), attr)
+
+    def __dir__(self):
+        return dir(self._load())
+
+
+def lazy_import(name: str) -> types.ModuleType:
+    """Returns the module if it is already imported, else a LazyModule for it."""
+    return sys.modules.get(name) or LazyModule(name)
@@ -1,21 +1,49 @@
 import os
-import requests
-import json
-from typing import Dict, Any
+from typing import Dict, Any, Optional
+
 
 class Notifier:
     """
     Unified notification sender.
-    Currently supports: Console, Lark (Feishu) Webhook.
+    Currently supports: Console, Lark (Feishu) Webhook, Telegram Bot.
+    
+    Delivery modes (`notifications` config):
+    - outbox (default): send() writes to the durable SQLite outbox and returns; a background
+      thread posts it, and anything still undelivered when the process exits is sent by
+      `system/outbox_drainer.py` (cron). Retries and dedup survive restarts.
+    - async: posts are queued on the in-memory NotificationDispatcher (lost on exit).
+    - `async: false` (and `outbox: false`): posts inline.
+    Delivery modules (requests, sqlite) are only imported once something is sent.
     """
     def __init__(self, config: Dict[str, Any] = None):
         self.config = config or {}
         self.notification_config = self.config.get('notifications', {})
+        self.use_outbox = self.notification_config.get('outbox', True)
+        self.async_send = self.notification_config.get('async', True)
+        self.outbox_flush_seconds = self.notification_config.get('outbox_flush_seconds', 5)
+        self._queued = False
         
-    def send(self, title: str, message: str, level: str = "INFO", key: str = "default"):
+    def flush(self, timeout: float = 60) -> bool:
+        """
+        Gives pending notifications a chance to go out before exit.
+        With the outbox this waits at most `outbox_flush_seconds`; the rest stays queued on disk.
+        """
+        if not self._queued:
+            return True
+        if self.use_outbox:
+            from engine.scripts.utils.notify_outbox import get_outbox
+            outbox, _ = get_outbox()
+            return outbox.drain_until_idle(min(timeout, self.outbox_flush_seconds))
+        if not self.async_send:
+            return True
+        from engine.scripts.utils.notify_dispatch import get_dispatcher
+        return get_dispatcher().flush(timeout)
+        
+    def send(self, title: str, message: str, level: str = "INFO", key: str = "default", dedup_key: str = None):
         """
         Sends a notification. 
         Uses 'key' (Business Domain) to look up channels in 'notifications.business_domains'.
+        `dedup_key` (outbox mode) makes the message go out at most once per channel, across runs.
         """
         # 1. Console (Always)
         color = "32" if level == "INFO" else "31" # Green or Red
@@ -63,61 +91,51 @@ class Notifier:
                 continue
                 
             channel_cfg = channels_cfg[ch_id]
-            c_type = channel_cfg.get('type')
+            delivery = self._build_delivery(ch_id, channel_cfg, title, message)
+            if delivery is None:
+                continue
             
-            try:
-                if c_type == 'lark_webhook':
-                    self._send_lark(channel_cfg.get('url'), title, message)
-                elif c_type == 'telegram_bot':
-                    self._send_telegram(
-                        channel_cfg.get('token'), 
-                        channel_cfg.get('chat_id'), 
-                        title, 
-                        message
-                    )
-            except Exception as e:
-                print(f"[Warn] Notification send failed for {ch_id}: {e}")
+            self._queued = True
+            if self.use_outbox:
+                from engine.scripts.utils.notify_outbox import get_outbox
+                outbox, drainer = get_outbox()
+                if outbox.enqueue(delivery, dedup_key=dedup_key):
+                    drainer.kick()
+                else:
+                    print(f"   -> Skipped duplicate notification for '{ch_id}'.")
+                continue
+
+            from engine.scripts.utils.notify_dispatch import get_dispatcher
+            dispatcher = get_dispatcher()
+            if self.async_send:
+                dispatcher.submit(delivery, max_concurrency=channel_cfg.get('max_concurrency', 1))
+            else:
+                dispatcher.send_now(delivery)
 
     def _resolve_env(self, value: str) -> str:
         if value and value.startswith("${") and value.endswith("}"):
             return os.environ.get(value[2:-1], "")
         return value
 
-    def _send_lark(self, url: str, title: str, text: str):
-        raw_url = url
-        url = self._resolve_env(url)
-        
-        if not url: 
-            print(f"[Warn] Lark URL is empty! Raw: '{raw_url}'")
-            return
-
-        print(f"[Debug] Sending to Lark: {url[:30]}... (Len: {len(url)})")
-        
-        payload = {
-            "msg_type": "text",
-            "content": {"text": f"[{title}]\n{text}"}
-        }
-        try:
-            resp = requests.post(url, json=payload, timeout=5)
-            if resp.status_code != 200:
-                print(f"[Error] Lark Webhook failed ({resp.status_code}): {resp.text}")
-            else:
-                # print(f"[Debug] Lark sent successfully.") # Optional
-                pass
-        except Exception as e:
-            print(f"[Error] Lark request exception: {e}")
-
-    def _send_telegram(self, token: str, chat_id: str, title: str, text: str):
-        token = self._resolve_env(token)
-        chat_id = self._resolve_env(chat_id)
+    def _build_delivery(self, ch_id: str, channel_cfg: Dict[str, Any], title: str, text: str) -> Optional["Delivery"]:
+        """Resolves a channel's target (env references included); None if it can't be sent to."""
+        from engine.scripts.utils.notify_dispatch import Delivery
+        c_type = channel_cfg.get('type')
         
-        if not token or not chat_id:
-            return
-
-        url = f"https://api.telegram.org/bot{token}/sendMessage"
-        payload = {
-            "chat_id": chat_id,
-            "text": f"*{title}*\n{text}",
-            "parse_mode": "Markdown"
-        }
-        requests.post(url, json=payload, timeout=5)
+        if c_type == 'lark_webhook':
+            raw_url = channel_cfg.get('url')
+            url = self._resolve_env(raw_url)
+            if not url: 
+                print(f"[Warn] Lark URL is empty! Raw: '{raw_url}'")
+                return None
+            print(f"[Debug] Sending to Lark: {url[:30]}... (Len: {len(url)})")
+            return Delivery(ch_id, c_type, {'url': url}, title, text)
+            
+        if c_type == 'telegram_bot':
+            token = self._resolve_env(channel_cfg.get('token'))
+            chat_id = self._resolve_env(channel_cfg.get('chat_id'))
+            if not token or not chat_id:
+                return None
+            return Delivery(ch_id, c_type, {'token': token, 'chat_id': chat_id}, title, text)
+            
+        return None
@@ -0,0 +1,263 @@
+import time
+import queue
+import atexit
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Lark custom-bot "frequency limited" business codes (sent with HTTP 200)
+LARK_RATE_LIMIT_CODES = {11232, 9499}
+
+# Max characters in one coalesced message (Telegram hard limit is 4096)
+MAX_CHARS = {'lark_webhook': 18000, 'telegram_bot': 4000}
+
+
+class RetryableDeliveryError(Exception):
+    """Transient failure (rate limit, 5xx, network); `retry_after` seconds if the server said so."""
+    def __init__(self, message: str, retry_after: float = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class DeliveryError(Exception):
+    """Permanent failure (bad URL/token, rejected payload); not retried."""
+
+
+@dataclass
+class Delivery:
+    """One message for one channel, with env references already resolved."""
+    channel_id: str
+    channel_type: str                 # lark_webhook / telegram_bot
+    target: Dict[str, str] = field(repr=False)   # {'url'} or {'token', 'chat_id'}
+    title: str = ""
+    text: str = ""
+
+
+def deliver(session: requests.Session, d: Delivery, timeout: float = 10):
+    """Posts one Delivery. Raises RetryableDeliveryError / DeliveryError."""
+    if d.channel_type == 'lark_webhook':
+        payload = {"msg_type": "text", "content": {"text": f"[{d.title}]\n{d.text}"}}
+        resp = _post(session, d.target['url'], payload, timeout)
+        body = _json(resp)
+        code = body.get('code', body.get('StatusCode', 0))
+        if code in LARK_RATE_LIMIT_CODES:
+            raise RetryableDeliveryError(f"Lark rate limited: {body.get('msg')}")
+        if code:
+            raise DeliveryError(f"Lark rejected message ({code}): {body.get('msg')}")
+    elif d.channel_type == 'telegram_bot':
+        url = f"https://api.telegram.org/bot{d.target['token']}/sendMessage"
+        payload = {"chat_id": d.target['chat_id'], "text": f"*{d.title}*\n{d.text}", "parse_mode": "Markdown"}
+        body = _json(_post(session, url, payload, timeout))
+        if body and not body.get('ok', True):
+            raise DeliveryError(f"Telegram rejected message: {body.get('description')}")
+    else:
+        raise DeliveryError(f"Unsupported channel type '{d.channel_type}'")
+
+
+def _post(session: requests.Session, url: str, payload: Dict[str, Any], timeout: float) -> requests.Response:
+    try:
+        resp = session.post(url, json=payload, timeout=timeout)
+    except requests.RequestException as e:
+        raise RetryableDeliveryError(f"Request exception: {e}")
+
+    if resp.status_code == 429:
+        # Telegram: {"parameters": {"retry_after": N}}; others: Retry-After header
+        retry_after = _json(resp).get('parameters', {}).get('retry_after') or resp.headers.get('Retry-After')
+        raise RetryableDeliveryError("HTTP 429", _seconds(retry_after))
+    if resp.status_code >= 500:
+        raise RetryableDeliveryError(f"HTTP {resp.status_code}: {resp.text[:200]}")
+    if resp.status_code >= 400:
+        raise DeliveryError(f"HTTP {resp.status_code}: {resp.text[:200]}")
+    return resp
+
+
+def _seconds(value) -> Optional[float]:
+    """Retry-After as seconds; None for missing or HTTP-date values (backoff applies)."""
+    try:
+        return float(value) if value else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _json(resp: requests.Response) -> Dict[str, Any]:
+    try:
+        body = resp.json()
+        return body if isinstance(body, dict) else {}
+    except ValueError:
+        return {}
+
+
+def coalesce(batch: List[Delivery]) -> List[Delivery]:
+    """
+    Merges a burst of messages for one channel into as few posts as fit in MAX_CHARS.
+    A message that is too long on its own is sent unchanged. Only messages for the same
+    target are merged, since a post goes to its first message's target.
+    """
+    return [merge(group) for group in coalesce_groups(batch)]
+
+
+def coalesce_groups(batch: List[Delivery]) -> List[List[Delivery]]:
+    """
+    Splits a burst for one channel into consecutive groups that each fit in one post
+    and share one target (a channel whose env reference changed mid-burst splits there).
+    """
+    if not batch:
+        return []
+    limit = MAX_CHARS.get(batch[0].channel_type, 4000)
+    groups: List[List[Delivery]] = [[]]
+    size = 0
+    for d in batch:
+        part = len(d.title) + len(d.text) + 8
+        if groups[-1] and (size + part > limit or d.target != groups[-1][0].target):
+            groups.append([])
+            size = 0
+        groups[-1].append(d)
+        size += part
+    return groups
+
+
+def merge(group: List[Delivery]) -> Delivery:
+    if len(group) == 1:
+        return group[0]
+    titles = {d.title for d in group}
+    title = group[0].title if len(titles) == 1 else f"{len(group)} notifications"
+    text = "\n\n---\n\n".join(d.text if len(titles) == 1 else f"[{d.title}]\n{d.text}" for d in group)
+    return Delivery(group[0].channel_id, group[0].channel_type, group[0].target, title, text)
+
+
+class _Channel:
+    __slots__ = ('queue', 'workers')
+
+    def __init__(self):
+        self.queue: "queue.Queue[Delivery]" = queue.Queue()
+        self.workers: List[threading.Thread] = []
+
+
+class NotificationDispatcher:
+    """
+    Process-wide background sender for Notifier.
+
+    - One keep-alive requests.Session shared by all channels.
+    - Per channel: a queue and up to `max_concurrency` worker threads.
+    - Messages arriving within `coalesce_window` seconds of each other are merged into one post.
+    - Rate limits (HTTP 429, Lark frequency codes) and transient errors are retried with
+      exponential backoff, honouring retry_after / Retry-After.
+    - flush() blocks until everything queued so far was delivered or given up on.
+    """
+
+    def __init__(self, max_retries: int = 4, backoff_base: float = 1.0, backoff_max: float = 30.0,
+                 coalesce_window: float = 0.5, max_batch: int = 20, timeout: float = 10):
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.coalesce_window = coalesce_window
+        self.max_batch = max_batch
+        self.timeout = timeout
+
+        self.session = requests.Session()
+        self.session.mount("https://", HTTPAdapter(pool_connections=8, pool_maxsize=16))
+
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+        self._channels: Dict[str, _Channel] = {}
+        self._pending = 0
+        self.stats = {'delivered': 0, 'failed': 0, 'retries': 0, 'coalesced': 0}
+
+    def submit(self, delivery: Delivery, max_concurrency: int = 1):
+        with self._lock:
+            channel = self._channels.get(delivery.channel_id)
+            if channel is None:
+                channel = self._channels[delivery.channel_id] = _Channel()
+            while len(channel.workers) < max(1, max_concurrency):
+                worker = threading.Thread(
+                    target=self._work, args=(channel,), daemon=True,
+                    name=f"notify-{delivery.channel_id}-{len(channel.workers)}"
+                )
+                channel.workers.append(worker)
+                worker.start()
+            self._pending += 1
+        channel.queue.put(delivery)
+
+    def flush(self, timeout: float = 60) -> bool:
+        """Waits for all queued messages. Returns False if `timeout` expired first."""
+        deadline = time.monotonic() + timeout
+        with self._idle:
+            while self._pending > 0:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    print(f"[Notifier] Flush timed out with {self._pending} message(s) undelivered.")
+                    return False
+                self._idle.wait(remaining)
+        return True
+
+    def send_now(self, delivery: Delivery) -> bool:
+        """Synchronous delivery with the same retry policy (no queue, no coalescing)."""
+        return self._deliver_with_retry(delivery)
+
+    def _count(self, key: str, n: int = 1):
+        with self._lock:
+            self.stats[key] += n
+
+    def _work(self, channel: _Channel):
+        while True:
+            batch = [channel.queue.get()]
+            try:
+                deadline = time.monotonic() + self.coalesce_window
+                while len(batch) < self.max_batch:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    try:
+                        batch.append(channel.queue.get(timeout=remaining))
+                    except queue.Empty:
+                        break
+
+                posts = coalesce(batch)
+                self._count('coalesced', len(batch) - len(posts))
+                for post in posts:
+                    self._deliver_with_retry(post)
+            except Exception as e:
+                # Keep the worker alive; the batch is given up on like a permanent failure
+                print(f"[Error] Notification worker {threading.current_thread().name} failed: {e}")
+                self._count('failed', len(batch))
+            finally:
+                with self._idle:
+                    self._pending -= len(batch)
+                    if self._pending <= 0:
+                        self._idle.notify_all()
+
+    def _deliver_with_retry(self, d: Delivery) -> bool:
+        for attempt in range(self.max_retries + 1):
+            try:
+                deliver(self.session, d, timeout=self.timeout)
+                self._count('delivered')
+                return True
+            except DeliveryError as e:
+                print(f"[Error] Notification to {d.channel_id} failed: {e}")
+                break
+            except RetryableDeliveryError as e:
+                if attempt == self.max_retries:
+                    print(f"[Error] Notification to {d.channel_id} failed after {attempt + 1} attempts: {e}")
+                    break
+                delay = e.retry_after if e.retry_after is not None else self.backoff_base * (2 ** attempt)
+                self._count('retries')
+                time.sleep(min(delay, self.backoff_max))
+        self._count('failed')
+        return False
+
+
+_DISPATCHER: Optional[NotificationDispatcher] = None
+_DISPATCHER_LOCK = threading.Lock()
+
+
+def get_dispatcher() -> NotificationDispatcher:
+    """Process-wide dispatcher (flushed at interpreter exit as a safety net)."""
+    global _DISPATCHER
+    with _DISPATCHER_LOCK:
+        if _DISPATCHER is None:
+            _DISPATCHER = NotificationDispatcher()
+            atexit.register(_DISPATCHER.flush, 30)
+        return _DISPATCHER
@@ -0,0 +1,299 @@
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import requests
+
+from engine.scripts.utils.paths import get_store_root
+from engine.scripts.utils.notify_dispatch import (
+    Delivery, DeliveryError, RetryableDeliveryError, coalesce_groups, deliver, merge
+)
+
+OUTBOX_DB_PATH = get_store_root() / "system" / "db" / "notify_outbox.db"
+
+
+class NotificationOutbox:
+    """
+    Durable queue of outgoing notifications (SQLite).
+
+    - enqueue() only writes a row, so Notifier.send returns at disk speed.
+    - drain() claims due rows, coalesces them per channel and posts them; failures are
+      rescheduled with exponential backoff (next_attempt_at) and survive process exit.
+    - An explicit dedup key is delivered at most once per channel. Content dedup (identical
+      message to the same channel within `dedup_window` seconds) is opt-in: repeated
+      failure alerts are real events and must not be swallowed by default.
+    - Rows stuck in 'sending' longer than `claim_timeout` (crashed drainer) are re-claimed.
+    - drain_until_idle() also waits for drains in flight in this process (e.g. the background
+      OutboxDrainer's POST), so a flush before exit never abandons a claimed row.
+    - Targets hold resolved webhook URLs / bot tokens: the database is owner-only (0600)
+      and a row's target is wiped once it is delivered.
+    """
+
+    def __init__(self, db_path: Path = None, max_attempts: int = 8, backoff_base: float = 5.0,
+                 backoff_max: float = 900.0, dedup_window: float = 0, claim_timeout: float = 300):
+        self.db_path = Path(db_path) if db_path else OUTBOX_DB_PATH
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.dedup_window = dedup_window
+        self.claim_timeout = claim_timeout
+        self.session = requests.Session()
+        # drain() calls in progress in this process (claim -> POST -> mark)
+        self._busy = 0
+        self._idle = threading.Condition()
+        self._init_db()
+
+    def _connect(self):
+        return sqlite3.connect(self.db_path, timeout=30)
+
+    def _init_db(self):
+        os.makedirs(self.db_path.parent, exist_ok=True)
+        # Owner-only before SQLite opens it; the -wal/-shm files inherit these permissions
+        os.close(os.open(self.db_path, os.O_CREAT | os.O_RDWR, 0o600))
+        for suffix in ("", "-wal", "-shm"):
+            path = Path(f"{self.db_path}{suffix}")
+            if path.exists():
+                os.chmod(path, 0o600)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS outbox (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    dedup_key TEXT NOT NULL,
+                    explicit_key INTEGER NOT NULL DEFAULT 0,
+                    channel_id TEXT NOT NULL,
+                    channel_type TEXT NOT NULL,
+                    target_json TEXT NOT NULL,
+                    title TEXT,
+                    message TEXT,
+                    status TEXT NOT NULL DEFAULT 'pending',
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    next_attempt_at REAL NOT NULL,
+                    claimed_at REAL,
+                    last_error TEXT,
+                    created_at REAL NOT NULL,
+                    sent_at REAL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_outbox_due ON outbox (status, next_attempt_at)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_outbox_dedup ON outbox (dedup_key, created_at)")
+
+    # --- Producer side ---
+
+    def enqueue(self, delivery: Delivery, dedup_key: str = None) -> bool:
+        """Stores one delivery. Returns False if it was dropped as a duplicate."""
+        now = time.time()
+        explicit = dedup_key is not None
+        key = f"{dedup_key}:{delivery.channel_id}" if explicit else self._content_key(delivery)
+
+        with self._connect() as conn:
+            if explicit:
+                dup = conn.execute(
+                    "SELECT 1 FROM outbox WHERE dedup_key = ? AND status != 'failed' LIMIT 1", (key,)
+                ).fetchone()
+            elif not self.dedup_window:
+                dup = None
+            else:
+                dup = conn.execute(
+                    "SELECT 1 FROM outbox WHERE dedup_key = ? AND status != 'failed' AND created_at >= ? LIMIT 1",
+                    (key, now - self.dedup_window)
+                ).fetchone()
+            if dup:
+                return False
+            conn.execute(
+                """
+                INSERT INTO outbox
+                (dedup_key, explicit_key, channel_id, channel_type, target_json, title, message, next_attempt_at, created_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (key, int(explicit), delivery.channel_id, delivery.channel_type,
+                 json.dumps(delivery.target), delivery.title, delivery.text, now, now)
+            )
+        return True
+
+    @staticmethod
+    def _content_key(d: Delivery) -> str:
+        digest = hashlib.sha256(json.dumps([d.channel_id, d.title, d.text]).encode('utf-8')).hexdigest()
+        return f"sha256:{digest}"
+
+    # --- Consumer side ---
+
+    def drain(self, limit: int = 200) -> Dict[str, int]:
+        """Delivers every due row once (no waiting on backoff). Returns counters."""
+        with self._idle:
+            self._busy += 1
+        try:
+            return self._drain(limit)
+        finally:
+            with self._idle:
+                self._busy -= 1
+                self._idle.notify_all()
+
+    def _drain(self, limit: int) -> Dict[str, int]:
+        stats = {'sent': 0, 'retry': 0, 'failed': 0, 'posts': 0}
+        rows = self._claim(limit)
+        # Rows only coalesce with rows for the same channel and resolved target
+        by_channel: Dict[Tuple[str, str], List[Tuple[int, int, Delivery]]] = {}
+        for row_id, attempts, d in rows:
+            key = (d.channel_id, json.dumps(d.target, sort_keys=True))
+            by_channel.setdefault(key, []).append((row_id, attempts, d))
+
+        for channel_rows in by_channel.values():
+            # Groups are consecutive slices of the batch; each post settles all rows it carries
+            offset = 0
+            for group in coalesce_groups([d for _, _, d in channel_rows]):
+                members = channel_rows[offset:offset + len(group)]
+                offset += len(group)
+                stats['posts'] += 1
+                self._settle(merge(group), members, stats)
+        return stats
+
+    def drain_until_idle(self, timeout: float = 10) -> bool:
+        """
+        Drains repeatedly until nothing is due and no drain of this process is in flight,
+        or `timeout` passes. True if everything claimed here was settled and nothing is due.
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if self._claimable():
+                if remaining <= 0:
+                    return False
+                self.drain()
+                continue
+            with self._idle:
+                if not self._busy:
+                    return True
+                if remaining <= 0:
+                    return False
+                # Another thread (the background drainer) holds claimed rows: wait for it to settle
+                self._idle.wait(remaining)
+
+    def _settle(self, post: Delivery, members: List[Tuple[int, int, Delivery]], stats: Dict[str, int]):
+        ids = [row_id for row_id, _, _ in members]
+        attempts = max(a for _, a, _ in members) + 1
+        try:
+            deliver(self.session, post)
+            # Delivered rows don't need the (secret) target any more
+            self._update(ids, "status = 'sent', sent_at = ?, attempts = attempts + 1, last_error = NULL, target_json = '{}'",
+                         (time.time(),))
+            stats['sent'] += len(ids)
+        except RetryableDeliveryError as e:
+            if attempts >= self.max_attempts:
+                self._update(ids, "status = 'failed', attempts = attempts + 1, last_error = ?", (str(e),))
+                stats['failed'] += len(ids)
+                print(f"[Outbox] Giving up on {post.channel_id} after {attempts} attempts: {e}")
+                return
+            delay = e.retry_after if e.retry_after is not None else self.backoff_base * (2 ** (attempts - 1))
+            self._update(ids, "status = 'pending', attempts = attempts + 1, next_attempt_at = ?, last_error = ?",
+                         (time.time() + min(delay, self.backoff_max), str(e)))
+            stats['retry'] += len(ids)
+        except DeliveryError as e:
+            self._update(ids, "status = 'failed', attempts = attempts + 1, last_error = ?", (str(e),))
+            stats['failed'] += len(ids)
+            print(f"[Outbox] Notification to {post.channel_id} rejected: {e}")
+
+    def _claim(self, limit: int) -> List[Tuple[int, int, Delivery]]:
+        """Atomically moves due rows to 'sending' so concurrent drainers don't double-post."""
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            rows = conn.execute(
+                """
+                SELECT id, attempts, channel_id, channel_type, target_json, title, message FROM outbox
+                WHERE (status = 'pending' AND next_attempt_at <= ?)
+                   OR (status = 'sending' AND claimed_at < ?)
+                ORDER BY id LIMIT ?
+                """,
+                (now, now - self.claim_timeout, limit)
+            ).fetchall()
+            if rows:
+                conn.executemany(
+                    "UPDATE outbox SET status = 'sending', claimed_at = ? WHERE id = ?",
+                    [(now, r[0]) for r in rows]
+                )
+        return [(r[0], r[1], Delivery(r[2], r[3], json.loads(r[4]), r[5] or "", r[6] or "")) for r in rows]
+
+    def _claimable(self) -> bool:
+        now = time.time()
+        with self._connect() as conn:
+            return conn.execute(
+                """
+                SELECT 1 FROM outbox
+                WHERE (status = 'pending' AND next_attempt_at <= ?) OR (status = 'sending' AND claimed_at < ?)
+                LIMIT 1
+                """,
+                (now, now - self.claim_timeout)
+            ).fetchone() is not None
+
+    def _update(self, ids: List[int], assignments: str, params: tuple):
+        with self._connect() as conn:
+            conn.executemany(f"UPDATE outbox SET {assignments} WHERE id = ?", [(*params, i) for i in ids])
+
+    # --- Maintenance ---
+
+    def stats(self) -> Dict[str, int]:
+        with self._connect() as conn:
+            return dict(conn.execute("SELECT status, COUNT(*) FROM outbox GROUP BY status").fetchall())
+
+    def retry_failed(self) -> int:
+        """Re-queues every failed row (e.g. after fixing a webhook URL)."""
+        with self._connect() as conn:
+            cur = conn.execute(
+                "UPDATE outbox SET status = 'pending', attempts = 0, next_attempt_at = ? WHERE status = 'failed'",
+                (time.time(),)
+            )
+            return cur.rowcount
+
+    def purge(self, older_than_days: int = 30) -> int:
+        """Deletes delivered rows, and failed rows (which still hold their target), older than N days."""
+        cutoff = time.time() - older_than_days * 86400
+        with self._connect() as conn:
+            cur = conn.execute(
+                "DELETE FROM outbox WHERE (status = 'sent' AND sent_at < ?) OR (status = 'failed' AND created_at < ?)",
+                (cutoff, cutoff)
+            )
+            return cur.rowcount
+
+
+class OutboxDrainer:
+    """In-process background drainer: wakes on enqueue, exits with the process (daemon thread)."""
+
+    def __init__(self, outbox: NotificationOutbox, idle_interval: float = 30):
+        self.outbox = outbox
+        self.idle_interval = idle_interval
+        self._wake = threading.Event()
+        self._thread = threading.Thread(target=self._loop, daemon=True, name="notify-outbox")
+        self._thread.start()
+
+    def kick(self):
+        self._wake.set()
+
+    def _loop(self):
+        while True:
+            self._wake.wait(self.idle_interval)
+            self._wake.clear()
+            try:
+                self.outbox.drain()
+            except Exception as e:
+                print(f"[Outbox] Drain failed: {e}")
+
+
+_OUTBOX: Optional[NotificationOutbox] = None
+_DRAINER: Optional[OutboxDrainer] = None
+_OUTBOX_LOCK = threading.Lock()
+
+
+def get_outbox() -> Tuple[NotificationOutbox, OutboxDrainer]:
+    """Process-wide outbox and its background drainer."""
+    global _OUTBOX, _DRAINER
+    with _OUTBOX_LOCK:
+        if _OUTBOX is None:
+            _OUTBOX = NotificationOutbox()
+            _DRAINER = OutboxDrainer(_OUTBOX)
+        return _OUTBOX, _DRAINER
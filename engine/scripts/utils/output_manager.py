@@ -58,13 +58,18 @@ class OutputManager:
         """Returns the full path for a file in the output directory."""
         return self.output_dir / filename
 
-    def save_meta(self, extra_info: Dict[str, Any] = None):
+    def save_meta(self, extra_info: Dict[str, Any] = None, telemetry: Dict[str, Any] = None, status: str = None):
         """
         Generates/saves meta.json.
+        Args:
+            extra_info: Job-specific result info (run()'s return value).
+            telemetry: JobTelemetry summary (stage timings, rows, connector calls).
+            status: SUCCESS / FAILED.
         """
         # 1. Create Meta Dict
         meta = {
             "timestamp": self.timestamp.isoformat(),
+            "status": status,
             "job": {
                 "domain": self.domain,
                 "sub_domain": self.sub_domain,
@@ -72,12 +77,13 @@ class OutputManager:
                 "output_dir": str(self.output_dir)
             },
             "config_context": self.config.get('_meta', {}),
-            "extra": extra_info or {}
+            "extra": extra_info or {},
+            "telemetry": telemetry or {}
         }
         
         # 2. Save JSON
         json_path = self.get_path("meta.json")
         with open(json_path, 'w', encoding='utf-8') as f:
-            json.dump(meta, f, indent=2, ensure_ascii=False)
+            json.dump(meta, f, indent=2, ensure_ascii=False, default=str)
             
         print(f"[OutputManager] Metadata saved to {json_path}")
@@ -0,0 +1,97 @@
+import math
+from typing import Dict, List, Optional, Sequence
+
+from engine.scripts.utils.lazy_import import lazy_import
+
+pd = lazy_import("pandas")
+
+# Rough chars-per-token for English/number-heavy text; CJK characters count as one token each
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap, model-agnostic token estimate for logging and budgeting."""
+    if not text:
+        return 0
+    wide = sum(1 for ch in text if ord(ch) > 0x2E80)
+    return wide + math.ceil((len(text) - wide) / CHARS_PER_TOKEN)
+
+
+def _format_value(value, decimals: Optional[int]) -> str:
+    if value is None:
+        return "-"
+    if isinstance(value, float):
+        if math.isnan(value):
+            return "-"
+        if not math.isfinite(value):
+            return "inf" if value > 0 else "-inf"
+        if decimals is not None:
+            value = round(value, decimals)
+        if abs(value) < 1e15 and value == int(value):
+            return str(int(value))
+        return f"{value:.{decimals}f}" if decimals is not None else repr(value)
+    if hasattr(value, 'item'):   # numpy scalars
+        return _format_value(value.item(), decimals)
+    try:
+        if pd.isna(value):   # pd.NA, NaT
+            return "-"
+    except (TypeError, ValueError):
+        pass
+    return str(value).replace("|", "/").replace("\n", " ")
+
+
+def compact_table(
+    df,
+    columns: Sequence[str] = None,
+    abbreviations: Dict[str, str] = None,
+    decimals: Dict[str, int] = None,
+    default_decimals: int = 1,
+    max_rows: int = None,
+    token_budget: int = None,
+    title: str = None,
+) -> str:
+    """
+    Serializes a DataFrame for an LLM prompt with far fewer tokens than to_markdown():
+
+    - Only `columns` (default: all), headed by their `abbreviations`; a one-line legend
+      maps the abbreviations back to the full column names.
+    - Pipe-separated rows without padding; floats rounded per `decimals`
+      (default_decimals otherwise), whole numbers without a fraction, NaN/NA/NaT as '-'.
+    - At most `max_rows` rows; with `token_budget`, further trailing rows are dropped until
+      the table fits. A final line says how many were omitted, so order rows by importance.
+    """
+    columns = list(columns or df.columns)
+    abbreviations = abbreviations or {}
+    decimals = decimals or {}
+
+    header = "|".join(abbreviations.get(c, c) for c in columns)
+    legend_items = [f"{abbreviations[c]}={c}" for c in columns if abbreviations.get(c, c) != c]
+    lines: List[str] = []
+    if title:
+        lines.append(title)
+    if legend_items:
+        lines.append("cols: " + ", ".join(legend_items))
+    lines.append(header)
+
+    total = len(df)
+    head = df[columns] if max_rows is None else df[columns].head(max_rows)
+    rows = [
+        "|".join(_format_value(v, decimals.get(c, default_decimals)) for c, v in zip(columns, record))
+        for record in head.itertuples(index=False, name=None)
+    ]
+
+    if token_budget is not None:
+        costs = [estimate_tokens(row) + 1 for row in rows]   # +1 for the newline
+        used = estimate_tokens("\n".join(lines))
+        if used + sum(costs) > token_budget:
+            # Leave room for the omission note
+            used += 8
+            kept = 0
+            while kept < len(rows) and used + costs[kept] <= token_budget:
+                used += costs[kept]
+                kept += 1
+            rows = rows[:kept]
+
+    if len(rows) < total:
+        rows.append(f"(+{total - len(rows)} more rows omitted)")
+    return "\n".join(lines + rows)
@@ -0,0 +1,192 @@
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Column types understood by SheetSchema
+TEXT, NUMBER, CURRENCY, PERCENT, DATE = 'text', 'number', 'currency', 'percent', 'date'
+
+# Per-cell clean-up before numeric parsing (plain str.replace chains are the cheapest
+# per-cell string op without Arrow-backed strings)
+_NUMERIC_CLEANERS = {
+    NUMBER: lambda v: v.replace(',', '').replace('$', '').replace('%', '').strip(),   # separators, stray '$' / '%'
+    CURRENCY: lambda v: v.replace(',', '').replace('$', '').strip(),
+    PERCENT: lambda v: v.replace(',', '').replace('%', '').strip(),
+}
+# CURRENCY cells still unparsable after the fast path: drop anything that isn't part of the number
+_CURRENCY_STRIP = r'[^\d.\-]'
+
+# Tried in order (vectorized) when a date column has no explicit format
+DEFAULT_DATE_FORMATS = ('%Y-%m-%d', '%Y/%m/%d', '%Y-%m-%d %H:%M:%S', '%Y/%m/%d %H:%M:%S', '%m/%d/%Y')
+
+_MISSING = object()
+
+
+@dataclass(frozen=True)
+class ColumnSpec:
+    """
+    One output column of a cleaned sheet.
+
+    - Located by header `aliases` (leftmost header matching any alias, whitespace-stripped)
+      or by fixed 0-based `index` (when both are given, the index is only used if no alias matches).
+    - Missing columns raise unless `default` is given; `default=None` drops the column instead.
+    - Numeric types fill unparsable cells with `fill`; PERCENT divides by 100.
+    """
+    name: str
+    type: str = TEXT
+    aliases: Tuple[str, ...] = ()
+    index: Optional[int] = None
+    date_format: Optional[str] = None
+    default: Any = _MISSING
+    fill: Any = 0
+
+
+class SheetSchema:
+    """
+    Declarative cleaner for raw Google Sheet frames (all-string cells).
+
+    Columns are resolved once against the header, then all numeric columns of a type are
+    cleaned and parsed in one pass over the flattened value matrix,
+    and dates are parsed with explicit formats (per-element inference only for
+    cells none of them match).
+    """
+
+    def __init__(self, columns: Sequence[ColumnSpec], dropna: Sequence[str] = (), label: str = "Sheet"):
+        self.columns = list(columns)
+        self.dropna = list(dropna)
+        self.label = label
+
+    def clean(self, df: pd.DataFrame, header_row: Optional[int] = None) -> pd.DataFrame:
+        """
+        Args:
+            df: Raw frame as read from the sheet.
+            header_row: Data row holding the real headers (rows up to it are dropped).
+                        None uses df.columns.
+        Returns:
+            Frame with one column per resolved ColumnSpec, in spec order.
+        """
+        values = df.to_numpy(dtype=object)
+        headers = list(df.columns)
+        if header_row is not None:
+            if len(values) <= header_row:
+                return self.empty()
+            headers = list(values[header_row])
+            values = values[header_row + 1:]
+
+        positions = self._resolve(headers, values.shape[1])
+        out: Dict[str, Any] = {}
+
+        # 1. Dates first, so rows dropped for a missing date skip numeric parsing
+        for spec in self.columns:
+            if spec.type == DATE and positions.get(spec.name) is not None:
+                out[spec.name] = parse_dates(values[:, positions[spec.name]], spec.date_format)
+        date_keys = [c for c in self.dropna if c in out]
+        if date_keys:
+            keep = pd.concat([out[c] for c in date_keys], axis=1).notna().all(axis=1).to_numpy()
+            values = values[keep]
+            for c in out:
+                out[c] = out[c][keep].reset_index(drop=True)
+        n = len(values)
+
+        # 2. Numerics: one pass per numeric type over all its columns at once
+        for kind in (NUMBER, CURRENCY, PERCENT):
+            specs = [c for c in self.columns if c.type == kind and positions.get(c.name) is not None]
+            if not specs:
+                continue
+            block = values[:, [positions[c.name] for c in specs]]
+            parsed = _to_float(block.ravel(order='F'), kind).reshape((n, len(specs)), order='F')
+            if kind == PERCENT:
+                parsed = parsed / 100
+            for j, spec in enumerate(specs):
+                col = pd.Series(parsed[:, j])
+                out[spec.name] = col.fillna(spec.fill) if spec.fill is not None else col
+
+        # 3. Text and defaulted (missing) columns
+        for spec in self.columns:
+            pos = positions.get(spec.name, _MISSING)
+            if pos is None:
+                out[spec.name] = pd.Series([spec.default] * n, dtype=object if spec.type == TEXT else None)
+                if spec.type == DATE:
+                    out[spec.name] = pd.to_datetime(out[spec.name], errors='coerce')
+            elif pos is not _MISSING and spec.type == TEXT:
+                out[spec.name] = pd.Series(values[:, pos], dtype=object)
+
+        result = pd.DataFrame({c.name: out[c.name] for c in self.columns if c.name in out})
+        if self.dropna:
+            result = result.dropna(subset=[c for c in self.dropna if c in result.columns]).reset_index(drop=True)
+        return result
+
+    def empty(self) -> pd.DataFrame:
+        return pd.DataFrame(columns=[c.name for c in self.columns if c.default is not None])
+
+    def _resolve(self, headers: List[Any], width: int) -> Dict[str, Optional[int]]:
+        """
+        Column name -> position in the value matrix.
+        None = missing but defaulted; absent = missing and dropped (default=None).
+        """
+        lookup = {}
+        for i, h in enumerate(headers):
+            lookup.setdefault(str(h).strip(), i)
+
+        positions: Dict[str, Optional[int]] = {}
+        missing = []
+        for spec in self.columns:
+            pos = min((lookup[a] for a in spec.aliases if a in lookup), default=None)
+            if pos is None and spec.index is not None and spec.index < width:
+                pos = spec.index
+            if pos is not None:
+                positions[spec.name] = pos
+            elif spec.default is _MISSING:
+                missing.append(spec.aliases[0] if spec.aliases else f"{spec.name} (column {spec.index})")
+            elif spec.default is not None:
+                positions[spec.name] = None
+
+        if missing:
+            raise ValueError(f"{self.label}: Missing columns {missing}")
+        return positions
+
+
+def _to_float(cells: np.ndarray, kind: str) -> np.ndarray:
+    """Cleans and parses one flat block of cells; unparsable cells become NaN."""
+    clean = _NUMERIC_CLEANERS[kind]
+    text = [clean(str(v)) or 'nan' for v in cells.tolist()]
+    try:
+        # Fast path: every cell is a plain number once cleaned
+        return np.array(text).astype(float)
+    except ValueError:
+        pass
+
+    flat = pd.Series(text, dtype=object)
+    parsed = pd.to_numeric(flat, errors='coerce')
+    if kind == CURRENCY:
+        retry = parsed.isna() & flat.ne('nan')
+        if retry.any():
+            parsed[retry] = pd.to_numeric(flat[retry].str.replace(_CURRENCY_STRIP, '', regex=True), errors='coerce')
+    return parsed.to_numpy(dtype=float)
+
+
+def parse_dates(raw, date_format: Optional[str] = None) -> pd.Series:
+    """
+    Parses a column of sheet date strings.
+    With an explicit format that format alone is used; otherwise DEFAULT_DATE_FORMATS are
+    tried vectorized and only cells none of them match fall back to per-element inference.
+    """
+    s = pd.Series(np.asarray(raw, dtype=object)).astype(str).str.strip()
+    if date_format:
+        return pd.to_datetime(s, format=date_format, errors='coerce')
+
+    pending = s.ne('') & s.ne('None') & s.ne('nan')
+    parts = []
+    for fmt in DEFAULT_DATE_FORMATS:
+        if not pending.any():
+            break
+        parsed = pd.to_datetime(s[pending], format=fmt, errors='coerce').dropna()
+        parts.append(parsed)
+        pending.loc[parsed.index] = False
+
+    if pending.any():
+        parts.append(pd.to_datetime(s[pending], errors='coerce', format='mixed'))
+    if not parts:
+        return pd.to_datetime(pd.Series([pd.NaT] * len(s), index=s.index))
+    return pd.concat(parts).reindex(s.index)
@@ -0,0 +1,148 @@
+import sys
+import time
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional
+
+try:
+    import resource
+except ImportError:   # Windows
+    resource = None
+
+# Per-call detail kept in meta.json (totals per connector are always complete)
+MAX_CALLS_RECORDED = 200
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of this process so far (MB), None where unsupported."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS, kilobytes on Linux
+    return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+
+def frame_bytes(df, sample: int = 1000) -> int:
+    """
+    Approximate in-memory size of a result frame. String columns are measured on the
+    first `sample` rows and extrapolated, so large results stay cheap to account for.
+    """
+    n = len(df)
+    if n <= sample:
+        return int(df.memory_usage(deep=True).sum())
+    return int(df.iloc[:sample].memory_usage(deep=True).sum() * n / sample)
+
+
+class Stage:
+    """Handle yielded by JobTelemetry.stage(); set rows_out (and rows_in if not from a connector)."""
+
+    __slots__ = ('name', 'rows_in', 'rows_out', 'bytes_in', 'calls')
+
+    def __init__(self, name: str):
+        self.name = name
+        self.rows_in = 0
+        self.rows_out = 0
+        self.bytes_in = 0
+        self.calls = 0
+
+
+class JobTelemetry:
+    """
+    Per-run timing and volume accounting for a BaseScript.
+
+    - stage(name): context manager recording wall time, CPU time, peak RSS and rows in/out.
+      Repeated stages with the same name (e.g. one per source) are summed.
+    - record_call(): one connector call (rows, approximate bytes, seconds, cache hit);
+      attributed to the stage open in the calling thread, if any.
+
+    CPU time and peak RSS are process-wide, so stages running concurrently in threads
+    share them.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.cpu_started = time.process_time()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._stages: Dict[str, Dict[str, Any]] = {}
+        self._calls: List[Dict[str, Any]] = []
+        self._connectors: Dict[str, Dict[str, Any]] = {}
+        # Connector volume read outside any stage
+        self._unstaged = {"rows_in": 0, "bytes_in": 0}
+
+    @contextmanager
+    def stage(self, name: str):
+        stage = Stage(name)
+        parent = getattr(self._local, 'stage', None)
+        self._local.stage = stage
+        wall, cpu = time.perf_counter(), time.process_time()
+        status = "ok"
+        try:
+            yield stage
+        except BaseException:
+            status = "failed"
+            raise
+        finally:
+            self._local.stage = parent
+            self._close_stage(stage, time.perf_counter() - wall, time.process_time() - cpu, status)
+
+    def _close_stage(self, stage: Stage, wall: float, cpu: float, status: str):
+        with self._lock:
+            entry = self._stages.setdefault(stage.name, {
+                "count": 0, "wall_sec": 0.0, "cpu_sec": 0.0, "rows_in": 0, "rows_out": 0,
+                "bytes_in": 0, "connector_calls": 0, "status": "ok",
+            })
+            entry["count"] += 1
+            entry["wall_sec"] += wall
+            entry["cpu_sec"] += cpu
+            entry["rows_in"] += stage.rows_in
+            entry["rows_out"] += stage.rows_out
+            entry["bytes_in"] += stage.bytes_in
+            entry["connector_calls"] += stage.calls
+            entry["peak_rss_mb"] = peak_rss_mb()
+            if status != "ok":
+                entry["status"] = status
+
+    def record_call(self, connector: str, kind: str, seconds: float, rows: int = 0, nbytes: int = 0, cached: bool = False):
+        stage = getattr(self._local, 'stage', None)
+        if stage is not None:
+            stage.rows_in += rows
+            stage.bytes_in += nbytes
+            stage.calls += 1
+        with self._lock:
+            if stage is None:
+                self._unstaged["rows_in"] += rows
+                self._unstaged["bytes_in"] += nbytes
+            totals = self._connectors.setdefault(connector, {"calls": 0, "cache_hits": 0, "rows": 0, "bytes": 0, "seconds": 0.0})
+            totals["calls"] += 1
+            totals["cache_hits"] += int(cached)
+            totals["rows"] += rows
+            totals["bytes"] += nbytes
+            totals["seconds"] += seconds
+            if len(self._calls) < MAX_CALLS_RECORDED:
+                self._calls.append({
+                    "connector": connector, "kind": kind, "stage": stage.name if stage else None,
+                    "seconds": round(seconds, 3), "rows": rows, "bytes": nbytes, "cached": cached,
+                })
+
+    def summary(self) -> Dict[str, Any]:
+        """JSON-ready totals for meta.json / the audit log."""
+        with self._lock:
+            stages = {
+                name: {**s, "wall_sec": round(s["wall_sec"], 3), "cpu_sec": round(s["cpu_sec"], 3)}
+                for name, s in self._stages.items()
+            }
+            connectors = {name: {**c, "seconds": round(c["seconds"], 3)} for name, c in self._connectors.items()}
+            calls = list(self._calls)
+            unstaged = dict(self._unstaged)
+        return {
+            "wall_sec": round(time.perf_counter() - self.started, 3),
+            "cpu_sec": round(time.process_time() - self.cpu_started, 3),
+            "peak_rss_mb": peak_rss_mb(),
+            "rows_in": unstaged["rows_in"] + sum(s["rows_in"] for s in stages.values()),
+            "rows_out": sum(s["rows_out"] for s in stages.values()),
+            "bytes_in": unstaged["bytes_in"] + sum(s["bytes_in"] for s in stages.values()),
+            "stages": stages,
+            "connectors": connectors,
+            "calls": calls,
+        }